@@ -6,7 +6,12 @@ echo "Activating virtual environment..."
 source venv/bin/activate
 echo "✓ Virtual environment activated"
 echo ""
-echo "Available commands:"
+# One entry point for every tool: newsletter <command> [args...]
+# (absolute path, so it works from any directory)
+PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+alias newsletter="python \"$PROJECT_DIR/src/cli.py\""
+
+echo "Available commands (or run: newsletter --help):"
 echo "  python src/generate_initial_links.py      - Generate Session 1 URLs"
 echo "  python src/app.py                          - Start Flask server"
 echo "  python src/regenerate_links.py <file.xlsx> - Generate Session 2 URLs"
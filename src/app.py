@@ -9,262 +9,264 @@ Usage:
     python app.py
 """
 
-from flask import Flask, render_template_string, request, redirect
-import pandas as pd
+from flask import Flask, Response, render_template_string, request, redirect, g, abort
+from werkzeug.utils import secure_filename
+from werkzeug.serving import make_server
+import os
 import sys
+import hmac
+import time
+import signal
+import threading
 from pathlib import Path
 
 # Add parent directory to path for imports
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 import config
+import profiling
+import entry_template
+import form_registry
+import roster_store
+import roster_index
+import roster_snapshot
+import traffic
+import live_events
+import regenerate_jobs
+import lookup_api
+import roster_push
+import static_assets
+import graceful_restart
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = config.UPLOAD_MAX_MB * 1024 * 1024
+
+# Counts requests in progress, so a restart can let them finish (dashboard
+# streams never finish; they are ended explicitly instead)
+IN_FLIGHT = app.wsgi_app = graceful_restart.InFlight(app.wsgi_app, stream_paths=['/events'])
+
+# 'starting' until warm_up() is done, 'ready', then 'draining' after handing over
+SERVER_STATE = 'starting'
 
 # In-memory cache of student mappings
 STUDENT_MAPPINGS = {}
 
+# Roster version the cache was loaded from, and when it was last checked
+ROSTER_VERSION = None
+_last_version_check = 0.0
+_reload_lock = threading.Lock()
+_thread_local = threading.local()
 
-def load_student_mappings():
-    """Load student code → URL mappings from students.xlsx."""
-    global STUDENT_MAPPINGS
-    STUDENT_MAPPINGS = {}
+# Set in main() when this node follows roster snapshots (config.SNAPSHOT_SOURCE)
+SNAPSHOT_POLLER = None
 
-    # Path to students.xlsx in parent directory
-    students_file = Path(__file__).parent.parent / 'students.xlsx'
+# Set in main(): token the link scripts send with pushed URLs (config.PUSH_ENABLED)
+PUSH_TOKEN = None
 
-    try:
-        df = pd.read_excel(students_file)
+# Set in main() when requests are recorded (config.TRAFFIC_RECORD_FILE)
+TRAFFIC_RECORDER = None
 
-        for _, row in df.iterrows():
-            code = str(row['code']).strip().upper()
-            url = str(row.get('url', '')).strip()
+# Encoded /api/students answer and writing field IDs, per roster version
+_api_cache = {'version': None, 'roster': None, 'fields': None}
 
-            if url and url != 'nan':
-                STUDENT_MAPPINGS[code] = {
-                    'name': str(row['name']).strip(),
-                    'url': url
-                }
+# Fingerprinted CSS etc. from src/assets, precompressed once at startup
+ASSET_URLS, ASSET_BODIES = static_assets.load_assets()
 
-        print(f"Loaded {len(STUDENT_MAPPINGS)} student mappings")
-        return True
+# Precompressed entry page, rebuilt when the roster version changes
+_entry_page = {'version': None, 'body': None}
 
-    except FileNotFoundError:
-        print("ERROR: students.xlsx not found!")
-        print("Run: python src/generate_initial_links.py")
-        return False
-    except Exception as e:
-        print(f"ERROR loading students.xlsx: {e}")
-        return False
+# Who has opened their link, and misses, for the live dashboard
+ACTIVITY = live_events.ActivityHub()
 
 
-# HTML template for the entry page
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Student Writing Portal</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
+def reload_after_job():
+    """Serve the URLs a finished regeneration job wrote."""
+    with _reload_lock:
+        # A request may already have picked them up
+        if roster_store.get_version(get_roster_connection()) != ROSTER_VERSION:
+            load_student_mappings(sync_xlsx=False)
 
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            padding: 20px;
-        }
 
-        .container {
-            background: white;
-            padding: 40px;
-            border-radius: 12px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-            max-width: 450px;
-            width: 100%;
-        }
+# Regenerations of Forms exports uploaded on the admin page
+JOBS = regenerate_jobs.JobManager(config.UPLOAD_JOB_WORKERS, publish=ACTIVITY.publish, on_success=reload_after_job)
 
-        h1 {
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 28px;
-            text-align: center;
-        }
 
-        .subtitle {
-            color: #666;
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 14px;
-        }
+def get_roster_connection():
+    """SQLite connection for the current thread."""
+    if not hasattr(_thread_local, 'conn'):
+        _thread_local.conn = roster_store.connect()
+    return _thread_local.conn
 
-        .form-group {
-            margin-bottom: 20px;
-        }
 
-        label {
-            display: block;
-            margin-bottom: 8px;
-            color: #333;
-            font-weight: 500;
-        }
+@profiling.stage('load')
+def load_student_mappings(sync_xlsx=True):
+    """
+    Load student code → URL mappings from the roster database.
 
-        input[type="text"] {
-            width: 100%;
-            padding: 12px 16px;
-            font-size: 16px;
-            border: 2px solid #e0e0e0;
-            border-radius: 6px;
-            transition: border-color 0.3s;
-            text-transform: uppercase;
-        }
+    Args:
+        sync_xlsx: Re-import students.xlsx first if it was edited (ignored
+            on nodes that follow roster snapshots)
+    """
+    global STUDENT_MAPPINGS, ROSTER_VERSION
 
-        input[type="text"]:focus {
-            outline: none;
-            border-color: #667eea;
-        }
+    conn = get_roster_connection()
 
-        button {
-            width: 100%;
-            padding: 14px;
-            font-size: 16px;
-            font-weight: 600;
-            color: white;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
+    try:
+        if sync_xlsx and not config.SNAPSHOT_SOURCE:
+            roster_store.sync_from_xlsx(conn)
 
-        button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 20px rgba(102, 126, 234, 0.4);
-        }
+        version = roster_store.get_version(conn)
 
-        button:active {
-            transform: translateY(0);
-        }
+        if config.ROSTER_INDEX_ENABLED:
+            # Memory-mapped index shared by all worker processes
+            if roster_index.read_version() != version:
+                roster_index.build_from_store(conn)
+            mappings = roster_index.RosterIndex()
+        else:
+            mappings = {}
+            for student in roster_store.load_students(conn):
+                if student['url']:
+                    mappings[student['code']] = {
+                        'name': student['name'],
+                        'url': student['url']
+                    }
+
+        # Swap in the new mappings in one step so requests never see a partial load
+        STUDENT_MAPPINGS = mappings
+        ROSTER_VERSION = version
+        ACTIVITY.record_reload(ROSTER_VERSION, len(STUDENT_MAPPINGS))
+
+        print(f"Loaded {len(STUDENT_MAPPINGS)} student mappings (roster version {ROSTER_VERSION})")
+        return True
 
-        .error {
-            background: #fee;
-            color: #c33;
-            padding: 12px;
-            border-radius: 6px;
-            margin-bottom: 20px;
-            border-left: 4px solid #c33;
-            font-size: 14px;
-        }
+    except FileNotFoundError:
+        print("ERROR: students.xlsx not found!")
+        print("Run: python src/generate_initial_links.py")
+        return False
+    except Exception as e:
+        print(f"ERROR loading roster: {e}")
+        return False
 
-        .info {
-            background: #f0f9ff;
-            color: #0369a1;
-            padding: 12px;
-            border-radius: 6px;
-            margin-top: 20px;
-            border-left: 4px solid #0369a1;
-            font-size: 13px;
-        }
 
-        .stats {
-            text-align: center;
-            color: #999;
-            font-size: 12px;
-            margin-top: 20px;
-            padding-top: 20px;
-            border-top: 1px solid #eee;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Writing Assignment</h1>
-        <p class="subtitle">Enter your student code to begin</p>
-
-        {% if error %}
-        <div class="error">
-            {{ error }}
-        </div>
-        {% endif %}
+@app.before_request
+def note_arrival():
+    """Remember when the request arrived, for the traffic recording."""
+    if TRAFFIC_RECORDER is not None:
+        g.arrived = time.time()
 
-        <form method="POST">
-            <div class="form-group">
-                <label for="code">Student Code</label>
-                <input
-                    type="text"
-                    id="code"
-                    name="code"
-                    placeholder="e.g., STU001"
-                    autofocus
-                    required
-                    autocomplete="off"
-                >
-            </div>
-            <button type="submit">Start Writing →</button>
-        </form>
 
-        <div class="info">
-            <strong>Instructions:</strong>
-            <ul style="margin-left: 20px; margin-top: 8px;">
-                <li>Enter your assigned code above</li>
-                <li>Complete your writing assignment (~250 words)</li>
-                <li>Upload your picture</li>
-                <li>Click Submit when finished</li>
-            </ul>
-        </div>
+@app.after_request
+def record_traffic(response):
+    """Append the request to the traffic recording, if one is running."""
+    if TRAFFIC_RECORDER is not None and 'arrived' in g and replayable(response):
+        code = request.form.get('code', '') if request.method == 'POST' else ''
+        path = request.full_path if request.query_string else request.path
+        TRAFFIC_RECORDER.record(g.arrived, request.method, path, code, response.status_code)
+    return response
+
+
+def replayable(response):
+    """
+    Whether traffic.py can send the request again as recorded.
+
+    Event streams would hang until the replay timeout, and /admin/ actions
+    and other POSTs need bodies or tokens that aren't recorded.
+    """
+    if response.is_streamed or request.path.startswith('/admin/'):
+        return False
+    return request.method != 'POST' or request.endpoint == 'index'
 
-        <div class="stats">
-            {{ student_count }} students registered
-        </div>
-    </div>
-</body>
-</html>
-"""
+
+@app.before_request
+def refresh_mappings():
+    """Pick up URLs written by the link scripts (checked at most once per ROSTER_POLL_SECONDS)."""
+    global _last_version_check
+
+    # A push brings its own changes; reloading first would only slow it down
+    if request.endpoint == 'apply_pushed_urls':
+        return
+
+    now = time.monotonic()
+    if now - _last_version_check < config.ROSTER_POLL_SECONDS:
+        return
+    _last_version_check = now
+
+    # Only one thread reloads; others keep serving the current mappings
+    if not _reload_lock.acquire(blocking=False):
+        return
+    try:
+        if roster_store.get_version(get_roster_connection()) != ROSTER_VERSION:
+            load_student_mappings(sync_xlsx=False)
+    finally:
+        _reload_lock.release()
 
 
 @app.route('/', methods=['GET', 'POST'])
+@profiling.stage('render')
 def index():
     """Main entry page - student enters code."""
+    global _entry_page
 
     if request.method == 'POST':
         code = request.form.get('code', '').strip().upper()
 
         if not code:
-            return render_template_string(
-                HTML_TEMPLATE,
-                error="Please enter your student code.",
-                student_count=len(STUDENT_MAPPINGS)
-            )
+            return render_entry_page(error="Please enter your student code.")
 
         # Check if code exists
         if code in STUDENT_MAPPINGS:
-            url = STUDENT_MAPPINGS[code]['url']
-            return redirect(url)
+            student = STUDENT_MAPPINGS[code]
+            ACTIVITY.record_open(code, student['name'])
+            return redirect(student['url'])
         else:
-            return render_template_string(
-                HTML_TEMPLATE,
-                error=f"Code '{code}' not found. Please check your code and try again.",
-                student_count=len(STUDENT_MAPPINGS)
-            )
+            ACTIVITY.record_miss(code)
+            return render_entry_page(error=f"Code '{code}' not found. Please check your code and try again.")
+
+    # GET request - the same page for everyone until the roster changes
+    page = _entry_page
+    if page['version'] != ROSTER_VERSION or page['body'] is None:
+        html = render_entry_page().encode('utf-8')
+        page = _entry_page = {
+            'version': ROSTER_VERSION,
+            'body': static_assets.Precompressed(html, 'text/html; charset=utf-8'),
+        }
+    return send_precompressed(page['body'], 'no-cache')
+
 
-    # GET request - show entry form
+def render_entry_page(**context):
+    """Render the entry page template with the current student count."""
     return render_template_string(
-        HTML_TEMPLATE,
-        student_count=len(STUDENT_MAPPINGS)
+        entry_template.HTML_TEMPLATE,
+        css_url=ASSET_URLS['portal.css'],
+        student_count=len(STUDENT_MAPPINGS),
+        **context
     )
 
 
+def send_precompressed(body, cache_control):
+    """Send the variant of a static_assets.Precompressed body the client accepts."""
+    encoding, data = body.choose(request.headers.get('Accept-Encoding'))
+    response = Response(data, content_type=body.content_type)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = cache_control
+    response.set_etag(f"{body.etag}-{encoding}")
+    return response.make_conditional(request)
+
+
+@app.route('/assets/<name>')
+def asset(name):
+    """Fingerprinted static files - the URL changes with the contents."""
+    body = ASSET_BODIES.get(name)
+    if body is None:
+        abort(404)
+    return send_precompressed(body, static_assets.IMMUTABLE)
+
+
 @app.route('/reload')
 def reload_mappings():
-    """Reload student mappings from CSV (useful for updates between sessions)."""
+    """Reload student mappings, re-importing students.xlsx if it was edited."""
     if load_student_mappings():
         return f"<h1>Reloaded {len(STUDENT_MAPPINGS)} student mappings</h1><a href='/'>Back to entry page</a>"
     else:
@@ -272,6 +274,7 @@ def reload_mappings():
 
 
 @app.route('/admin')
+@profiling.stage('render admin')
 def admin():
     """Simple admin page showing all student codes and names."""
     html = """
@@ -293,14 +296,49 @@ def admin():
                 text-decoration: none;
                 border-radius: 4px;
             }
+            .upload { background: #f5f5ff; padding: 16px; border-radius: 6px; margin-top: 20px; }
+            .upload button { padding: 8px 16px; background: #667eea; color: white; border: none; border-radius: 4px; cursor: pointer; }
+            #jobs td { padding: 8px 12px; font-size: 14px; }
+            .failed { color: #c33; } .done { color: #16a34a; }
+            .notice { background: #fffbeb; border-left: 4px solid #d97706; padding: 10px; margin-top: 12px; display: none; }
         </style>
     </head>
     <body>
         <div class="header">
             <h1>Student List</h1>
-            <a href="/" class="button">Back to Entry</a>
+            <span>
+                <a href="/dashboard" class="button">Live Dashboard</a>
+                <a href="/" class="button">Back to Entry</a>
+            </span>
         </div>
-        <p><strong>{{ count }}</strong> students registered</p>
+        <p><strong>{{ count }}</strong> students registered · roster version <strong>{{ version }}</strong>
+        {% if snapshot %}· snapshots from {{ snapshot.source }}{% if snapshot.last_error %} (last poll failed: {{ snapshot.last_error }}){% endif %}{% endif %}</p>
+        {% if forms %}
+        <p>Forms:
+            {% for form_id, form in forms.items() %}
+            <strong>{{ form.label }}</strong>{% if form_id == default_form %} (default){% endif %}{% if not loop.last %}, {% endif %}
+            {% endfor %}
+        </p>
+        {% endif %}
+        <form class="upload" method="POST" action="/admin/upload" enctype="multipart/form-data">
+            <strong>Regenerate links from a Forms export:</strong>
+            <input type="file" name="results" accept=".xlsx" multiple required>
+            {% if needs_token %}
+            <input type="password" name="token" placeholder="Upload token (.cache/push_token)" required>
+            {% endif %}
+            {% if forms %}
+            <select name="form">
+                {% for form_id, form in forms.items() %}
+                <option value="{{ form_id }}"{% if form_id == default_form %} selected{% endif %}>{{ form.label }}</option>
+                {% endfor %}
+            </select>
+            {% endif %}
+            <button type="submit">Upload</button>
+        </form>
+        <table id="jobs" style="display: none">
+            <tr><th>Job</th><th>Files</th><th>Status</th><th>Progress</th></tr>
+        </table>
+        <div id="job-notice" class="notice"></div>
         <table>
             <tr>
                 <th>Code</th>
@@ -315,42 +353,521 @@ def admin():
             </tr>
             {% endfor %}
         </table>
+        <script>
+            const jobs = document.getElementById('jobs');
+            const jobRows = {};
+
+            function showJob(job) {
+                let row = jobRows[job.id];
+                if (!row) {
+                    row = jobRows[job.id] = jobs.insertRow(1);
+                    for (let i = 0; i < 4; i++) row.insertCell();
+                    row.cells[0].innerHTML = `<a href="/admin/jobs/${job.id}">#${job.id}</a>`;
+                    row.cells[1].textContent = job.files.join(', ');
+                }
+                jobs.style.display = '';
+                row.cells[2].textContent = job.state === 'failed' ? `failed: ${job.error}` : job.state === 'running' ? job.stage : job.state;
+                row.cells[2].className = job.state;
+                row.cells[3].textContent = job.total
+                    ? `${job.processed} / ${job.total} rows · ${job.matched} matched · ${job.unmatched} unmatched`
+                    : '';
+            }
+
+            const events = new EventSource('/events');
+            events.addEventListener('snapshot', e => JSON.parse(e.data).jobs.slice().reverse().forEach(showJob));
+            events.addEventListener('job', e => {
+                const job = JSON.parse(e.data);
+                showJob(job);
+                if (job.state === 'done') {
+                    const notice = document.getElementById('job-notice');
+                    notice.textContent = `Job #${job.id} finished - students now get the new links. Refresh to see the updated list.`;
+                    notice.style.display = 'block';
+                }
+            });
+        </script>
     </body>
     </html>
     """
     return render_template_string(
         html,
         students=STUDENT_MAPPINGS,
-        count=len(STUDENT_MAPPINGS)
+        count=len(STUDENT_MAPPINGS),
+        version=ROSTER_VERSION,
+        snapshot=SNAPSHOT_POLLER,
+        forms=form_registry.load_registry()['forms'],
+        default_form=form_registry.get_form()['id'],
+        needs_token=not is_local_request()
     )
 
 
+def is_local_request():
+    """Whether the request comes from this machine."""
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+def valid_token(token):
+    """Whether token is the push token (see src/roster_push.py)."""
+    return bool(PUSH_TOKEN) and hmac.compare_digest(token.encode(), PUSH_TOKEN.encode())
+
+
+@app.route('/admin/upload', methods=['POST'])
+def upload_results():
+    """Save an uploaded Forms export and queue a regeneration job for it."""
+    # Uploads rewrite every student's link: only from this machine, or with the token
+    token = request.form.get('token') or request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not is_local_request() and not valid_token(token):
+        return "<h1>Uploads need the upload token</h1><a href='/admin'>Back to admin</a>", 403
+
+    files = [f for f in request.files.getlist('results') if f.filename]
+    if not files:
+        return "<h1>No file selected</h1><a href='/admin'>Back to admin</a>", 400
+
+    upload_dir = Path(config.UPLOAD_DIR)
+    if not upload_dir.is_absolute():
+        upload_dir = Path(__file__).parent.parent / upload_dir
+    upload_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    for upload in files:
+        filename = secure_filename(upload.filename)
+        if not filename.lower().endswith('.xlsx'):
+            return f"<h1>Not an Excel file: {upload.filename}</h1><a href='/admin'>Back to admin</a>", 400
+        path = upload_dir / f"{stamp}-{filename}"
+        upload.save(path)
+        paths.append(path)
+
+    JOBS.submit(paths, request.form.get('form') or None)
+    return redirect('/admin')
+
+
+@app.route('/admin/push', methods=['POST'])
+def apply_pushed_urls():
+    """Apply URLs pushed by the link scripts (see src/roster_push.py)."""
+    global STUDENT_MAPPINGS, ROSTER_VERSION
+
+    if not valid_token(request.headers.get('Authorization', '').removeprefix('Bearer ')):
+        return json_response(lookup_api.encode({'error': 'invalid token'}), status=403)
+
+    data = request.get_json(silent=True)
+    try:
+        base_version, version = int(data['base_version']), int(data['version'])
+        entries = {str(code): {'name': str(entry['name']), 'url': str(entry['url'])}
+                   for code, entry in data['entries'].items()}
+    except (TypeError, KeyError, ValueError, AttributeError):
+        return json_response(lookup_api.encode({'error': 'malformed update'}), status=400)
+
+    with _reload_lock:
+        if ROSTER_VERSION == version:
+            # Already picked up by the roster poll
+            return json_response(lookup_api.encode({'applied': 0, 'version': version}))
+        if not isinstance(STUDENT_MAPPINGS, dict):
+            return json_response(lookup_api.encode({'error': 'server uses the roster index'}), status=409)
+        if config.SNAPSHOT_SOURCE:
+            return json_response(lookup_api.encode({'error': 'server follows snapshots'}), status=409)
+        if ROSTER_VERSION != base_version:
+            return json_response(lookup_api.encode({'error': f'server is on version {ROSTER_VERSION}'}), status=409)
+
+        # Copy, update and swap, so requests see all the new URLs or none
+        mappings = dict(STUDENT_MAPPINGS)
+        mappings.update(entries)
+        STUDENT_MAPPINGS = mappings
+        ROSTER_VERSION = version
+        ACTIVITY.record_reload(ROSTER_VERSION, len(STUDENT_MAPPINGS))
+
+    print(f"Applied {len(entries)} pushed URLs (roster version {version})")
+    return json_response(lookup_api.encode({'applied': len(entries), 'version': version}))
+
+
+@app.route('/admin/jobs/<int:job_id>')
+def job_log(job_id):
+    """Output of a regeneration job (as regenerate_links.py would print it)."""
+    job = JOBS.get(job_id)
+    if job is None:
+        abort(404)
+    return render_template_string(
+        """
+        <h1>Job #{{ job.id }}: {{ job.state }}</h1>
+        <p>{{ job.files | join(', ') }}{% if job.error %} - {{ job.error }}{% endif %}</p>
+        <pre>{{ job.log or 'No output yet.' }}</pre>
+        <a href="/admin">Back to admin</a>
+        """,
+        job=job
+    )
+
+
+@app.route('/dashboard')
+def dashboard():
+    """Live view of who has opened their link (updated over /events)."""
+    html = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Live Dashboard</title>
+        <style>
+            body { font-family: sans-serif; max-width: 800px; margin: 40px auto; padding: 20px; }
+            table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+            th, td { padding: 10px 12px; text-align: left; border-bottom: 1px solid #ddd; }
+            th { background: #667eea; color: white; }
+            tr.opened td { background: #f0fdf4; }
+            .header { display: flex; justify-content: space-between; align-items: center; }
+            .button { padding: 8px 16px; background: #667eea; color: white; text-decoration: none; border-radius: 4px; }
+            .counters span { margin-right: 20px; }
+            .live { color: #16a34a; } .offline { color: #c33; }
+            .notice { background: #fffbeb; border-left: 4px solid #d97706; padding: 10px; margin-top: 12px; display: none; }
+            #misses { color: #c33; font-size: 13px; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>Live Dashboard</h1>
+            <a href="/admin" class="button">Student List</a>
+        </div>
+        <p class="counters">
+            <span><strong id="opened-count">0</strong> / {{ count }} opened</span>
+            <span><strong id="misses-count">0</strong> codes not found</span>
+            <span id="status" class="offline">● connecting</span>
+        </p>
+        <p id="misses"></p>
+        <div id="reload-notice" class="notice"></div>
+        <table>
+            <tr><th>Code</th><th>Name</th><th>Opened</th></tr>
+            {% for code, data in students.items() %}
+            <tr data-code="{{ code }}"><td><strong>{{ code }}</strong></td><td>{{ data.name }}</td><td>-</td></tr>
+            {% endfor %}
+        </table>
+        <script>
+            const rows = {};
+            document.querySelectorAll('tr[data-code]').forEach(row => rows[row.dataset.code] = row);
+            const opened = new Set();
+            const status = document.getElementById('status');
+
+            function clock(seconds) {
+                return new Date(seconds * 1000).toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
+            }
+            function markOpened(code, count, time) {
+                const row = rows[code];
+                if (!row) return;
+                opened.add(code);
+                row.classList.add('opened');
+                row.cells[2].textContent = count > 1 ? `${clock(time)} (${count}×)` : clock(time);
+                document.getElementById('opened-count').textContent = opened.size;
+            }
+            function showMisses(count, recent) {
+                document.getElementById('misses-count').textContent = count;
+                document.getElementById('misses').textContent =
+                    recent.length ? 'Recent: ' + recent.map(m => m.code || '(blank)').join(', ') : '';
+            }
+
+            let recentMisses = [];
+            const events = new EventSource('/events');
+            events.onopen = () => { status.textContent = '● live'; status.className = 'live'; };
+            events.onerror = () => { status.textContent = '● reconnecting'; status.className = 'offline'; };
+            events.addEventListener('snapshot', e => {
+                const data = JSON.parse(e.data);
+                for (const [code, entry] of Object.entries(data.opened)) markOpened(code, entry.count, entry.last);
+                recentMisses = data.recent_misses;
+                showMisses(data.misses, recentMisses);
+            });
+            events.addEventListener('opened', e => {
+                const data = JSON.parse(e.data);
+                markOpened(data.code, data.count, data.time);
+            });
+            events.addEventListener('miss', e => {
+                const data = JSON.parse(e.data);
+                recentMisses = recentMisses.concat([data]).slice(-{{ recent_misses }});
+                showMisses(data.misses, recentMisses);
+            });
+            events.addEventListener('reload', e => {
+                const data = JSON.parse(e.data);
+                const notice = document.getElementById('reload-notice');
+                notice.textContent = `Roster reloaded (version ${data.version}, ${data.students} students) at ${clock(data.time)} - refresh to see roster changes.`;
+                notice.style.display = 'block';
+            });
+        </script>
+    </body>
+    </html>
+    """
+    return render_template_string(
+        html,
+        students=STUDENT_MAPPINGS,
+        count=len(STUDENT_MAPPINGS),
+        recent_misses=live_events.RECENT_MISSES
+    )
+
+
+@app.route('/events')
+def events():
+    """Server-Sent Events stream of dashboard activity."""
+    return Response(
+        ACTIVITY.stream({'version': ROSTER_VERSION, 'jobs': JOBS.list_jobs()}),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def api_fields():
+    """Writing field IDs for lookup_api.link_session(), read once per roster version."""
+    if _api_cache['version'] != ROSTER_VERSION:
+        _api_cache.update(version=ROSTER_VERSION, roster=None, fields=lookup_api.writing_fields())
+    return _api_cache['fields']
+
+
+def json_response(body, etag=None, status=200):
+    """Encoded JSON answer; GETs with a matching If-None-Match get a 304."""
+    response = Response(body, status=status, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+    return response
+
+
+@app.route('/api/lookup', methods=['GET', 'POST'])
+def api_lookup():
+    """Links for one code or a batch of codes, as JSON."""
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        values = data.get('codes') if isinstance(data, dict) else None
+        if not isinstance(values, list):
+            return json_response(lookup_api.encode({'error': 'expected {"codes": [...]}'}), status=400)
+    else:
+        values = request.args.getlist('code') + request.args.getlist('codes')
+
+    try:
+        codes = lookup_api.parse_codes(values, config.API_MAX_CODES)
+    except ValueError as e:
+        return json_response(lookup_api.encode({'error': str(e)}), status=400)
+
+    mappings, version = STUDENT_MAPPINGS, ROSTER_VERSION
+    body = lookup_api.encode(lookup_api.lookup(mappings, codes, version, api_fields()))
+    return json_response(body, etag=lookup_api.etag(version, codes))
+
+
+@app.route('/api/students')
+def api_students():
+    """Every student's link as JSON, encoded once per roster version."""
+    fields = api_fields()
+    mappings, version = STUDENT_MAPPINGS, ROSTER_VERSION
+    etag = lookup_api.etag(version)
+
+    # Answer a matching If-None-Match without touching the roster
+    if request.if_none_match.contains(etag):
+        return json_response(b'', etag=etag)
+
+    body = _api_cache['roster']
+    if body is None or _api_cache['version'] != version:
+        body = lookup_api.encode(lookup_api.whole_roster(mappings, version, fields))
+        if _api_cache['version'] == version:
+            _api_cache['roster'] = body
+    return json_response(body, etag=etag)
+
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and answering."""
+    return "ok\n", 200, {'Content-Type': 'text/plain'}
+
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: the roster is loaded and pages are warm (503 while starting or draining)."""
+    status = 200 if SERVER_STATE == 'ready' else 503
+    return f"{SERVER_STATE}\n", status, {'Content-Type': 'text/plain'}
+
+
+@app.route('/metrics')
+def metrics():
+    """Plain-text metrics (Prometheus format) for monitoring several nodes."""
+    lines = [
+        "# HELP roster_version Roster version currently served",
+        "# TYPE roster_version gauge",
+        f"roster_version {ROSTER_VERSION if ROSTER_VERSION is not None else -1}",
+        "# HELP roster_students Students with a form URL",
+        "# TYPE roster_students gauge",
+        f"roster_students {len(STUDENT_MAPPINGS)}",
+        "# HELP entry_codes_total Codes entered on the entry page",
+        "# TYPE entry_codes_total counter",
+        f'entry_codes_total{{result="found"}} {ACTIVITY.hits}',
+        f'entry_codes_total{{result="not_found"}} {ACTIVITY.misses}',
+        "# HELP dashboard_subscribers Open live dashboard streams",
+        "# TYPE dashboard_subscribers gauge",
+        f"dashboard_subscribers {ACTIVITY.subscriber_count}",
+    ]
+
+    if SNAPSHOT_POLLER:
+        lines += [
+            "# HELP roster_snapshot_last_poll_seconds Unix time of the last snapshot poll",
+            "# TYPE roster_snapshot_last_poll_seconds gauge",
+            f"roster_snapshot_last_poll_seconds {SNAPSHOT_POLLER.last_poll or 0:.0f}",
+            "# HELP roster_snapshot_errors_total Failed snapshot polls",
+            "# TYPE roster_snapshot_errors_total counter",
+            f"roster_snapshot_errors_total {SNAPSHOT_POLLER.errors}",
+        ]
+
+    return "\n".join(lines) + "\n", 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
+def start_snapshot_poller():
+    """Follow roster snapshots: apply the latest one now, then poll in the background."""
+    global SNAPSHOT_POLLER
+
+    SNAPSHOT_POLLER = roster_snapshot.SnapshotPoller(config.SNAPSHOT_SOURCE)
+    try:
+        SNAPSHOT_POLLER.poll_once(get_roster_connection())
+    except Exception as e:
+        SNAPSHOT_POLLER.errors += 1
+        SNAPSHOT_POLLER.last_error = str(e)
+        print(f"WARNING: Could not fetch roster snapshot from {config.SNAPSHOT_SOURCE}: {e}")
+    SNAPSHOT_POLLER.start()
+
+
+def warm_up():
+    """Render every page once, so the first students don't wait for it."""
+    global SERVER_STATE
+
+    with app.test_client() as client:
+        for path in ('/', '/admin', '/dashboard', '/api/students', '/metrics'):
+            # Closing the response ends the request for IN_FLIGHT
+            client.get(path).close()
+    SERVER_STATE = 'ready'
+
+
+def serve(listen_fd=None):
+    """
+    Serve until Ctrl+C, or until a graceful restart hands over to a new process.
+
+    Args:
+        listen_fd: Listening socket inherited from the previous server, if any
+    """
+    global SERVER_STATE
+
+    server = make_server(config.FLASK_HOST, config.FLASK_PORT, app, threaded=True, fd=listen_fd)
+    if listen_fd is not None:
+        os.close(listen_fd)  # the server has its own copy
+
+    stopping = threading.Lock()
+    handed_over = threading.Event()
+
+    def hand_over():
+        global SERVER_STATE
+        if not stopping.acquire(blocking=False):
+            return
+        print("\nRestart requested: starting a new server process...")
+        if graceful_restart.start_successor(server.fileno(), config.RESTART_TIMEOUT_SECONDS) is None:
+            print("⚠ The new server did not start - still serving")
+            stopping.release()
+            return
+        handed_over.set()
+        SERVER_STATE = 'draining'
+        server.shutdown()
+
+    def stop():
+        global SERVER_STATE
+        if not stopping.acquire(blocking=False):
+            return
+        SERVER_STATE = 'draining'
+        server.shutdown()
+
+    # Signal handlers run in the main thread, which is busy serving
+    if graceful_restart.RESTART_SIGNAL:
+        signal.signal(graceful_restart.RESTART_SIGNAL,
+                      lambda signum, frame: threading.Thread(target=hand_over, daemon=True).start())
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=stop, daemon=True).start())
+
+    graceful_restart.write_pid_file()
+    graceful_restart.notify_ready()
+    try:
+        server.serve_forever()
+    finally:
+        graceful_restart.remove_pid_file()
+
+    if SERVER_STATE == 'draining':
+        # Dashboards reconnect to the new server when their stream ends
+        ACTIVITY.close_streams()
+        busy = IN_FLIGHT.count
+        done = "Handed over to the new server" if handed_over.is_set() else "Server stopped"
+        if IN_FLIGHT.wait_idle(config.RESTART_DRAIN_SECONDS):
+            print(f"✓ {done} ({busy} requests finished first)")
+        else:
+            print(f"⚠ {done}; {IN_FLIGHT.count} requests still running were cut off")
+
+
 def main():
     """Start the Flask server."""
 
+    global TRAFFIC_RECORDER, PUSH_TOKEN
+
+    if '--restart' in sys.argv[1:]:
+        graceful_restart.request_restart()
+        return
+
+    # Requests run in threads, so tracemalloc's process-wide peak can't be
+    # split between their stages
+    profiling.configure(track_peak=False)
+
+    # Set when a running server is handing over to this one
+    listen_fd = graceful_restart.inherited_socket_fd()
+
+    # Also lets the admin page accept uploads from other machines
+    if config.PUSH_ENABLED:
+        PUSH_TOKEN = roster_push.push_token(create=True)
+
+    # Nodes behind a load balancer pull the roster from published snapshots
+    if config.SNAPSHOT_SOURCE:
+        start_snapshot_poller()
+
+    # Read the form registry once (forms.json, if forms were registered)
+    forms = form_registry.load_registry()['forms']
+
     # Load student mappings
     if not load_student_mappings():
         print("\nPlease run: python generate_initial_links.py")
         sys.exit(1)
 
+    warm_up()
+
+    if config.TRAFFIC_RECORD_FILE:
+        record_file = Path(config.TRAFFIC_RECORD_FILE)
+        if not record_file.is_absolute():
+            record_file = Path(__file__).parent.parent / record_file
+        TRAFFIC_RECORDER = traffic.TrafficRecorder(record_file)
+
+    if listen_fd is not None:
+        print(f"✓ New server process {os.getpid()} ready - taking over http://{config.FLASK_HOST}:{config.FLASK_PORT}")
+        serve(listen_fd)
+        return
+
     print("\n" + "="*60)
     print("Student Writing Portal - Server Starting")
     print("="*60)
     print(f"\nStudents registered: {len(STUDENT_MAPPINGS)}")
+    if forms:
+        print(f"Forms registered:    {len(forms)} (default: {form_registry.get_form()['label']})")
     print(f"\nServer will start on: http://{config.FLASK_HOST}:{config.FLASK_PORT}")
     print("\nAccess URLs:")
     print(f"  - Student entry: http://YOUR_IP:{config.FLASK_PORT}/")
     print(f"  - Admin panel:   http://YOUR_IP:{config.FLASK_PORT}/admin")
+    print(f"  - Dashboard:     http://YOUR_IP:{config.FLASK_PORT}/dashboard")
     print(f"  - Reload data:   http://YOUR_IP:{config.FLASK_PORT}/reload")
+    print(f"  - Metrics:       http://YOUR_IP:{config.FLASK_PORT}/metrics")
+    print(f"  - Health:        http://YOUR_IP:{config.FLASK_PORT}/healthz and /readyz")
+    if TRAFFIC_RECORDER:
+        print(f"\nRecording requests to {config.TRAFFIC_RECORD_FILE}")
     print("\nPress Ctrl+C to stop the server")
+    if not config.FLASK_DEBUG and graceful_restart.RESTART_SIGNAL:
+        print("Restart without downtime: python src/app.py --restart")
     print("="*60 + "\n")
 
-    # Start Flask server
-    app.run(
-        host=config.FLASK_HOST,
-        port=config.FLASK_PORT,
-        debug=config.FLASK_DEBUG
-    )
+    # The debug reloader restarts on code changes; otherwise serve with graceful restarts
+    if config.FLASK_DEBUG:
+        app.run(
+            host=config.FLASK_HOST,
+            port=config.FLASK_PORT,
+            debug=config.FLASK_DEBUG
+        )
+    else:
+        serve()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Check that cli.py help and the lightweight commands start quickly.
+
+Runs each command several times in a fresh interpreter, reports the best
+time and exits with status 1 if any command is slower than its limit (a
+heavy import crept into the startup path).
+
+Usage:
+    python src/benchmarks/bench_cli_startup.py
+    python src/benchmarks/bench_cli_startup.py --runs 10 --limit-ms 150
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+CLI = Path(__file__).parent.parent / 'cli.py'
+
+# Commands that must not import Flask, pandas or python-docx
+LIGHT_COMMANDS = [
+    [],
+    ['--help'],
+    ['regenerate', '--help'],
+    ['docs', '--help'],
+    ['forms'],
+]
+
+HEAVY_MODULES = ['flask', 'pandas', 'docx', 'openpyxl', 'numpy']
+
+
+def best_time(args, runs):
+    """Fastest wall-clock time of `python cli.py args` over several runs."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(CLI)] + args, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def heavy_imports(args):
+    """Heavy modules imported while running a command."""
+    code = (
+        "import sys, runpy\n"
+        f"sys.argv = [{str(CLI)!r}] + {args!r}\n"
+        f"runpy.run_path({str(CLI)!r}, run_name='__main__')\n"
+        f"print('heavy:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    line = result.stdout.strip().splitlines()[-1]
+    return [m for m in line[len('heavy:'):].split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--limit-ms', type=float, default=40.0,
+                        help='allowed time above a bare interpreter start')
+    args = parser.parse_args()
+
+    # Measure a bare interpreter so the limit doesn't depend on the machine
+    baseline = float('inf')
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        baseline = min(baseline, time.perf_counter() - start)
+
+    print(f"Python startup: {baseline * 1000:.0f} ms")
+    print()
+    print(f"{'command':<24}  {'time':>8}  {'over python':>11}  heavy imports")
+
+    failures = []
+    for command in LIGHT_COMMANDS:
+        seconds = best_time(command, args.runs)
+        overhead = (seconds - baseline) * 1000
+        heavy = heavy_imports(command)
+        label = ' '.join(command) or '(no args)'
+        print(f"{label:<24}  {seconds * 1000:>6.0f}ms  {overhead:>9.0f}ms  {', '.join(heavy) or '-'}")
+
+        if overhead > args.limit_ms:
+            failures.append(f"{label}: {overhead:.0f} ms over Python startup (limit {args.limit_ms:.0f} ms)")
+        if heavy:
+            failures.append(f"{label}: imports {', '.join(heavy)}")
+
+    print()
+    if failures:
+        print("✗ Startup regression:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("✓ All commands within limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of generate_initial_links.py and regenerate_links.py.
+
+For each roster size, a synthetic roster and Forms export are written to a
+scratch copy of the project, both scripts are run with --profile-json, and
+the per-stage times are compared with a saved baseline. The URLs each
+script writes to students.xlsx are hashed, so a change that alters the
+output is caught as well as one that slows it down.
+
+Exits with status 1 if the output differs from the baseline or any stage
+is slower than the baseline by more than the threshold.
+
+Usage:
+    python src/benchmarks/bench_link_scripts.py --save-baseline
+    python src/benchmarks/bench_link_scripts.py
+    python src/benchmarks/bench_link_scripts.py --rows 1000 10000 100000 --threshold 1.25
+"""
+
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from make_synthetic_data import write_dataset
+
+SRC_DIR = Path(__file__).parent.parent
+DEFAULT_BASELINE = SRC_DIR.parent / '.cache' / 'bench_link_scripts.json'
+
+# Stages faster than this are too noisy to flag
+NOISE_FLOOR_SECONDS = 0.05
+
+SCRIPTS = {
+    'generate': ['generate_initial_links.py'],
+    'regenerate': ['regenerate_links.py', 'results.xlsx'],
+}
+
+# Appended to the scratch copy of config.py, so synthetic rosters never
+# reach a running server or the shared snapshot directory
+SCRATCH_CONFIG = """
+
+# Benchmark scratch copy: keep synthetic rosters to this project
+PUSH_ENABLED = False
+PUSH_TOKEN = None
+PUSH_URL = "http://127.0.0.1:9"
+SNAPSHOT_DIR = None
+"""
+
+
+def make_project(root, rows, seed):
+    """A scratch project: a copy of src/ plus synthetic students.xlsx and results.xlsx."""
+    shutil.copytree(SRC_DIR, root / 'src', ignore=shutil.ignore_patterns('__pycache__', 'benchmarks'))
+    with open(root / 'src' / 'config.py', 'a', encoding='utf-8') as f:
+        f.write(SCRATCH_CONFIG)
+    _, _, responses = write_dataset(root, rows, seed)
+    return responses
+
+
+def output_digest(students_file):
+    """sha256 over the (code, url) pairs in students.xlsx."""
+    workbook = load_workbook(students_file, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value).strip().lower() if value is not None else '' for value in next(rows)]
+        code_col, url_col = header.index('code'), header.index('url')
+        pairs = sorted((str(row[code_col]), str(row[url_col] or '')) for row in rows if row[code_col])
+    finally:
+        workbook.close()
+
+    digest = hashlib.sha256()
+    for code, url in pairs:
+        digest.update(f"{code}\t{url}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def run_script(root, name):
+    """
+    Run one script in the scratch project.
+
+    Returns:
+        dict with 'seconds' (wall clock), 'stages' (name -> seconds) and
+        'digest' of the resulting URLs
+    """
+    script, *args = SCRIPTS[name]
+    profile_file = root / f'{name}-profile.json'
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(root / 'src' / script)] + args + ['--profile-json', str(profile_file)],
+        cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    seconds = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} failed:\n{result.stderr}")
+
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        stages = {stage: stats['seconds'] for stage, stats in json.load(f)['stages'].items()}
+
+    return {'seconds': seconds, 'stages': stages, 'digest': output_digest(root / 'students.xlsx')}
+
+
+def run_size(rows, seed):
+    """Benchmark both scripts on one roster size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        responses = make_project(root, rows, seed)
+        results = {name: run_script(root, name) for name in SCRIPTS}
+    results['responses'] = responses
+    return results
+
+
+def compare(key, current, baseline, threshold):
+    """
+    Compare one size's results with its baseline.
+
+    Returns:
+        list of failure descriptions
+    """
+    failures = []
+    for name in SCRIPTS:
+        now, before = current[name], baseline[name]
+
+        if now['digest'] != before['digest']:
+            failures.append(f"{key} {name}: output differs from baseline")
+
+        timings = dict(now['stages'], total=now['seconds'])
+        base_timings = dict(before['stages'], total=before['seconds'])
+        for stage, seconds in timings.items():
+            base = base_timings.get(stage)
+            if base is None:
+                continue
+            if seconds > base * threshold and seconds - base > NOISE_FLOOR_SECONDS:
+                failures.append(f"{key} {name} / {stage}: {seconds:.2f}s vs {base:.2f}s baseline "
+                                f"({seconds / base:.2f}x, limit {threshold:.2f}x)")
+    return failures
+
+
+def print_results(key, results, baseline):
+    print(f"\n{key} ({results['responses']} responses)")
+    for name in SCRIPTS:
+        base = baseline.get(name, {}) if baseline else {}
+        timings = dict(results[name]['stages'], total=results[name]['seconds'])
+        base_timings = dict(base.get('stages', {}), total=base.get('seconds')) if base else {}
+        for stage, seconds in timings.items():
+            before = base_timings.get(stage)
+            change = f"{seconds / before:>6.2f}x" if before else '      -'
+            print(f"  {name:<11} {stage:<16} {seconds:>8.3f}s  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='fail if a stage takes more than this multiple of its baseline')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='record this run as the new baseline')
+    args = parser.parse_args()
+
+    try:
+        baselines = json.loads(args.baseline.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        baselines = {}
+
+    failures = []
+    for rows in args.rows:
+        key = f"{rows} rows (seed {args.seed})"
+        results = run_size(rows, args.seed)
+        print_results(key, results, baselines.get(key))
+
+        if args.save_baseline:
+            baselines[key] = results
+        elif key in baselines:
+            failures.extend(compare(key, results, baselines[key], args.threshold))
+        else:
+            print(f"  (no baseline for {key} - run with --save-baseline)")
+
+    print()
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baselines, indent=2), encoding='utf-8')
+        print(f"✓ Baseline saved to {args.baseline}")
+    elif failures:
+        print("✗ Benchmark regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    else:
+        print("✓ Output matches baseline and all stages are within limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark in-place URL cell updates against a full pandas rewrite.
+
+Builds a synthetic roster in a temporary directory, changes a few URLs and
+times both ways of writing them back to the workbook.
+
+Usage:
+    python src/benchmarks/bench_roster_writer.py
+    python src/benchmarks/bench_roster_writer.py --rows 50000 --changes 10
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from roster_writer import update_url_cells
+
+
+def make_roster(path, rows):
+    """Write a roster with long Session 1 style URLs."""
+    df = pd.DataFrame({
+        '#': range(1, rows + 1),
+        'code': [f'STU{i:06d}' for i in range(1, rows + 1)],
+        'name': [f'Student Number {i}' for i in range(1, rows + 1)],
+        'url': [f'https://forms.office.com/Pages/ResponsePage.aspx?id=abc&code=STU{i:06d}&info=' + 'x' * 200
+                for i in range(1, rows + 1)],
+    })
+    df.to_excel(path, index=False)
+
+
+def full_rewrite(path, urls):
+    """The previous approach: read the whole roster and write it back."""
+    df = pd.read_excel(path)
+    for idx, row in df.iterrows():
+        code = str(row['code']).strip().upper()
+        if code in urls:
+            df.at[idx, 'url'] = urls[code]
+    df.to_excel(path, index=False)
+
+
+def timed(func, *args):
+    """Run func and return elapsed seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--changes', type=int, default=10, help='URLs changed per run')
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'full rewrite':>13}  {'cell update':>12}  {'speed-up':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = Path(tmp) / f'students-{rows}.xlsx'
+            make_roster(path, rows)
+
+            step = max(rows // args.changes, 1)
+            urls = {f'STU{i:06d}': f'https://forms.office.com/new/{i}' for i in range(1, rows + 1, step)}
+
+            rewrite_seconds = timed(full_rewrite, path, urls)
+            make_roster(path, rows)
+            update_seconds = timed(update_url_cells, path, urls)
+
+            print(f"{rows:>8}  {rewrite_seconds:>12.2f}s  {update_seconds:>11.2f}s  {rewrite_seconds / update_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Generate a realistic roster and Forms export for benchmarking.
+
+The roster has Vietnamese and other accented names. The export uses the
+column names from config.py and includes what real classes produce:
+students who haven't submitted, resubmissions, mistyped or blank codes,
+a few copied texts and writing from a handful of words to well over the
+target length. Output is deterministic for a given seed.
+
+Usage:
+    python src/benchmarks/make_synthetic_data.py --rows 1000 --out bench-data
+    python src/benchmarks/make_synthetic_data.py --rows 100000 --out bench-data --seed 7
+"""
+
+import sys
+import random
+import argparse
+import pandas as pd
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import config
+
+FAMILY_NAMES = ['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Huỳnh', 'Phan', 'Vũ', 'Võ', 'Đặng',
+                'Bùi', 'Đỗ', 'Hồ', 'Ngô', 'Dương', 'Lý', 'García', 'Müller', 'Søren', 'O\'Brien']
+MIDDLE_NAMES = ['Văn', 'Thị', 'Hữu', 'Đức', 'Minh', 'Ngọc', 'Thanh', 'Quốc', '']
+GIVEN_NAMES = ['An', 'Bình', 'Châu', 'Dũng', 'Giang', 'Hương', 'Khánh', 'Lan', 'Mai', 'Nam',
+               'Oanh', 'Phúc', 'Quỳnh', 'Sơn', 'Thảo', 'Uyên', 'Việt', 'Xuân', 'Yến', 'Zoë',
+               'José', 'Chloé', 'Łukasz']
+
+VOCABULARY = (
+    "our class visited the school garden last week and we learned how vegetables grow "
+    "my favourite part was planting tomatoes with friends while the teacher explained "
+    "why plants need sunlight water and good soil everyone enjoyed the trip because "
+    "it was different from a normal lesson next month we will write about the festival "
+    "in our neighbourhood where families share food music and stories together "
+    "chúng em rất vui khi được tham gia hoạt động này"
+).split()
+
+# Share of rows with each kind of problem
+RESPONSE_RATE = 0.9
+DUPLICATE_RATE = 0.03
+BAD_CODE_RATE = 0.02
+COPIED_RATE = 0.01
+
+
+def make_name(rng):
+    middle = rng.choice(MIDDLE_NAMES)
+    parts = [rng.choice(FAMILY_NAMES), middle, rng.choice(GIVEN_NAMES)]
+    return ' '.join(part for part in parts if part)
+
+
+def make_writing(rng):
+    """Writing of realistic length, in one to four paragraphs."""
+    words = rng.choice([rng.randint(5, 60), rng.randint(180, 320), rng.randint(230, 270), rng.randint(400, 700)])
+    text = [rng.choice(VOCABULARY) for _ in range(words)]
+    for _ in range(rng.randint(0, 3)):
+        text.insert(rng.randrange(len(text) + 1), '\n\n')
+    return ' '.join(text).replace(' \n\n ', '\n\n').capitalize()
+
+
+def mistype(code, rng):
+    """A code with the kind of mistake students make."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        return code.lower()
+    if kind == 1:
+        return code.replace('0', 'O', 1)
+    if kind == 2:
+        i = rng.randrange(3, len(code))
+        return code[:i] + code[i + 1:]
+    if kind == 3:
+        return code + str(rng.randrange(10))
+    return ''
+
+
+def generate_roster(rows, seed=0):
+    """
+    A roster DataFrame with the columns of students.xlsx.
+
+    Args:
+        rows: Number of students
+        seed: Random seed
+
+    Returns:
+        DataFrame with '#', 'code', 'name' and an empty 'url' column
+    """
+    rng = random.Random(seed)
+    width = max(6, len(str(rows)))
+    return pd.DataFrame({
+        '#': range(1, rows + 1),
+        'code': [f'STU{i:0{width}d}' for i in range(1, rows + 1)],
+        'name': [make_name(rng) for _ in range(rows)],
+        'url': [''] * rows,
+    })
+
+
+def generate_export(roster, seed=0):
+    """
+    A Forms export DataFrame for a roster.
+
+    Args:
+        roster: DataFrame from generate_roster()
+        seed: Random seed
+
+    Returns:
+        DataFrame with the EXCEL_COL_* columns from config.py plus the
+        metadata columns Forms adds
+    """
+    rng = random.Random(seed + 1)
+    start = datetime(2026, 3, 2, 8, 0)
+    rows = []
+    texts = []
+
+    for code, name in zip(roster['code'], roster['name']):
+        if rng.random() > RESPONSE_RATE:
+            continue
+
+        submitted = start + timedelta(seconds=rng.randrange(3 * 3600))
+        if texts and rng.random() < COPIED_RATE:
+            text = rng.choice(texts)
+        else:
+            text = make_writing(rng)
+        texts.append(text)
+
+        response_code = mistype(code, rng) if rng.random() < BAD_CODE_RATE else code
+        rows.append((submitted, response_code, name, text))
+
+        if rng.random() < DUPLICATE_RATE:
+            rows.append((submitted + timedelta(minutes=rng.randint(1, 40)), code, name, make_writing(rng)))
+
+    rng.shuffle(rows)
+    return pd.DataFrame({
+        'Id': range(1, len(rows) + 1),
+        config.EXCEL_COL_TIMESTAMP: [row[0] for row in rows],
+        'Completion time': [row[0] + timedelta(minutes=20) for row in rows],
+        'Email': ['anonymous'] * len(rows),
+        'Name': ['Anonymous'] * len(rows),
+        config.EXCEL_COL_CODE: [row[1] for row in rows],
+        config.EXCEL_COL_NAME: [row[2] for row in rows],
+        config.EXCEL_COL_WRITING: [row[3] for row in rows],
+    })
+
+
+def write_dataset(out_dir, rows, seed=0):
+    """
+    Write students.xlsx and results.xlsx for one roster size.
+
+    Returns:
+        tuple of (roster path, export path, number of responses)
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    roster = generate_roster(rows, seed)
+    export = generate_export(roster, seed)
+
+    roster_file = out_dir / 'students.xlsx'
+    export_file = out_dir / 'results.xlsx'
+    roster.to_excel(roster_file, index=False)
+    export.to_excel(export_file, index=False)
+    return roster_file, export_file, len(export)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000, help='students in the roster')
+    parser.add_argument('--out', default='bench-data', help='output directory')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    roster_file, export_file, responses = write_dataset(args.out, args.rows, args.seed)
+    print(f"✓ Wrote {roster_file} ({args.rows} students)")
+    print(f"✓ Wrote {export_file} ({responses} responses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+One entry point for every tool in the project.
+
+Each subcommand imports its module only when it runs, so help and the
+lightweight commands don't pay for Flask, pandas or python-docx.
+
+Usage:
+    python src/cli.py                       # list commands
+    python src/cli.py serve
+    python src/cli.py regenerate results.xlsx
+    python src/cli.py regenerate --help     # usage for one command
+    python src/cli.py regenerate results.xlsx --profile
+"""
+
+import sys
+import importlib
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent
+
+# Add current directory to path for imports
+sys.path.insert(0, str(SRC_DIR))
+
+# name -> (module, usage, description)
+COMMANDS = {
+    'serve': ('app', '', "Start the student entry server"),
+    'generate': ('generate_initial_links', '[--form FORM]', "Generate Session 1 URLs for students.xlsx"),
+    'regenerate': ('regenerate_links', '<results.xlsx> [more.xlsx ...] [--form FORM] [--session N]',
+                   "Generate Session 2 URLs from Forms exports"),
+    'booklet': ('export_booklet', '<results.xlsx> [more.xlsx ...] [-o newsletter.docx]',
+                "Build the class newsletter booklet"),
+    'static-site': ('export_static_site', '[-o site] [--new-salt]',
+                    "Export the entry page and links as a static site"),
+    'extract-fields': ('utils.extract_form_fields', '[--batch urls.txt]',
+                       "Extract form field IDs from a prefilled URL"),
+    'extract-columns': ('utils.extract_excel_columns', '<results.xlsx>',
+                        "Extract column names from a Forms export"),
+    'docs': ('utils.md_to_docx', '<input.md> [-o output.docx] | --batch <dir> [-o output_dir]',
+             "Convert Markdown docs to Word"),
+    'forms': ('form_registry', '[default FORM]', "List registered forms or choose the default"),
+}
+
+PROGRAM = 'python src/cli.py'
+
+
+def print_usage():
+    """List the available commands."""
+    print(f"Usage: {PROGRAM} <command> [args...]")
+    print()
+    print("Commands:")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, _, description) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+    print()
+    print(f"Run '{PROGRAM} <command> --help' for a command's arguments.")
+
+
+def run(command, args):
+    """
+    Import a command's module and run its main() with the given arguments.
+
+    Args:
+        command: Key of COMMANDS
+        args: Arguments after the command name
+    """
+    module_name, usage, description = COMMANDS[command]
+
+    if args in (['-h'], ['--help']):
+        print(f"Usage: {PROGRAM} {command} {usage}".rstrip())
+        print()
+        print(description)
+        return
+
+    # --profile works for every command; the flags are stripped here.
+    # Imported only now, so help stays as light as a bare interpreter
+    import profiling
+    args = list(args)
+    profiling.configure(args)
+
+    # The scripts read their arguments from sys.argv
+    script = SRC_DIR / (module_name.replace('.', '/') + '.py')
+    sys.argv = [str(script)] + list(args)
+    module = importlib.import_module(module_name)
+    module.main()
+
+
+def main():
+    """Dispatch to a subcommand."""
+    args = sys.argv[1:]
+
+    if not args or args[0] in ('-h', '--help', 'help'):
+        print_usage()
+        return
+
+    command = args[0]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command '{command}'")
+        print()
+        print_usage()
+        sys.exit(1)
+
+    run(command, args[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,11 @@ In this example:
 # Your Microsoft Form base URL (without parameters)
 BASE_FORM_URL = "https://forms.office.com/Pages/ResponsePage.aspx?id=d1mqSFIaekWJPkWX4jID-6TR2-msV21DiHgXDnqmbZlUNEhVQU41QUYwM0FaOUo3N1pSTEU1M0dKSyQlQCN0PWcu"
 
+# Form used for link generation when several forms are registered in
+# forms.json (form ID or label). None uses the registry default, or the
+# values below when no forms are registered.
+ACTIVE_FORM = None
+
 # Field parameter names from the prefilled URL
 # These are the parameter names in the URL query string
 FIELD_STUDENT_NAME = "rd51cb215ea174739855916df02ad44cf"
@@ -52,6 +57,90 @@ WORD_COUNT_TARGET = 250
 WORD_COUNT_MIN = 240  # Below this: suggest adding more
 WORD_COUNT_MAX = 260  # Above this: suggest reducing
 
+# Writing analytics run on every response (see src/writing_analytics.py).
+# "counts" always runs, since the scripts need every response's word count.
+WRITING_ANALYZERS = ["counts", "readability"]
+
+# Extra Session 2 feedback. Each rule adds its message when the metric is
+# below and/or above the given values. Available metrics: words, sentences,
+# paragraphs, avg_sentence_length, reading_ease
+WRITING_FEEDBACK_RULES = [
+    {"metric": "avg_sentence_length", "above": 30, "message": "Try splitting some long sentences"},
+    # {"metric": "paragraphs", "below": 2, "message": "Break your writing into paragraphs"},
+]
+
+# Maximum number of feedback rule messages added to the progress message
+WRITING_FEEDBACK_MAX_MESSAGES = 2
+
+# Metrics of at most this many distinct texts are kept in
+# .cache/writing_analytics.json, evicting the least recently used
+WRITING_ANALYTICS_CACHE_MAX_ENTRIES = 20000
+
+# ============================================================================
+# COPIED TEXT DETECTION (see src/similarity.py)
+# ============================================================================
+
+# Check each regeneration run for copied or shared writing
+SIMILARITY_ENABLED = True
+
+# Estimated similarity (0-1) at which two submissions are reported
+SIMILARITY_THRESHOLD = 0.5
+
+# Responses shorter than this are too short to compare meaningfully
+SIMILARITY_MIN_WORDS = 30
+
+# Words per shingle, MinHash signature length and LSH bands.
+# MINHASH_PERMUTATIONS must be divisible by LSH_BANDS. Changing
+# MINHASH_PERMUTATIONS discards stored signatures from earlier sessions.
+SIMILARITY_SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+
+# ============================================================================
+# REGENERATION CONFIGURATION
+# ============================================================================
+
+# Match responses with mistyped codes to the roster by code typo and name
+# (see src/reconcile.py). Matches at or above the auto-apply confidence get
+# a Session 2 link; weaker ones are listed as suggestions in the summary.
+RECONCILE_ENABLED = True
+RECONCILE_AUTO_APPLY_CONFIDENCE = 0.85
+RECONCILE_SUGGEST_CONFIDENCE = 0.4
+
+# Keep every run's matched responses (word counts, metrics and text) in
+# history.db, for progress across sessions (see src/history_store.py)
+HISTORY_ENABLED = True
+
+# Maximum worker processes used to parse several Forms exports at once
+REGENERATE_MAX_WORKERS = 4
+
+# Parsed Excel tables are cached in .cache/parsed/, keyed by file contents
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_MAX_MB = 200
+
+# ============================================================================
+# NEWSLETTER BOOKLET (src/export_booklet.py)
+# ============================================================================
+
+BOOKLET_TITLE = "Class Newsletter"
+
+# Leave a box for a picture above each article
+BOOKLET_PICTURE_PLACEHOLDERS = True
+
+# Articles rendered per worker task; the booklet is assembled chunk by chunk
+BOOKLET_CHUNK_SIZE = 50
+
+# ============================================================================
+# STATIC SITE (src/export_static_site.py)
+# ============================================================================
+
+# Output folder for the static entry site (relative to the project root)
+STATIC_SITE_DIR = "site"
+
+# The lookup table is split into 16 ** STATIC_SITE_SHARD_CHARS files. 2 (256
+# shards) keeps each one small up to about 100,000 students; use 3 beyond that.
+STATIC_SITE_SHARD_CHARS = 2
+
 # ============================================================================
 # SERVER CONFIGURATION
 # ============================================================================
@@ -60,3 +149,58 @@ WORD_COUNT_MAX = 260  # Above this: suggest reducing
 FLASK_HOST = "0.0.0.0"  # Allow connections from any device on local network
 FLASK_PORT = 5001  # Changed from 5000 (conflicts with macOS AirPlay)
 FLASK_DEBUG = True  # Set to False in production
+
+# Serve lookups from a memory-mapped index file (roster.idx) instead of an
+# in-memory dict. Worth enabling for very large rosters (100,000+ students)
+# or when running several server processes.
+ROSTER_INDEX_ENABLED = False
+
+# How often (seconds) the server checks roster.db for URLs written by the
+# link scripts. students.xlsx edits are picked up by visiting /reload.
+ROSTER_POLL_SECONDS = 1.0
+
+# The link scripts send changed URLs straight to the running server, which
+# applies them at once (see src/roster_push.py). PUSH_URL points them at a
+# server on another machine; both sides then need the same PUSH_TOKEN. The
+# token also lets the admin page accept Forms uploads from other devices.
+PUSH_ENABLED = True
+PUSH_URL = None
+PUSH_TOKEN = None
+
+# Record every request (time, path, code entered, status) to this file so a
+# real class start can be replayed later with src/traffic.py, e.g.
+# "traffic.tsv". None = don't record.
+TRAFFIC_RECORD_FILE = None
+
+# Graceful restart (python src/app.py --restart, needs FLASK_DEBUG = False):
+# how long the new server may take to load before the restart is abandoned,
+# and how long the old one lets requests in progress finish.
+RESTART_TIMEOUT_SECONDS = 120
+RESTART_DRAIN_SECONDS = 10
+
+# Forms exports uploaded on the admin page are saved here (relative to the
+# project root) and regenerated in the background.
+UPLOAD_DIR = "uploads"
+UPLOAD_MAX_MB = 20
+
+# Most codes one /api/lookup request may ask for (see src/lookup_api.py)
+API_MAX_CODES = 1000
+
+# Regeneration jobs run at once; later uploads wait in a queue. Every job
+# rewrites the same roster, so more than 1 only makes them race.
+UPLOAD_JOB_WORKERS = 1
+
+# ============================================================================
+# SEVERAL SERVERS (see src/roster_snapshot.py)
+# ============================================================================
+
+# On the machine running the link scripts: directory to publish versioned
+# roster snapshots into (e.g. "snapshots" or a shared drive). None disables.
+SNAPSHOT_DIR = None
+
+# On each server node: where to pull snapshots from - the same directory, or
+# an http:// URL serving it. None means the node uses its own students.xlsx.
+SNAPSHOT_SOURCE = None
+
+SNAPSHOT_POLL_SECONDS = 5
+SNAPSHOT_KEEP = 5
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+The student entry page template.
+
+Rendered by app.py for every visitor and by export_static_site.py for the
+static site, which adds its own lookup script. Kept apart from both so the
+exporter doesn't have to import (and start) the server to get it.
+"""
+
+# HTML template for the entry page
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Student Writing Portal</title>
+    <link rel="stylesheet" href="{{ css_url }}">
+</head>
+<body>
+    <div class="container">
+        <h1>Writing Assignment</h1>
+        <p class="subtitle">Enter your student code to begin</p>
+
+        {% if error %}
+        <div class="error">
+            {{ error }}
+        </div>
+        {% endif %}
+
+        <form method="POST">
+            <div class="form-group">
+                <label for="code">Student Code</label>
+                <input
+                    type="text"
+                    id="code"
+                    name="code"
+                    placeholder="e.g., STU001"
+                    autofocus
+                    required
+                    autocomplete="off"
+                >
+            </div>
+            <button type="submit">Start Writing →</button>
+        </form>
+
+        <div class="info">
+            <strong>Instructions:</strong>
+            <ul style="margin-left: 20px; margin-top: 8px;">
+                <li>Enter your assigned code above</li>
+                <li>Complete your writing assignment (~250 words)</li>
+                <li>Upload your picture</li>
+                <li>Click Submit when finished</li>
+            </ul>
+        </div>
+
+        <div class="stats">
+            {{ student_count }} students registered
+        </div>
+    </div>
+</body>
+</html>
+"""
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Build the class newsletter: a Word booklet of every student's writing.
+
+Reads one or more Forms exports (the same files regenerate_links.py takes),
+keeps each student's latest submission and writes one article per student
+with their name, word count and an optional picture placeholder.
+
+Articles are rendered in chunks by a pool of worker processes. Each chunk
+comes back as a small .docx, its paragraphs are moved into the booklet and
+the chunk is dropped, so only a few chunks are held in memory at a time.
+
+Usage:
+    python export_booklet.py results.xlsx
+    python export_booklet.py class-a.xlsx class-b.xlsx -o newsletter.docx
+"""
+
+import sys
+import io
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor, Inches
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+from response_files import resolve_input_files, read_responses, merge_responses
+from writing_analytics import analyze_writing
+from utils.md_to_docx import create_document, add_heading
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = PROJECT_ROOT / 'newsletter.docx'
+
+
+def collect_articles(df):
+    """
+    Turn merged responses into article dicts, sorted by student name.
+
+    Responses with no writing are left out.
+
+    Args:
+        df: Merged DataFrame from merge_responses()
+
+    Returns:
+        list of dicts with 'code', 'name', 'text' and 'words'
+    """
+    analytics = analyze_writing(df[config.EXCEL_COL_WRITING])
+
+    articles = []
+    for idx, row in df.iterrows():
+        text = row[config.EXCEL_COL_WRITING]
+        if not isinstance(text, str) or not text.strip():
+            continue
+        articles.append({
+            'code': str(row[config.EXCEL_COL_CODE]).strip().upper(),
+            'name': str(row[config.EXCEL_COL_NAME]).strip(),
+            'text': text.strip(),
+            'words': int(analytics.at[idx, 'words']),
+        })
+
+    articles.sort(key=lambda article: (article['name'].casefold(), article['code']))
+    return articles
+
+
+def add_picture_placeholder(doc):
+    """Add an empty bordered box where a picture can be pasted."""
+    table = doc.add_table(rows=1, cols=1)
+    table.style = 'Table Grid'
+    cell = table.rows[0].cells[0]
+    paragraph = cell.paragraphs[0]
+    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    paragraph.paragraph_format.space_before = Pt(60)
+    paragraph.paragraph_format.space_after = Pt(60)
+    run = paragraph.add_run("Picture")
+    run.italic = True
+    run.font.color.rgb = RGBColor(150, 150, 150)
+
+
+def render_articles(articles, first_in_booklet=False):
+    """
+    Render a chunk of articles into a standalone document.
+
+    Runs inside a worker process.
+
+    Args:
+        articles: List of article dicts from collect_articles()
+        first_in_booklet: Don't start the first article on a new page
+
+    Returns:
+        The document as .docx bytes
+    """
+    doc = create_document()
+
+    for i, article in enumerate(articles):
+        heading = add_heading(doc, article['name'], 2)
+        if i > 0 or not first_in_booklet:
+            heading.paragraph_format.page_break_before = True
+
+        byline = doc.add_paragraph()
+        run = byline.add_run(f"{article['words']} words")
+        run.italic = True
+        run.font.size = Pt(9)
+        run.font.color.rgb = RGBColor(120, 120, 120)
+
+        if config.BOOKLET_PICTURE_PLACEHOLDERS:
+            add_picture_placeholder(doc)
+            doc.add_paragraph()
+
+        # Blank lines and line breaks in the form both start a new paragraph
+        for block in article['text'].splitlines():
+            if block.strip():
+                paragraph = doc.add_paragraph(block.strip())
+                paragraph.paragraph_format.space_after = Pt(6)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def append_chunk(booklet, chunk_bytes):
+    """
+    Move the body of a rendered chunk into the booklet.
+
+    The elements are moved rather than copied, so the chunk document can be
+    freed straight away.
+    """
+    chunk = Document(io.BytesIO(chunk_bytes))
+    body = booklet.element.body
+    section_properties = body.find(qn('w:sectPr'))
+
+    for element in list(chunk.element.body):
+        if element.tag == qn('w:sectPr'):
+            continue
+        if section_properties is not None:
+            section_properties.addprevious(element)
+        else:
+            body.append(element)
+
+
+def build_booklet(articles, output_file, title=None):
+    """
+    Render articles in parallel and assemble the booklet in order.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    however many students there are.
+
+    Args:
+        articles: List of article dicts from collect_articles()
+        output_file: Path of the .docx to write
+        title: Booklet title (default config.BOOKLET_TITLE)
+
+    Returns:
+        Number of chunks rendered
+    """
+    booklet = create_document()
+    booklet.sections[0].left_margin = booklet.sections[0].right_margin = Inches(1)
+    add_heading(booklet, title or config.BOOKLET_TITLE, 1)
+    booklet.add_paragraph(f"{len(articles)} articles")
+
+    chunk_size = max(1, config.BOOKLET_CHUNK_SIZE)
+    chunks = [articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)]
+
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            append_chunk(booklet, render_articles(chunk, first_in_booklet=True))
+    else:
+        workers = config.REGENERATE_MAX_WORKERS
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for i, chunk in enumerate(chunks):
+                pending.append(pool.submit(render_articles, chunk, i == 0))
+                # Assemble in order as soon as the window is full
+                if len(pending) >= workers * 2:
+                    append_chunk(booklet, pending.pop(0).result())
+            for future in pending:
+                append_chunk(booklet, future.result())
+
+    booklet.save(output_file)
+    return len(chunks)
+
+
+def parse_output_arg(args):
+    """Remove '-o FILE' from args and return the output path (relative to the project root)."""
+    if '-o' not in args:
+        return DEFAULT_OUTPUT
+
+    i = args.index('-o')
+    if i + 1 >= len(args):
+        print("Error: -o flag requires output filename")
+        sys.exit(1)
+    output = Path(args[i + 1])
+    del args[i:i + 2]
+    return output if output.is_absolute() else PROJECT_ROOT / output
+
+
+def main():
+    """Main script flow."""
+    args = sys.argv[1:]
+    output_file = parse_output_arg(args)
+
+    if not args:
+        print("Usage: python src/export_booklet.py <results.xlsx> [more.xlsx ...] [-o newsletter.docx]")
+        sys.exit(1)
+
+    excel_paths = resolve_input_files(args)
+    if not excel_paths:
+        print("ERROR: No response files to process")
+        sys.exit(1)
+
+    print(f"Reading responses from {', '.join(path.name for path in excel_paths)}...")
+    results = read_responses(excel_paths)
+    for result in results:
+        if result['error']:
+            print(f"ERROR ({result['path'].name}): {result['error']}")
+            sys.exit(1)
+
+    df, conflicts = merge_responses(results)
+    articles = collect_articles(df)
+    print(f"  Found {len(articles)} articles")
+    if conflicts:
+        print(f"  {len(conflicts)} students submitted more than once - using their latest writing")
+
+    if not articles:
+        print("ERROR: No writing to export")
+        sys.exit(1)
+
+    print("Building booklet...")
+    start = time.perf_counter()
+    chunks = build_booklet(articles, output_file)
+
+    print()
+    print(f"✓ Wrote {len(articles)} articles to {output_file} ({chunks} chunks, {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
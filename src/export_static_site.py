@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Export the code-entry portal as a static site.
+
+The site is the usual entry page plus a lookup table split into shards,
+so any static file server or CDN can serve it without Python:
+
+    site/index.html          entry page; resolves codes in the browser
+    site/assets/...          fingerprinted CSS, with .gz and .br copies
+    site/lookup/3f.json      {"3fa85f64...": "<sealed URL>", ...}
+    site/manifest.json       salt, shard layout and shard checksums
+
+Codes don't appear in the files as such. Each entry is keyed by a salted
+SHA-256 of the code, and its URL is sealed with a keystream derived from
+the code. This only obscures codes and links from a casual look: the salt
+ships in index.html and codes like STU001 are easy to guess, so anyone who
+downloads the lookup files can recover every link offline in moments.
+Publish the site only where the links themselves may be seen.
+
+The salt is kept in the manifest, so re-exports produce identical shards
+for unchanged students and only shards whose contents changed are
+rewritten.
+
+Usage:
+    python export_static_site.py
+    python export_static_site.py -o public
+    python export_static_site.py --new-salt
+"""
+
+import sys
+import json
+import base64
+import hashlib
+import secrets
+from pathlib import Path
+
+from jinja2 import Template
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+import roster_store
+import static_assets
+from entry_template import HTML_TEMPLATE
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Bump when the site layout or sealing changes (forces a full rewrite)
+FORMAT = 1
+
+# Hex characters of the hashed code used as an entry's key
+ID_CHARS = 32
+
+LOOKUP_DIR = 'lookup'
+MANIFEST_NAME = 'manifest.json'
+
+
+def entry_id(salt, code):
+    """Key of a code's entry in the lookup table."""
+    return hashlib.sha256(f"{salt}|id|{code}".encode('utf-8')).hexdigest()[:ID_CHARS]
+
+
+def keystream(salt, code, length):
+    """SHA-256 counter-mode keystream for sealing a code's entry."""
+    key = hashlib.sha256(f"{salt}|key|{code}".encode('utf-8')).hexdigest()
+    stream = bytearray()
+    block = 0
+    while len(stream) < length:
+        stream += hashlib.sha256(f"{key}:{block}".encode('utf-8')).digest()
+        block += 1
+    return bytes(stream[:length])
+
+
+def seal(salt, code, url):
+    """URL readable only with its code (base64 text)."""
+    data = url.encode('utf-8')
+    stream = keystream(salt, code, len(data))
+    return base64.b64encode(bytes(a ^ b for a, b in zip(data, stream))).decode('ascii')
+
+
+def build_shards(students, salt, shard_chars):
+    """
+    Lookup table shards for every student with a URL.
+
+    Args:
+        students: Records from roster_store.load_students()
+        salt: Site salt
+        shard_chars: Leading hex characters of the entry key that pick its shard
+
+    Returns:
+        dict of shard name -> encoded JSON bytes
+    """
+    shards = {}
+    for student in students:
+        if not student['url']:
+            continue
+        code = student['code'].strip().upper()
+        key = entry_id(salt, code)
+        shards.setdefault(key[:shard_chars], {})[key] = seal(salt, code, student['url'])
+
+    return {
+        name: json.dumps(dict(sorted(entries.items())), separators=(',', ':')).encode('utf-8')
+        for name, entries in shards.items()
+    }
+
+
+# Resolves codes in the browser. SHA-256 is implemented here rather than
+# taken from crypto.subtle, which browsers only offer over HTTPS and a
+# classroom server is often plain http.
+LOOKUP_SCRIPT = """
+<script>
+const SALT = "{{ salt }}", ID_CHARS = {{ id_chars }}, SHARD_CHARS = {{ shard_chars }};
+
+const K = new Uint32Array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+]);
+const rotr = (x, n) => (x >>> n) | (x << (32 - n));
+
+function sha256(text) {
+    const bytes = new TextEncoder().encode(text);
+    const padded = new Uint8Array(((bytes.length + 72) >> 6) << 6);
+    padded.set(bytes);
+    padded[bytes.length] = 0x80;
+    const view = new DataView(padded.buffer);
+    view.setUint32(padded.length - 4, bytes.length * 8);
+
+    const hash = new Uint32Array([0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+                                  0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19]);
+    const w = new Uint32Array(64);
+    for (let offset = 0; offset < padded.length; offset += 64) {
+        for (let i = 0; i < 16; i++) w[i] = view.getUint32(offset + i * 4);
+        for (let i = 16; i < 64; i++) {
+            const s0 = rotr(w[i - 15], 7) ^ rotr(w[i - 15], 18) ^ (w[i - 15] >>> 3);
+            const s1 = rotr(w[i - 2], 17) ^ rotr(w[i - 2], 19) ^ (w[i - 2] >>> 10);
+            w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+        }
+        let [a, b, c, d, e, f, g, h] = hash;
+        for (let i = 0; i < 64; i++) {
+            const t1 = (h + (rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25)) + ((e & f) ^ (~e & g)) + K[i] + w[i]) | 0;
+            const t2 = ((rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c))) | 0;
+            h = g; g = f; f = e; e = (d + t1) | 0;
+            d = c; c = b; b = a; a = (t1 + t2) | 0;
+        }
+        [a, b, c, d, e, f, g, h].forEach((value, i) => hash[i] += value);
+    }
+
+    const digest = new Uint8Array(32);
+    hash.forEach((value, i) => new DataView(digest.buffer).setUint32(i * 4, value));
+    return digest;
+}
+
+const hex = bytes => Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+
+function unseal(code, sealed) {
+    const data = Uint8Array.from(atob(sealed), c => c.charCodeAt(0));
+    const key = hex(sha256(`${SALT}|key|${code}`));
+    for (let i = 0; i < data.length; i += 32) {
+        const block = sha256(`${key}:${i / 32}`);
+        for (let j = 0; j < 32 && i + j < data.length; j++) data[i + j] ^= block[j];
+    }
+    return new TextDecoder().decode(data);
+}
+
+function showError(message) {
+    let error = document.querySelector('.error');
+    if (!error) {
+        error = document.createElement('div');
+        error.className = 'error';
+        document.querySelector('form').before(error);
+    }
+    error.textContent = message;
+}
+
+document.querySelector('form').addEventListener('submit', async event => {
+    event.preventDefault();
+    const code = document.getElementById('code').value.trim().toUpperCase();
+    if (!code) return showError('Please enter your student code.');
+
+    const id = hex(sha256(`${SALT}|id|${code}`)).slice(0, ID_CHARS);
+    let shard = {};
+    try {
+        const response = await fetch(`{{ lookup_dir }}/${id.slice(0, SHARD_CHARS)}.json`, {cache: 'no-cache'});
+        if (response.ok) shard = await response.json();
+    } catch (e) {
+        return showError('Could not reach the server. Please try again.');
+    }
+
+    if (!shard[id]) return showError(`Code '${code}' not found. Please check your code and try again.`);
+    window.location.href = unseal(code, shard[id]);
+});
+</script>
+"""
+
+
+def render_entry_page(salt, shard_chars, student_count, css_url):
+    """The server's entry page with the lookup script added."""
+    page = Template(HTML_TEMPLATE).render(student_count=student_count, css_url=css_url)
+    script = Template(LOOKUP_SCRIPT).render(salt=salt, id_chars=ID_CHARS, shard_chars=shard_chars,
+                                            lookup_dir=LOOKUP_DIR)
+    return page.replace('</body>', script + '</body>')
+
+
+def load_manifest(site_dir):
+    """The previous export's manifest, or None."""
+    try:
+        return json.loads((site_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds them. Returns True if written."""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def write_assets(site_dir):
+    """
+    Copy the fingerprinted assets, plus .gz/.br files for hosts that serve them.
+
+    Returns:
+        tuple of (dict of asset name -> relative URL, number of files written)
+    """
+    urls, bodies = static_assets.load_assets()
+    assets_dir = site_dir / static_assets.URL_PREFIX.strip('/')
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+    for name, body in bodies.items():
+        files[name] = body.variants['identity']
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            if encoding in body.variants:
+                files[name + suffix] = body.variants[encoding]
+
+    written = sum(write_if_changed(assets_dir / name, data) for name, data in files.items())
+    for path in assets_dir.iterdir():
+        if path.name not in files:
+            path.unlink()
+
+    return {name: url.lstrip('/') for name, url in urls.items()}, written
+
+
+def export_site(students, site_dir, shard_chars=None, new_salt=False, version=None):
+    """
+    Write (or update) the static site.
+
+    Args:
+        students: Records from roster_store.load_students()
+        site_dir: Output directory
+        shard_chars: Hex characters per shard name (default config.STATIC_SITE_SHARD_CHARS)
+        new_salt: Pick a new salt, rewriting every shard
+        version: Roster version, recorded in the manifest
+
+    Returns:
+        dict with 'shards', 'files', 'written', 'removed' and 'students' counts
+    """
+    site_dir = Path(site_dir)
+    lookup_dir = site_dir / LOOKUP_DIR
+    lookup_dir.mkdir(parents=True, exist_ok=True)
+    shard_chars = shard_chars or config.STATIC_SITE_SHARD_CHARS
+
+    previous = load_manifest(site_dir)
+    if (previous and not new_salt and previous.get('format') == FORMAT
+            and previous.get('shard_chars') == shard_chars):
+        salt = previous['salt']
+        old_digests = previous['shards']
+    else:
+        salt = secrets.token_hex(16)
+        old_digests = {}
+
+    shards = build_shards(students, salt, shard_chars)
+    digests = {name: hashlib.sha256(data).hexdigest() for name, data in shards.items()}
+
+    written = 0
+    for name, data in shards.items():
+        path = lookup_dir / f"{name}.json"
+        if old_digests.get(name) == digests[name] and path.exists():
+            continue
+        path.write_bytes(data)
+        written += 1
+
+    # Shards left over from students who were removed (or another layout)
+    removed = 0
+    for path in lookup_dir.glob('*.json'):
+        if path.stem not in shards:
+            path.unlink()
+            removed += 1
+
+    asset_urls, assets_written = write_assets(site_dir)
+    written += assets_written
+
+    student_count = sum(1 for student in students if student['url'])
+    page = render_entry_page(salt, shard_chars, student_count, asset_urls['portal.css']).encode('utf-8')
+    written += write_if_changed(site_dir / 'index.html', page)
+
+    manifest = {
+        'format': FORMAT,
+        'salt': salt,
+        'shard_chars': shard_chars,
+        'version': version,
+        'shards': dict(sorted(digests.items())),
+    }
+    write_if_changed(site_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'))
+
+    files = len(shards) + 1 + sum(1 for path in (site_dir / static_assets.URL_PREFIX.strip('/')).iterdir())
+    return {'shards': len(shards), 'files': files, 'written': written, 'removed': removed,
+            'students': student_count}
+
+
+def main():
+    """Export the roster in roster.db / students.xlsx as a static site."""
+    args = sys.argv[1:]
+    new_salt = '--new-salt' in args
+    if new_salt:
+        args.remove('--new-salt')
+
+    site_dir = Path(config.STATIC_SITE_DIR)
+    if args[:1] in (['-o'], ['--output']) and len(args) > 1:
+        site_dir = Path(args[1])
+        args = args[2:]
+    if args:
+        print("Usage: python src/export_static_site.py [-o site] [--new-salt]")
+        sys.exit(1)
+    if not site_dir.is_absolute():
+        site_dir = PROJECT_ROOT / site_dir
+
+    conn = roster_store.connect()
+    try:
+        roster_store.sync_from_xlsx(conn)
+    except FileNotFoundError:
+        print("ERROR: students.xlsx not found!")
+        print("Run: python src/generate_initial_links.py")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    students = roster_store.load_students(conn)
+    version = roster_store.get_version(conn)
+
+    print(f"Exporting {len(students)} students (roster version {version}) to {site_dir}...")
+    stats = export_site(students, site_dir, new_salt=new_salt, version=version)
+
+    print(f"✓ {stats['students']} links in {stats['shards']} shards")
+    print(f"  {stats['written']} files written, {stats['removed']} removed, "
+          f"{stats['files'] - stats['written']} unchanged")
+    if stats['students'] < len(students):
+        print(f"⚠ {len(students) - stats['students']} students have no URL yet and were left out")
+    print()
+    print("Upload the folder to any static web host, or try it locally:")
+    print(f"  python -m http.server 8000 --directory {site_dir}")
+
+
+if __name__ == "__main__":
+    main()
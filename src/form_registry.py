@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Registry of Microsoft Forms, keyed by form ID.
+
+Schools often use one form per class. Instead of rewriting config.py for
+each one, extract_form_fields.py --batch stores every form's base URL and
+field IDs in forms.json in the project root:
+
+    {
+      "default": "d1mqSFIaek...",
+      "forms": {
+        "d1mqSFIaek...": {
+          "label": "Class 7A",
+          "base_url": "https://forms.office.com/Pages/ResponsePage.aspx?id=d1mqSFIaek...",
+          "fields": {"FIELD_STUDENT_CODE": "r...", "FIELD_STUDENT_NAME": "r...", ...}
+        }
+      }
+    }
+
+The registry is read once per process. get_form() returns the chosen form,
+or the values in config.py when no registry exists, so single-form setups
+work exactly as before.
+
+Usage:
+    python form_registry.py             # list registered forms
+    python form_registry.py default ID  # choose the default form
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+REGISTRY_FILE = Path(__file__).parent.parent / 'forms.json'
+
+FIELD_NAMES = ['FIELD_STUDENT_CODE', 'FIELD_STUDENT_NAME', 'FIELD_WRITING', 'FIELD_WRITING_INFO']
+
+_registry = None
+
+
+def form_id_from_url(url):
+    """The form's ID: the id= parameter, or the short code of a /r/ link."""
+    parsed = urlparse(url)
+    form_ids = parse_qs(parsed.query).get('id')
+    if form_ids:
+        return form_ids[0]
+    return parsed.path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def load_registry(reload=False):
+    """The registry dict (read from disk once per process)."""
+    global _registry
+
+    if _registry is None or reload:
+        try:
+            with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
+                _registry = json.load(f)
+        except FileNotFoundError:
+            _registry = {'default': None, 'forms': {}}
+
+    return _registry
+
+
+def save_registry(registry):
+    """Write the registry atomically and refresh the in-process copy."""
+    global _registry
+
+    fd, tmp_path = tempfile.mkstemp(dir=REGISTRY_FILE.parent, suffix='.json.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(registry, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, REGISTRY_FILE)
+    _registry = registry
+
+
+def register_form(registry, base_url, fields, label=None):
+    """
+    Add or update a form in a registry dict (call save_registry() after).
+
+    Args:
+        registry: Dict from load_registry()
+        base_url: Form URL up to and including the id= parameter
+        fields: dict of FIELD_* name -> field ID
+        label: Optional human-readable name (e.g. the class)
+
+    Returns:
+        The form ID
+    """
+    form_id = form_id_from_url(base_url)
+    registry['forms'][form_id] = {
+        'label': label or registry['forms'].get(form_id, {}).get('label') or form_id[:12],
+        'base_url': base_url,
+        'fields': fields,
+    }
+    if not registry.get('default'):
+        registry['default'] = form_id
+    return form_id
+
+
+def config_form():
+    """The single form configured in config.py, in registry format."""
+    return {
+        'id': form_id_from_url(config.BASE_FORM_URL),
+        'label': 'config.py',
+        'base_url': config.BASE_FORM_URL,
+        'fields': {name: getattr(config, name) for name in FIELD_NAMES},
+    }
+
+
+def get_form(form_id=None):
+    """
+    Look up a form.
+
+    Args:
+        form_id: Form ID or label; None means config.ACTIVE_FORM, then the
+            registry default, then config.py
+
+    Returns:
+        dict with 'id', 'label', 'base_url' and 'fields' (None for field
+        IDs the form doesn't have)
+
+    Raises:
+        KeyError: if form_id isn't registered
+    """
+    registry = load_registry()
+    form_id = form_id or config.ACTIVE_FORM or registry.get('default')
+
+    if not form_id:
+        return config_form()
+
+    forms = registry['forms']
+    if form_id not in forms:
+        # Allow choosing a form by its label
+        matches = [fid for fid, form in forms.items() if form.get('label') == form_id]
+        if len(matches) != 1:
+            if form_id == config_form()['id']:
+                return config_form()
+            raise KeyError(form_id)
+        form_id = matches[0]
+
+    form = dict(forms[form_id])
+    # A missing field ID is None and left out of prefilled URLs: config.py's
+    # IDs belong to another form
+    form['fields'] = {name: form['fields'].get(name) or None for name in FIELD_NAMES}
+    form['id'] = form_id
+    return form
+
+
+def main():
+    """List forms or set the default."""
+    registry = load_registry()
+
+    if len(sys.argv) > 2 and sys.argv[1] == 'default':
+        try:
+            form = get_form(sys.argv[2])
+        except KeyError:
+            print(f"ERROR: Form '{sys.argv[2]}' is not registered")
+            sys.exit(1)
+        registry['default'] = form['id']
+        save_registry(registry)
+        print(f"✓ Default form is now {form['label']} ({form['id']})")
+        return
+
+    if not registry['forms']:
+        print("No forms registered - using config.py")
+        print("Register forms with: python src/utils/extract_form_fields.py --batch urls.txt")
+        return
+
+    for form_id, form in registry['forms'].items():
+        marker = '*' if form_id == registry.get('default') else ' '
+        missing = [name for name in FIELD_NAMES if not form['fields'].get(name)]
+        print(f" {marker} {form['label']}: {form_id}")
+        if missing:
+            print(f"     ⚠ Missing: {', '.join(missing)} (left out of prefilled URLs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,31 @@
 """
 Generate initial prefilled Microsoft Forms URLs for students.
 
-This script reads student information from students.xlsx and generates
-prefilled Form URLs for Session 1 (with name and prompt only).
+This script reads student information from the roster (imported from
+students.xlsx) and generates prefilled Form URLs for Session 1 (with name
+and prompt only).
 
 Usage:
     python generate_initial_links.py
+    python generate_initial_links.py --form "Class 7A"
 """
 
-import pandas as pd
 from urllib.parse import urlencode, quote
 import sys
+import time
 from pathlib import Path
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 import config
-
-def generate_prefilled_url(student_code, student_name, include_writing=False, writing_text="", writing_info=""):
+import profiling
+import form_registry
+import roster_store
+import roster_index
+import roster_snapshot
+import roster_push
+
+def generate_prefilled_url(student_code, student_name, include_writing=False, writing_text="", writing_info="", form=None):
     """
     Generate a prefilled Microsoft Forms URL.
 
@@ -28,27 +36,34 @@ def generate_prefilled_url(student_code, student_name, include_writing=False, wr
         include_writing: Whether to include previous writing (Session 2)
         writing_text: Previous writing text (for Session 2)
         writing_info: Instructions (Session 1) or progress message (Session 2)
+        form: Form from form_registry.get_form() (default: the default form)
 
     Returns:
         Complete prefilled URL
     """
-    params = {
-        config.FIELD_STUDENT_CODE: student_code,
-        config.FIELD_STUDENT_NAME: student_name,
+    form = form or form_registry.get_form()
+    fields = form['fields']
+
+    values = {
+        'FIELD_STUDENT_CODE': student_code,
+        'FIELD_STUDENT_NAME': student_name,
     }
 
     # For Session 2, include previous writing
     if include_writing and writing_text:
-        params[config.FIELD_WRITING] = writing_text
+        values['FIELD_WRITING'] = writing_text
 
     # Include writing info (instructions in Session 1, progress in Session 2)
     if writing_info:
-        params[config.FIELD_WRITING_INFO] = writing_info
+        values['FIELD_WRITING_INFO'] = writing_info
+
+    # Fields the form doesn't have are left out
+    params = {fields[name]: value for name, value in values.items() if fields.get(name)}
 
     # Generate URL with encoded parameters
     # Base URL already has ?id=..., so we use & for our parameters
     # Use quote_via=quote to encode spaces as %20 instead of +
-    url = config.BASE_FORM_URL + "&" + urlencode(params, quote_via=quote)
+    url = form['base_url'] + "&" + urlencode(params, quote_via=quote)
 
     return url
 
@@ -83,68 +98,103 @@ def validate_config():
     return True
 
 
-def main():
-    """Generate initial prefilled URLs for all students."""
+def select_form(args):
+    """
+    Pick the form from a --form argument, removing it from args.
 
-    # Validate configuration
-    if not validate_config():
+    Returns:
+        Form dict from form_registry.get_form()
+    """
+    form_id = None
+    if '--form' in args:
+        i = args.index('--form')
+        if i + 1 >= len(args):
+            print("ERROR: --form requires a form ID or label")
+            sys.exit(1)
+        form_id = args[i + 1]
+        del args[i:i + 2]
+
+    try:
+        return form_registry.get_form(form_id)
+    except KeyError:
+        print(f"ERROR: Form '{form_id}' is not registered")
+        print("List forms with: python src/form_registry.py")
         sys.exit(1)
 
-    # Path to students.xlsx in parent directory
-    students_file = Path(__file__).parent.parent / 'students.xlsx'
 
-    # Check if students.xlsx exists
-    try:
-        df = pd.read_excel(students_file)
-    except FileNotFoundError:
-        print("ERROR: students.xlsx not found!")
-        print("\nPlease create students.xlsx in the project root with columns: code, name")
-        print("Example:")
-        print("  code | name")
-        print("  STU001 | John Doe")
-        print("  STU002 | Jane Smith")
+def main():
+    """Generate initial prefilled URLs for all students."""
+
+    profiling.configure()
+    form = select_form(sys.argv[1:])
+
+    # Validate configuration (registered forms were checked when extracted)
+    if form['label'] == 'config.py' and not validate_config():
         sys.exit(1)
 
+    # Load the roster (students.xlsx is re-imported if a teacher edited it)
+    with profiling.stage('roster load'):
+        conn = roster_store.connect()
+        try:
+            roster_store.sync_from_xlsx(conn)
+        except FileNotFoundError:
+            print("ERROR: students.xlsx not found!")
+            print("\nPlease create students.xlsx in the project root with columns: code, name")
+            print("Example:")
+            print("  code | name")
+            print("  STU001 | John Doe")
+            print("  STU002 | Jane Smith")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+        students = roster_store.load_students(conn)
+
     # Validate structure
-    if df.empty:
+    if not students:
         print("ERROR: students.xlsx is empty!")
         sys.exit(1)
 
-    required_columns = ['code', 'name']
-    if not all(col in df.columns for col in required_columns):
-        print(f"ERROR: students.xlsx must have columns: {', '.join(required_columns)}")
-        print(f"Found columns: {', '.join(df.columns)}")
-        sys.exit(1)
-
     # Generate URLs for each student
-    print(f"Generating prefilled URLs for {len(df)} students...")
+    print(f"Generating prefilled URLs for {len(students)} students (form: {form['label']})...")
     print()
 
-    urls = []
-    for _, row in df.iterrows():
-        code = str(row['code']).strip()
-        name = str(row['name']).strip()
-
-        # Generate initial URL (Session 1)
-        url = generate_prefilled_url(
-            student_code=code,
-            student_name=name,
-            writing_info=config.WRITING_INFO_SESSION_1
-        )
-
-        urls.append(url)
-
-        print(f"  {code}: {name}")
-        print(f"    → {url[:80]}..." if len(url) > 80 else f"    → {url}")
-        print()
-
-    # Add URLs to dataframe and save
-    df['url'] = urls
-
-    # Preserve the # column if it exists (row numbers for user reference)
-    df.to_excel(students_file, index=False)
-
-    print(f"✓ Successfully generated {len(df)} prefilled URLs")
+    urls = {}
+    with profiling.stage('URL generation'):
+        for student in students:
+            code = student['code']
+            name = student['name']
+
+            # Generate initial URL (Session 1)
+            url = generate_prefilled_url(
+                student_code=code,
+                student_name=name,
+                writing_info=config.WRITING_INFO_SESSION_1,
+                form=form
+            )
+
+            urls[code] = url
+
+            print(f"  {code}: {name}")
+            print(f"    → {url[:80]}..." if len(url) > 80 else f"    → {url}")
+            print()
+
+    # Store URLs, then copy them into the url cells of students.xlsx
+    with profiling.stage('write-back'):
+        started = time.time()
+        base_version = roster_store.get_version(conn)
+        changed = roster_store.set_urls(conn, urls)
+        if config.PUSH_ENABLED:
+            print(f"  {roster_push.push_changes(conn, base_version, started, changed)}")
+        roster_store.export_xlsx(conn)
+        if config.ROSTER_INDEX_ENABLED:
+            roster_index.build_from_store(conn)
+        if config.SNAPSHOT_DIR:
+            manifest = roster_snapshot.publish_snapshot(conn)
+            print(f"  Published roster snapshot version {manifest['version']}")
+
+    print(f"✓ Successfully generated {len(students)} prefilled URLs")
     print(f"✓ Updated students.xlsx with URLs")
     print()
     print("Next steps:")
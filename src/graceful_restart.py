@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Restart the server without dropping students' requests.
+
+    python src/app.py --restart      (or: kill -USR2 $(cat .cache/server.pid))
+
+The running server starts a new copy of itself and hands it the listening
+socket. The new process loads the roster and renders its pages while the
+old one keeps serving. Only when the new one reports ready does the old
+process stop accepting connections, finish the requests it is handling
+(up to config.RESTART_DRAIN_SECONDS) and exit. Connections waiting on the
+socket are accepted by the new process, so nobody sees a connection error.
+Open dashboard streams are ended cleanly, and browsers reconnect to the
+new process.
+If the new process fails to start, the old one simply keeps serving.
+
+Needs socket inheritance and signals, so it works on macOS and Linux but
+not on Windows, and not with FLASK_DEBUG (the reloader restarts instead).
+"""
+
+import os
+import sys
+import select
+import signal
+import subprocess
+import threading
+from pathlib import Path
+
+from werkzeug.wsgi import ClosingIterator
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PID_FILE = PROJECT_ROOT / '.cache' / 'server.pid'
+
+# Passed from the old server process to the new one
+LISTEN_FD_ENV = 'NEWSLETTER_LISTEN_FD'
+READY_FD_ENV = 'NEWSLETTER_READY_FD'
+
+RESTART_SIGNAL = getattr(signal, 'SIGUSR2', None)
+
+
+class InFlight:
+    """
+    WSGI middleware that counts the requests being handled.
+
+    A request counts until its response body has been written and closed,
+    not just until the app returns it. Long-lived streams (stream_paths)
+    are not counted; the server ends them itself when it stops.
+    """
+
+    def __init__(self, wsgi_app, stream_paths=()):
+        self.wsgi_app = wsgi_app
+        self.stream_paths = set(stream_paths)
+        self._count = 0
+        self._idle = threading.Condition()
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') in self.stream_paths:
+            return self.wsgi_app(environ, start_response)
+
+        with self._idle:
+            self._count += 1
+        finished = threading.Event()
+
+        def leave():
+            if finished.is_set():
+                return
+            finished.set()
+            with self._idle:
+                self._count -= 1
+                if not self._count:
+                    self._idle.notify_all()
+
+        try:
+            body = self.wsgi_app(environ, start_response)
+        except BaseException:
+            leave()
+            raise
+        # The server closes the body once it has been sent (or the client left)
+        return ClosingIterator(body, leave)
+
+    @property
+    def count(self):
+        with self._idle:
+            return self._count
+
+    def wait_idle(self, timeout):
+        """Wait until no request is being handled. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._count == 0, timeout)
+
+
+def inherited_socket_fd():
+    """Listening socket handed over by the previous server, or None."""
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    return int(fd) if fd else None
+
+
+def notify_ready():
+    """Tell the previous server this one is ready to take over."""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd:
+        os.write(int(fd), b'ready')
+        os.close(int(fd))
+
+
+def start_successor(listen_fd, timeout):
+    """
+    Start a new server process on the same socket and wait until it is ready.
+
+    Args:
+        listen_fd: File descriptor of the listening socket
+        timeout: Seconds to wait for the new process to load
+
+    Returns:
+        The new process, or None if it failed or didn't get ready in time
+    """
+    read_fd, write_fd = os.pipe()
+    env = dict(os.environ, **{LISTEN_FD_ENV: str(listen_fd), READY_FD_ENV: str(write_fd)})
+    process = subprocess.Popen([sys.executable, str(Path(sys.argv[0]).resolve())] + sys.argv[1:],
+                               env=env, pass_fds=(listen_fd, write_fd))
+    os.close(write_fd)
+
+    try:
+        # The pipe reads empty if the new process exits before it is ready
+        readable, _, _ = select.select([read_fd], [], [], timeout)
+        ready = bool(readable) and os.read(read_fd, 16) == b'ready'
+    finally:
+        os.close(read_fd)
+
+    if not ready:
+        if process.poll() is None:
+            process.terminate()
+        return None
+    return process
+
+
+def write_pid_file():
+    PID_FILE.parent.mkdir(parents=True, exist_ok=True)
+    PID_FILE.write_text(str(os.getpid()), encoding='utf-8')
+
+
+def remove_pid_file():
+    """Remove the PID file if it still names this process."""
+    try:
+        if PID_FILE.read_text(encoding='utf-8').strip() == str(os.getpid()):
+            PID_FILE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def request_restart():
+    """Ask the running server (from .cache/server.pid) to restart gracefully."""
+    if RESTART_SIGNAL is None:
+        print("ERROR: Graceful restart isn't available on this system - stop and start the server instead")
+        sys.exit(1)
+
+    try:
+        pid = int(PID_FILE.read_text(encoding='utf-8').strip())
+        os.kill(pid, RESTART_SIGNAL)
+    except (FileNotFoundError, ValueError, ProcessLookupError):
+        print("ERROR: No running server found (.cache/server.pid)")
+        print("Graceful restarts need FLASK_DEBUG = False in src/config.py")
+        sys.exit(1)
+
+    print(f"✓ Restart requested (server process {pid})")
+    print("  The new server takes over as soon as it has loaded the roster")
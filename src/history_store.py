@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Append-only history of every session's responses, in history.db (SQLite).
+
+Each regenerate_links.py run records the responses it matched for one
+class session: code, name, submission time, word count, the other writing
+metrics and the text itself. The session number is given with --session,
+or worked out from the data: an export in which no recorded student
+wrote anything new (a corrected or later download) is the latest
+session again, one whose changed responses all came after that session
+is the next one, and anything else needs --session.
+
+Rows are never updated or deleted (triggers refuse it). Recording a
+session again appends a new recording, which replaces the earlier one in
+every query, and an export identical to the session's current recording
+is not recorded again, so re-running a regeneration is safe.
+
+responses is indexed on (code, session, recording) for per-student
+trajectories and on (recording, words) for class-wide distributions, so
+both queries read only the rows they need.
+
+Usage:
+    python history_store.py sessions
+    python history_store.py trajectory STU014
+    python history_store.py distribution [SESSION]
+"""
+
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+from summary_stats import percentile
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_FILE = PROJECT_ROOT / 'history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    recording INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    responses INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    recording INTEGER NOT NULL REFERENCES recordings (recording),
+    session INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    name TEXT NOT NULL,
+    submitted_at TEXT,
+    words INTEGER NOT NULL,
+    metrics TEXT NOT NULL,
+    writing TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_by_session ON recordings (session, recording);
+CREATE INDEX IF NOT EXISTS responses_by_code ON responses (code, session, recording);
+CREATE INDEX IF NOT EXISTS responses_by_recording ON responses (recording, words);
+CREATE TRIGGER IF NOT EXISTS recordings_append_only_update BEFORE UPDATE ON recordings
+BEGIN SELECT RAISE(ABORT, 'history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS recordings_append_only_delete BEFORE DELETE ON recordings
+BEGIN SELECT RAISE(ABORT, 'history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS responses_append_only_update BEFORE UPDATE ON responses
+BEGIN SELECT RAISE(ABORT, 'history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS responses_append_only_delete BEFORE DELETE ON responses
+BEGIN SELECT RAISE(ABORT, 'history is append-only'); END;
+"""
+
+# The current recording of each session
+LATEST = "SELECT session, MAX(recording) AS recording FROM recordings GROUP BY session"
+
+def connect(db_file=None):
+    """Open the history database, creating it if needed."""
+    conn = sqlite3.connect(db_file or DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def responses_digest(rows):
+    """Identifies a set of responses, independent of row order."""
+    digest = hashlib.sha256()
+    for code, writing in sorted((row['code'], row['writing']) for row in rows):
+        digest.update(f"{code}\0{writing}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def current_recording(conn, session):
+    """The recording that currently stands for a session, or None."""
+    return conn.execute("SELECT MAX(recording) FROM recordings WHERE session = ?", (session,)).fetchone()[0]
+
+
+def _parse_time(value):
+    """A stored submission time as a datetime, or None if missing or unreadable."""
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def guess_session(conn, rows):
+    """
+    Session a set of responses belongs to, judged from the data.
+
+    Forms exports accumulate, so a later session's download still holds
+    every earlier response; only responses that differ from the latest
+    session's current recording say anything. If no recorded student
+    wrote something new, the responses are the latest session again (a
+    re-download, perhaps with late submitters). If every changed response
+    was submitted after the newest one in that recording, they are the
+    next session.
+
+    Raises:
+        ValueError: if the data doesn't settle it (pass the session instead)
+    """
+    latest = conn.execute("SELECT MAX(session) FROM recordings").fetchone()[0]
+    if latest is None:
+        return 1
+
+    recorded = {row['code']: row for row in conn.execute(
+        "SELECT code, submitted_at, writing FROM responses WHERE recording = ?", (current_recording(conn, latest),)
+    )}
+    changed = [row for row in rows if row['code'] in recorded and row['writing'] != recorded[row['code']]['writing']]
+    if not changed:
+        return latest
+
+    recorded_times = [_parse_time(row['submitted_at']) for row in recorded.values()]
+    changed_times = [_parse_time(row['submitted_at']) for row in changed]
+    if None not in recorded_times and None not in changed_times and min(changed_times) > max(recorded_times):
+        return latest + 1
+
+    raise ValueError(f"{len(changed)} students changed their writing since session {latest} was recorded, "
+                     f"but not all after it: can't tell whether this is session {latest} or {latest + 1}")
+
+
+def record_session(conn, rows, source, session=None):
+    """
+    Append one session's responses.
+
+    Args:
+        conn: Connection from connect()
+        rows: dicts with 'code', 'name', 'submitted_at', 'words', 'metrics'
+            (dict of other metrics) and 'writing'
+        source: Where the responses came from (e.g. the export file names)
+        session: Class session number (default: from guess_session())
+
+    Returns:
+        tuple of (session, replaced): replaced is True if the session had been
+        recorded before. None if these responses are already the session's
+        current recording.
+
+    Raises:
+        ValueError: if no session is given and guess_session() can't tell
+    """
+    digest = responses_digest(rows)
+    with conn:
+        if session is None:
+            session = guess_session(conn, rows)
+
+        previous = current_recording(conn, session)
+        if previous is not None and conn.execute(
+                "SELECT digest FROM recordings WHERE recording = ?", (previous,)).fetchone()[0] == digest:
+            return None
+
+        recording = conn.execute(
+            "INSERT INTO recordings (session, recorded_at, source, digest, responses) VALUES (?, ?, ?, ?, ?)",
+            (session, time.time(), source, digest, len(rows))
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO responses (recording, session, code, name, submitted_at, words, metrics, writing) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(recording, session, row['code'], row['name'], row['submitted_at'], row['words'],
+              json.dumps(row['metrics'], default=lambda value: value.item()), row['writing'])
+             for row in rows]
+        )
+    return session, previous is not None
+
+
+def list_sessions(conn):
+    """Recorded sessions, oldest first, with their current recording."""
+    return [dict(row) for row in conn.execute(
+        "SELECT r.session, r.recorded_at, r.source, r.responses, "
+        "(SELECT COUNT(*) FROM recordings WHERE session = r.session) AS recordings "
+        f"FROM recordings r JOIN ({LATEST}) USING (session, recording) ORDER BY r.session"
+    )]
+
+
+def trajectory(conn, code):
+    """
+    One student's word counts across sessions.
+
+    Returns:
+        list of dicts with 'session', 'name', 'submitted_at' and 'words'
+    """
+    return [dict(row) for row in conn.execute(
+        "SELECT session, name, submitted_at, words FROM responses "
+        f"JOIN ({LATEST}) USING (session, recording) WHERE code = ? ORDER BY session",
+        (code.strip().upper(),)
+    )]
+
+
+def distribution(conn, session):
+    """
+    Class-wide word counts for one session.
+
+    Returns:
+        dict with 'responses', 'min', 'p25', 'median', 'p75', 'max', 'mean',
+        'below' and 'above' (counts outside WORD_COUNT_MIN..WORD_COUNT_MAX),
+        or None if the session has no responses
+    """
+    words = [row[0] for row in conn.execute(
+        "SELECT words FROM responses WHERE recording = ? ORDER BY words", (current_recording(conn, session),)
+    )]
+    if not words:
+        return None
+
+    return {
+        'responses': len(words),
+        'min': words[0],
+        'p25': percentile(words, 0.25),
+        'median': percentile(words, 0.5),
+        'p75': percentile(words, 0.75),
+        'max': words[-1],
+        'mean': sum(words) / len(words),
+        'below': sum(1 for count in words if count < config.WORD_COUNT_MIN),
+        'above': sum(1 for count in words if count > config.WORD_COUNT_MAX),
+    }
+
+
+def main():
+    """Show sessions, a student's trajectory or a session's distribution."""
+    args = sys.argv[1:]
+    command = args[0] if args else 'sessions'
+
+    if not DB_FILE.exists():
+        print("No history yet - it is recorded by python src/regenerate_links.py")
+        sys.exit(1)
+    conn = connect()
+
+    if command == 'sessions':
+        for session in list_sessions(conn):
+            recorded = time.strftime('%Y-%m-%d %H:%M', time.localtime(session['recorded_at']))
+            again = f" (recorded {session['recordings']} times)" if session['recordings'] > 1 else ""
+            print(f"Session {session['session']}: {session['responses']} responses, "
+                  f"recorded {recorded} from {session['source']}{again}")
+    elif command == 'trajectory' and len(args) == 2:
+        rows = trajectory(conn, args[1])
+        if not rows:
+            print(f"No responses recorded for '{args[1]}'")
+            sys.exit(1)
+        print(f"{args[1].upper()} ({rows[-1]['name']})")
+        for row in rows:
+            print(f"  Session {row['session']}: {row['words']:>5} words  {row['submitted_at'] or ''}")
+    elif command == 'distribution' and len(args) <= 2:
+        sessions = [int(args[1])] if len(args) == 2 else [s['session'] for s in list_sessions(conn)]
+        print(f"Session  Responses    Min    P25  Median    P75    Max   Mean  "
+              f"<{config.WORD_COUNT_MIN}  >{config.WORD_COUNT_MAX}")
+        for session in sessions:
+            stats = distribution(conn, session)
+            if stats is None:
+                print(f"{session:>7}  no responses")
+                continue
+            print(f"{session:>7}  {stats['responses']:>9}  {stats['min']:>5}  {stats['p25']:>5}  "
+                  f"{stats['median']:>6}  {stats['p75']:>5}  {stats['max']:>5}  {stats['mean']:>5.0f}  "
+                  f"{stats['below']:>4}  {stats['above']:>4}")
+    else:
+        print("Usage: python src/history_store.py [sessions | trajectory CODE | distribution [SESSION]]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+In-memory activity counters and a Server-Sent Events hub for the dashboard.
+
+index() records every code entry here. Each dashboard tab opens one
+EventSource on /events: it first receives a snapshot of the counters, then
+only small deltas as they happen:
+
+    event: opened    {"code": "STU014", "name": "...", "count": 2, "time": ...}
+    event: miss      {"code": "STU0l4", "misses": 7, "time": ...}
+    event: reload    {"version": 12, "students": 31, "time": ...}
+
+Other parts of the server can send their own events with publish().
+
+Each subscriber has a small bounded queue. A tab that stops reading loses
+deltas rather than slowing down student requests; it catches up from the
+snapshot when the browser reconnects.
+"""
+
+import json
+import time
+import queue
+import threading
+from collections import deque
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 256
+RECENT_MISSES = 20
+
+# Longer entries are cut short before they are kept or sent to dashboards
+MAX_MISS_CODE_CHARS = 32
+
+
+class ActivityHub:
+    """Activity counters plus fan-out of changes to SSE subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._closed = threading.Event()
+        self.opened = {}  # code -> {'name', 'count', 'first', 'last'}
+        self.hits = 0
+        self.misses = 0
+        self.recent_misses = deque(maxlen=RECENT_MISSES)
+        self.reloads = 0
+
+    def publish(self, event, data):
+        """Send an event from elsewhere in the server (e.g. regeneration jobs)."""
+        with self._lock:
+            self._publish(event, data)
+
+    def _publish(self, event, data):
+        """Queue an event for every subscriber (call with the lock held)."""
+        message = format_event(event, data)
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def record_open(self, code, name):
+        """A student entered a valid code."""
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            entry = self.opened.get(code)
+            if entry is None:
+                entry = self.opened[code] = {'name': name, 'count': 0, 'first': now, 'last': now}
+            entry['count'] += 1
+            entry['last'] = now
+            self._publish('opened', {'code': code, 'name': name, 'count': entry['count'], 'time': now})
+
+    def record_miss(self, code):
+        """Someone entered a code that isn't on the roster."""
+        if len(code) > MAX_MISS_CODE_CHARS:
+            code = code[:MAX_MISS_CODE_CHARS] + '…'
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            self.recent_misses.append({'code': code, 'time': now})
+            self._publish('miss', {'code': code, 'misses': self.misses, 'time': now})
+
+    def record_reload(self, version, students):
+        """The server switched to a new roster version."""
+        with self._lock:
+            self.reloads += 1
+            self._publish('reload', {'version': version, 'students': students, 'time': time.time()})
+
+    def snapshot(self):
+        """All counters, for a new subscriber."""
+        with self._lock:
+            return {
+                'opened': {code: dict(entry) for code, entry in self.opened.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+                'recent_misses': list(self.recent_misses),
+                'reloads': self.reloads,
+            }
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def close_streams(self):
+        """End every open stream (and any opened later), e.g. when the server stops."""
+        self._closed.set()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(None)
+            except queue.Full:
+                pass  # it is busy anyway and sees _closed after its next message
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, extra=None):
+        """
+        Generator of SSE messages for one subscriber: a snapshot, then deltas.
+
+        Args:
+            extra: Optional dict merged into the snapshot (e.g. roster version)
+        """
+        subscriber = self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            yield format_event('snapshot', dict(self.snapshot(), **(extra or {})))
+            while not self._closed.is_set():
+                try:
+                    message = subscriber.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": heartbeat\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_event(event, data):
+    """One SSE message."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
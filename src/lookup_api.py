@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+JSON lookups of student links, for LMS and kiosk integrations.
+
+app.py serves:
+
+    GET  /api/lookup?code=STU001&code=STU002   (or ?codes=STU001,STU002)
+    POST /api/lookup   {"codes": ["STU001", "STU002", ...]}
+    GET  /api/students                          (the whole roster)
+
+Each answer has the roster version, the students found and the codes that
+weren't:
+
+    {"version": 12,
+     "students": {"STU001": {"name": "...", "url": "https://...", "session": 2}},
+     "missing": ["STU0O2"]}
+
+GET answers carry an ETag derived from the roster version (and the codes
+asked for), so a client that sends If-None-Match gets an empty 304 until
+the roster changes. orjson is used for encoding when installed.
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import form_registry
+
+
+def encode(data):
+    """JSON-encode to UTF-8 bytes, with orjson if available."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def writing_fields():
+    """Field IDs of the writing question in every known form."""
+    forms = list(form_registry.load_registry()['forms'].values()) + [form_registry.config_form()]
+    return {form['fields']['FIELD_WRITING'] for form in forms if form['fields'].get('FIELD_WRITING')}
+
+
+def link_session(url, fields):
+    """
+    Session a link is for: 2 if it carries previous writing, otherwise 1.
+
+    Args:
+        url: Prefilled form URL
+        fields: Set from writing_fields()
+    """
+    query = urlsplit(url).query
+    return 2 if any(key in fields for key, _ in parse_qsl(query)) else 1
+
+
+def parse_codes(values, limit):
+    """
+    Normalise requested codes (upper case, no blanks or duplicates).
+
+    Args:
+        values: Codes as given, possibly comma-separated
+        limit: Maximum number of codes allowed
+
+    Returns:
+        list of codes
+
+    Raises:
+        ValueError: if no codes were given or more than limit
+    """
+    codes = []
+    for value in values:
+        if not isinstance(value, str):
+            raise ValueError("codes must be strings")
+        codes.extend(code.strip().upper() for code in value.split(','))
+    codes = list(dict.fromkeys(code for code in codes if code))
+
+    if not codes:
+        raise ValueError("no codes given")
+    if len(codes) > limit:
+        raise ValueError(f"at most {limit} codes per request")
+    return codes
+
+
+def lookup(mappings, codes, version, fields):
+    """
+    Answer for a list of codes.
+
+    Args:
+        mappings: STUDENT_MAPPINGS (dict or RosterIndex)
+        codes: Codes from parse_codes()
+        version: Roster version being served
+        fields: Set from writing_fields()
+    """
+    students, missing = {}, []
+    for code in codes:
+        student = mappings.get(code)
+        if student is None:
+            missing.append(code)
+        else:
+            students[code] = {'name': student['name'], 'url': student['url'],
+                              'session': link_session(student['url'], fields)}
+    return {'version': version, 'students': students, 'missing': missing}
+
+
+def whole_roster(mappings, version, fields):
+    """Answer with every student that has a link."""
+    return {
+        'version': version,
+        'students': {code: {'name': student['name'], 'url': student['url'],
+                            'session': link_session(student['url'], fields)}
+                     for code, student in mappings.items()},
+        'missing': [],
+    }
+
+
+def etag(version, codes=None):
+    """ETag for an answer: changes with the roster version and the codes asked for."""
+    if codes is None:
+        return f"roster-{version}"
+    digest = hashlib.sha1('\n'.join(sorted(codes)).encode('utf-8')).hexdigest()[:16]
+    return f"roster-{version}-{digest}"
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of parsed Excel workbooks.
+
+Parsing .xlsx files with openpyxl is the slowest step of every script, and
+the same workbooks are parsed again and again. read_excel_cached() keys each
+parsed table by the SHA-256 of the file contents and the selected columns,
+so an unchanged file is loaded from a Parquet file (or a pickle, when
+pyarrow isn't installed) without touching openpyxl.
+
+The cache lives in .cache/parsed/ and is trimmed to
+config.PARSE_CACHE_MAX_MB, evicting the least recently used entries.
+
+Usage:
+    python parse_cache.py status
+    python parse_cache.py clear
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'parsed'
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(path, usecols=None):
+    """Cache key for a file and column selection."""
+    key = file_digest(path)
+    if usecols:
+        key += '-' + hashlib.sha256('\x1f'.join(map(str, usecols)).encode('utf-8')).hexdigest()[:16]
+    return key
+
+
+def _entries():
+    """Cached files, least recently used first."""
+    if not CACHE_DIR.exists():
+        return []
+    files = [p for p in CACHE_DIR.iterdir() if p.suffix in ('.parquet', '.pkl')]
+    return sorted(files, key=lambda p: p.stat().st_mtime)
+
+
+def _load(entry):
+    import pandas as pd
+    if entry.suffix == '.parquet':
+        return pd.read_parquet(entry)
+    return pd.read_pickle(entry)
+
+
+def _store(df, key):
+    """Write a parsed table, preferring Parquet."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        if HAS_PYARROW:
+            try:
+                df.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, CACHE_DIR / f'{key}.parquet')
+                return
+            except Exception:
+                # Mixed-type object columns can't always be stored as Parquet
+                pass
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, CACHE_DIR / f'{key}.pkl')
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def evict(max_bytes=None):
+    """Delete least recently used entries until the cache fits max_bytes."""
+    if max_bytes is None:
+        max_bytes = config.PARSE_CACHE_MAX_MB * 1024 * 1024
+
+    entries = _entries()
+    total = sum(p.stat().st_size for p in entries)
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        total -= entry.stat().st_size
+        entry.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def read_excel_cached(path, usecols=None):
+    """
+    Read an Excel file, using the cache when the contents are unchanged.
+
+    Args:
+        path: Path to the .xlsx file
+        usecols: Optional list of column names to keep
+
+    Returns:
+        pandas DataFrame (a fresh copy; callers may modify it)
+
+    Raises:
+        FileNotFoundError and any pandas read error, as pd.read_excel does
+    """
+    import pandas as pd
+
+    if not config.PARSE_CACHE_ENABLED:
+        return pd.read_excel(path, usecols=usecols)
+
+    key = cache_key(path, usecols)
+    for suffix in ('.parquet', '.pkl'):
+        entry = CACHE_DIR / f'{key}{suffix}'
+        if entry.exists():
+            try:
+                df = _load(entry)
+            except Exception:
+                entry.unlink(missing_ok=True)
+                break
+            # Mark as recently used for eviction
+            os.utime(entry)
+            return df
+
+    df = pd.read_excel(path, usecols=usecols)
+    _store(df, key)
+    evict()
+    return df
+
+
+def main():
+    """Show or clear the parse cache."""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    entries = _entries()
+
+    if command == 'status':
+        total = sum(p.stat().st_size for p in entries)
+        print(f"Cache: {CACHE_DIR}")
+        print(f"Entries: {len(entries)} ({total / 1024 / 1024:.1f} MB of {config.PARSE_CACHE_MAX_MB} MB)")
+        print(f"Format: {'Parquet' if HAS_PYARROW else 'pickle (install pyarrow for Parquet)'}")
+    elif command == 'clear':
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+        print(f"✓ Removed {len(entries)} cached tables")
+    else:
+        print("Usage: python src/parse_cache.py [status|clear]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
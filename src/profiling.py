@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Opt-in stage timers for the scripts and the server.
+
+Off by default. Turn it on with a flag or an environment variable:
+
+    python src/regenerate_links.py results.xlsx --profile
+    NEWSLETTER_PROFILE=1 python src/app.py
+
+    --profile-json FILE   / NEWSLETTER_PROFILE_JSON=FILE   also write JSON
+    --cprofile FILE       / NEWSLETTER_CPROFILE=FILE       also dump cProfile stats
+
+Code marks its stages with `with profiling.stage('roster load'):` (or uses
+stage() as a decorator). When profiling is on, each stage records calls,
+wall-clock time, net allocated memory and peak memory (tracemalloc), and a
+per-stage summary is printed when the process exits. tracemalloc's peak is
+process-wide, so the threaded server turns peak tracking off
+(configure(track_peak=False)) and reports no peak. The JSON file holds the
+same numbers for comparing runs. cProfile stats can be read with
+`python -m pstats FILE` or snakeviz.
+
+When profiling is off, stage() does nothing but check a flag.
+"""
+
+import os
+import sys
+import time
+import atexit
+import threading
+from contextlib import ContextDecorator
+
+ENV_ENABLE = 'NEWSLETTER_PROFILE'
+ENV_JSON = 'NEWSLETTER_PROFILE_JSON'
+ENV_CPROFILE = 'NEWSLETTER_CPROFILE'
+
+_enabled = False
+_json_file = None
+_profiler = None
+_cprofile_file = None
+_started = None
+_tracemalloc = None  # imported by enable(), so loading this module stays cheap
+_track_peak = True
+_stats = {}  # stage name -> {'calls', 'seconds', 'max_seconds', 'allocated', 'peak' (None untracked)}
+_lock = threading.Lock()
+_local = threading.local()  # per-thread stack of open stages
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(json_file=None, cprofile_file=None):
+    """
+    Start profiling for the rest of the process.
+
+    Args:
+        json_file: Optional path to write the per-stage numbers to at exit
+        cprofile_file: Optional path to dump cProfile stats to at exit
+    """
+    global _enabled, _json_file, _profiler, _cprofile_file, _started, _tracemalloc
+
+    _json_file = json_file or _json_file
+    if cprofile_file and _profiler is None:
+        import cProfile
+        _cprofile_file = cprofile_file
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    if _enabled:
+        return
+
+    import tracemalloc
+    _tracemalloc = tracemalloc
+    _enabled = True
+    _started = time.time()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    atexit.register(_finish)
+
+
+def _pop_option(args, flag):
+    """Remove 'flag VALUE' from args and return VALUE (or None)."""
+    if flag not in args:
+        return None
+    i = args.index(flag)
+    if i + 1 >= len(args):
+        print(f"ERROR: {flag} requires a file name")
+        sys.exit(1)
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def configure(args=None, track_peak=True):
+    """
+    Enable profiling if asked to by the environment or command-line flags.
+
+    The profiling flags are removed from args, so scripts can pass sys.argv
+    (or their own argument list) before parsing it.
+
+    Args:
+        args: Argument list to read and strip flags from (default sys.argv)
+        track_peak: False for processes running stages in several threads,
+            where one stage would reset another's peak
+    """
+    global _track_peak
+    args = sys.argv if args is None else args
+    if not track_peak:
+        _track_peak = False
+
+    flag = '--profile' in args
+    while '--profile' in args:
+        args.remove('--profile')
+    json_file = _pop_option(args, '--profile-json') or os.environ.get(ENV_JSON)
+    cprofile_file = _pop_option(args, '--cprofile') or os.environ.get(ENV_CPROFILE)
+
+    if flag or os.environ.get(ENV_ENABLE, '') not in ('', '0') or json_file or cprofile_file:
+        enable(json_file, cprofile_file)
+
+
+class stage(ContextDecorator):
+    """Time a block (or a function, as a decorator) under a stage name."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if not _enabled:
+            return self
+        stack = _local.__dict__.setdefault('stack', [])
+        current, peak = _tracemalloc.get_traced_memory()
+        if _track_peak:
+            if stack:
+                # Keep the enclosing stage's peak so far before resetting it
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            _tracemalloc.reset_peak()
+        stack.append({'start': time.perf_counter(), 'memory': current, 'peak': current})
+        return self
+
+    def __exit__(self, *exc):
+        stack = getattr(_local, 'stack', None)
+        if not _enabled or not stack:
+            return False
+
+        frame = stack.pop()
+        seconds = time.perf_counter() - frame['start']
+        current, peak = _tracemalloc.get_traced_memory()
+        peak = max(peak, frame['peak'])
+        if stack:
+            # Nested stages reset the peak, so hand it up to the enclosing stage
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+
+        with _lock:
+            stats = _stats.setdefault(self.name, {
+                'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'allocated': 0,
+                'peak': 0 if _track_peak else None,
+            })
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['allocated'] += current - frame['memory']
+            if stats['peak'] is not None:
+                stats['peak'] = max(stats['peak'], peak - frame['memory'])
+        return False
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def summary():
+    """Per-stage numbers collected so far, as a JSON-ready dict."""
+    import platform
+    with _lock:
+        stages = {name: dict(stats) for name, stats in _stats.items()}
+    return {
+        'command': sys.argv,
+        'started': _started,
+        'duration': time.time() - _started if _started else 0.0,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'stages': stages,
+    }
+
+
+def print_summary(data=None):
+    """Print the per-stage table."""
+    data = data or summary()
+    if not data['stages']:
+        return
+
+    print()
+    print("=" * 78)
+    print(f"Profile ({data['duration']:.2f}s total)")
+    print("=" * 78)
+    print(f"{'stage':<22} {'calls':>6} {'total':>9} {'mean':>9} {'max':>9} {'allocated':>10} {'peak':>9}")
+    for name, stats in data['stages'].items():
+        mean = stats['seconds'] / stats['calls']
+        print(f"{name:<22} {stats['calls']:>6} {stats['seconds']:>8.3f}s {mean:>8.4f}s "
+              f"{stats['max_seconds']:>8.4f}s {_format_bytes(stats['allocated']):>10} "
+              f"{_format_bytes(stats['peak']) if stats['peak'] is not None else '-':>9}")
+
+
+def _finish():
+    """At exit: print the summary and write the JSON and cProfile files."""
+    data = summary()
+    print_summary(data)
+
+    if _json_file:
+        import json
+        with open(_json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profile written to {_json_file}")
+
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_cprofile_file)
+        print(f"cProfile stats written to {_cprofile_file} (view with: python -m pstats {_cprofile_file})")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Match Forms responses whose student code isn't in the roster.
+
+Students mistype codes ("STU0O1", "ST001") or leave them blank. Instead of
+fixing these by hand, each unmatched response is looked up in two indexes
+built once from students.xlsx:
+
+- a code typo index: every code with one character deleted, so codes within
+  one edit (including swapped neighbours) are found with a few dict lookups
+- a name index: accent-folded, token-sorted names plus per-token postings
+
+Each candidate gets a confidence score; regenerate_links.py applies matches
+at or above config.RECONCILE_AUTO_APPLY_CONFIDENCE automatically.
+"""
+
+import sys
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+# Characters students commonly confuse when typing codes
+CODE_CONFUSIONS = str.maketrans({'O': '0', 'I': '1', 'L': '1', ' ': '', '-': '', '_': '', '.': ''})
+
+# Name tokens shared by more students than this (Nguyen, Van, Thi) are too
+# common to narrow a name down and are not used to find candidates
+MAX_NAME_POSTING = 25
+
+# A matching name alone is only ever a suggestion; auto-applying needs the
+# code to be close as well
+NAME_ONLY_CONFIDENCE = 0.75
+
+# What a match was found by: a code close to a roster code, or the name alone
+MATCH_CODE_TYPO = 'code typo'
+MATCH_NAME = 'name'
+
+
+def normalize_code(code):
+    """Upper-case a code and fold easily confused characters."""
+    return str(code).strip().upper().translate(CODE_CONFUSIONS)
+
+
+def normalize_name(name):
+    """
+    Fold a name to lower-case ASCII-ish tokens.
+
+    "Nguyễn Văn An" and "an nguyen van" both become ['an', 'nguyen', 'van'].
+    """
+    text = unicodedata.normalize('NFKD', str(name).casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.replace('đ', 'd')
+    tokens = ''.join(c if c.isalnum() else ' ' for c in text).split()
+    return sorted(tokens)
+
+
+def _deletions(code):
+    """The code itself plus every variant with one character removed."""
+    return {code} | {code[:i] + code[i + 1:] for i in range(len(code))}
+
+
+def _edit_distance(a, b):
+    """Damerau-Levenshtein distance (optimal string alignment)."""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+class ReconcileIndex:
+    """Code typo and normalized-name indexes over the roster."""
+
+    def __init__(self, students):
+        """
+        Args:
+            students: dict of code -> {'name': ...} as returned by
+                load_current_students()
+        """
+        self.students = students
+        self.code_variants = defaultdict(set)
+        self.normalized_codes = {}
+        self.names = defaultdict(set)
+        self.name_tokens = {}
+        self.token_postings = defaultdict(set)
+
+        for code, student in students.items():
+            normalized = normalize_code(code)
+            self.normalized_codes[code] = normalized
+            for variant in _deletions(normalized):
+                self.code_variants[variant].add(code)
+
+            tokens = normalize_name(student['name'])
+            self.name_tokens[code] = set(tokens)
+            self.names[' '.join(tokens)].add(code)
+            for token in tokens:
+                self.token_postings[token].add(code)
+
+    def code_candidates(self, code):
+        """Roster codes within one edit of code: dict of code -> distance."""
+        normalized = normalize_code(code)
+        if not normalized or normalized == 'NAN':
+            return {}
+
+        found = set()
+        for variant in _deletions(normalized):
+            found |= self.code_variants.get(variant, set())
+
+        candidates = {}
+        for candidate in found:
+            distance = _edit_distance(normalized, self.normalized_codes[candidate])
+            if distance <= 1:
+                candidates[candidate] = distance
+        return candidates
+
+    def name_candidates(self, name):
+        """Roster codes with a similar name: dict of code -> token overlap (0-1)."""
+        tokens = normalize_name(name)
+        if not tokens:
+            return {}
+
+        exact = self.names.get(' '.join(tokens))
+        if exact:
+            return {code: 1.0 for code in exact}
+
+        # Only consult the rarest tokens, and never common ones, so a name
+        # made of common tokens finds no candidates rather than a large
+        # part of the roster
+        query = set(tokens)
+        postings = sorted((self.token_postings.get(t, set()) for t in query), key=len)
+        postings = [p for p in postings if 0 < len(p) <= MAX_NAME_POSTING][:2]
+
+        candidates = {}
+        for code in set().union(*postings) if postings else set():
+            roster_tokens = self.name_tokens[code]
+            overlap = len(query & roster_tokens) / len(query | roster_tokens)
+            if overlap >= 0.5:
+                candidates[code] = overlap
+        return candidates
+
+    def lookup(self, code, name):
+        """
+        Score roster candidates for one unmatched response.
+
+        Returns:
+            list of (code, confidence, reason, kind) tuples, best first;
+            kind is MATCH_CODE_TYPO or MATCH_NAME
+        """
+        by_code = self.code_candidates(code)
+        by_name = self.name_candidates(name)
+
+        scored = []
+        for candidate in set(by_code) | set(by_name):
+            distance = by_code.get(candidate)
+            overlap = by_name.get(candidate, 0.0)
+
+            if distance is not None and overlap == 1.0:
+                confidence, reason = 0.99, "code typo, same name"
+            elif distance is not None and overlap > 0:
+                confidence, reason = 0.8 + 0.15 * overlap, "code typo, similar name"
+            elif distance == 0:
+                confidence, reason = 0.8, "code differs only by O/0 or I/1"
+            elif distance is not None:
+                confidence, reason = 0.5, "code typo, different name"
+            elif overlap == 1.0:
+                confidence, reason = min(NAME_ONLY_CONFIDENCE, config.RECONCILE_AUTO_APPLY_CONFIDENCE - 0.01), "same name"
+            else:
+                confidence, reason = 0.6 * overlap, "similar name"
+
+            kind = MATCH_CODE_TYPO if distance is not None else MATCH_NAME
+            scored.append((candidate, confidence, reason, kind))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+
+        # Two equally good candidates means we can't tell them apart
+        if len(scored) > 1 and scored[0][1] - scored[1][1] < 0.05:
+            scored = [(c, min(conf, config.RECONCILE_AUTO_APPLY_CONFIDENCE - 0.01), reason + " (ambiguous)", kind)
+                      for c, conf, reason, kind in scored]
+
+        return scored
+
+
+def reconcile_unmatched(students, unmatched, taken_codes):
+    """
+    Find roster matches for responses whose code wasn't found.
+
+    Args:
+        students: Roster dict from load_current_students()
+        unmatched: List of (row_index, response_code, response_name)
+        taken_codes: Roster codes that already have a matching response
+
+    Returns:
+        tuple of (applied, suggestions): applied is a dict of row_index ->
+        (code, confidence, reason, kind) for matches to apply; suggestions
+        is a dict of row_index -> best (code, confidence, reason, kind)
+        below the auto-apply threshold
+    """
+    index = ReconcileIndex(students)
+    applied = {}
+    suggestions = {}
+    claimed = set(taken_codes)
+
+    # Best matches claim roster codes first
+    scored = []
+    for row_index, code, name in unmatched:
+        candidates = index.lookup(code, name)
+        if candidates and candidates[0][1] >= config.RECONCILE_SUGGEST_CONFIDENCE:
+            scored.append((row_index, candidates[0]))
+
+    for row_index, (code, confidence, reason, kind) in sorted(scored, key=lambda item: item[1][1], reverse=True):
+        if confidence >= config.RECONCILE_AUTO_APPLY_CONFIDENCE and code not in claimed:
+            applied[row_index] = (code, confidence, reason, kind)
+            claimed.add(code)
+        elif code in claimed:
+            suggestions[row_index] = (code, confidence, reason + ", student already has a response", kind)
+        else:
+            suggestions[row_index] = (code, confidence, reason, kind)
+
+    return applied, suggestions
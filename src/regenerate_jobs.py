@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Background regeneration jobs for Forms exports uploaded on the admin page.
+
+Each job runs regenerate_links() in its own process, so a long run never
+holds up the server's request threads. Jobs wait in a queue and at most
+config.UPLOAD_JOB_WORKERS run at once. The worker process reports progress
+over a queue; a thread in the server turns it into 'job' events for the
+admin page and, when the run succeeds, reloads the roster so all the new
+URLs are served from one swap.
+
+    event: job    {"id": 3, "state": "running", "stage": "generating URLs",
+                   "processed": 150, "total": 412, "matched": 148, "unmatched": 2, ...}
+"""
+
+import io
+import sys
+import time
+import queue
+import itertools
+import threading
+import traceback
+import multiprocessing
+from pathlib import Path
+from contextlib import redirect_stdout
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+# Finished jobs kept for the admin page
+KEEP_JOBS = 20
+
+# Lines of script output kept per job
+LOG_TAIL_LINES = 200
+
+
+def run_regeneration(paths, form_id, messages):
+    """
+    Worker process: run regenerate_links() on uploaded files.
+
+    Puts ('progress', counts) while running, then ('done', counts, log) or
+    ('failed', error, log) on the messages queue.
+    """
+    # Imported here so the server process never loads pandas
+    import form_registry
+    from regenerate_links import regenerate_links
+
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            form = form_registry.get_form(form_id)
+            counts = regenerate_links(paths, form, progress=lambda counts: messages.put(('progress', counts)))
+        messages.put(('done', counts, log.getvalue()))
+    except SystemExit:
+        # The script prints "ERROR: ..." before exiting
+        errors = [line for line in log.getvalue().splitlines() if line.startswith('ERROR')]
+        messages.put(('failed', errors[-1] if errors else 'regeneration stopped', log.getvalue()))
+    except Exception as e:
+        messages.put(('failed', str(e), log.getvalue() + traceback.format_exc()))
+
+
+class JobManager:
+    """Queue of regeneration jobs, run one process each by a few worker threads."""
+
+    def __init__(self, workers=1, publish=None, on_success=None):
+        """
+        Args:
+            workers: Jobs allowed to run at once
+            publish: Optional callable(event, data) told about every job change
+            on_success: Optional callable run (in the worker thread) after a
+                job has written the new URLs, before it is marked done
+        """
+        self.workers = workers
+        self._publish = publish
+        self._on_success = on_success
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._pending = queue.Queue()
+        self._threads = []
+        # A fresh interpreter, not a fork of the threaded server
+        self._context = multiprocessing.get_context('spawn')
+
+    def submit(self, paths, form_id=None):
+        """
+        Queue a regeneration of the given Forms exports.
+
+        Args:
+            paths: Saved .xlsx files
+            form_id: Form ID or label (None = the default form)
+
+        Returns:
+            The new job's ID
+        """
+        job = {
+            'id': next(self._ids),
+            'files': [Path(path).name for path in paths],
+            'form': form_id,
+            'state': 'queued',
+            'stage': 'waiting',
+            'processed': 0,
+            'total': 0,
+            'matched': 0,
+            'unmatched': 0,
+            'submitted': time.time(),
+            'started': None,
+            'finished': None,
+            'error': None,
+            'log': '',
+        }
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._forget_old_jobs()
+            if not self._threads:
+                for n in range(self.workers):
+                    thread = threading.Thread(target=self._work, name=f'regenerate-job-{n + 1}', daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+        self._pending.put((job['id'], [str(path) for path in paths], form_id))
+        self._announce(job)
+        return job['id']
+
+    def list_jobs(self):
+        """Jobs without their logs, newest first."""
+        with self._lock:
+            return [self._public(job) for job in sorted(self._jobs.values(), key=lambda j: -j['id'])]
+
+    def get(self, job_id):
+        """A copy of one job including its log, or None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in sorted(self._jobs.items()) if job['state'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(self._jobs) - KEEP_JOBS)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _public(job):
+        return {key: value for key, value in job.items() if key != 'log'}
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(changes)
+            job = dict(job)
+        self._announce(job)
+
+    def _announce(self, job):
+        if self._publish:
+            self._publish('job', self._public(job))
+
+    def _work(self):
+        while True:
+            job_id, paths, form_id = self._pending.get()
+            try:
+                self._run(job_id, paths, form_id)
+            except Exception as e:
+                self._update(job_id, state='failed', error=str(e), finished=time.time())
+
+    def _run(self, job_id, paths, form_id):
+        messages = self._context.Queue()
+        # Not a daemon: regenerate_links() starts its own process pool for several files
+        process = self._context.Process(target=run_regeneration, args=(paths, form_id, messages))
+        self._update(job_id, state='running', stage='starting', started=time.time())
+        process.start()
+
+        result = None
+        while result is None:
+            try:
+                message = messages.get(timeout=1)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                try:
+                    message = messages.get(timeout=1)
+                except queue.Empty:
+                    message = ('failed', f"worker exited with code {process.exitcode}", '')
+
+            if message[0] == 'progress':
+                self._update(job_id, **message[1])
+            else:
+                result = message
+        process.join()
+
+        state, detail, log = result
+        log = '\n'.join(log.splitlines()[-LOG_TAIL_LINES:])
+        if state == 'done':
+            if self._on_success:
+                self._on_success()
+            self._update(job_id, state='done', stage='finished', finished=time.time(), log=log, **detail)
+        else:
+            self._update(job_id, state='failed', error=detail, finished=time.time(), log=log)
@@ -8,47 +8,67 @@ that include their previous writing and word count feedback.
 
 Usage:
     python regenerate_links.py results.xlsx
+    python regenerate_links.py class-a.xlsx class-b.xlsx
+    python regenerate_links.py "results/*.xlsx"
+    python regenerate_links.py results.xlsx --form "Class 7A"
+    python regenerate_links.py results.xlsx --session 2
 """
 
 import sys
+import time
 import pandas as pd
 from pathlib import Path
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 import config
-from generate_initial_links import generate_prefilled_url
+import profiling
+from generate_initial_links import generate_prefilled_url, select_form
+from writing_analytics import analyze_writing
+from similarity import detect_similar_submissions, print_clusters
+from reconcile import reconcile_unmatched
+import roster_store
+import roster_index
+import roster_snapshot
+import roster_push
+import history_store
+from response_files import resolve_input_files, read_responses, merge_responses
+
+# How often (in responses) regenerate_links() reports progress
+PROGRESS_EVERY = 25
 
 
 def load_current_students():
-    """Load current student mappings from students.xlsx."""
+    """Load current student mappings from the roster (synced from students.xlsx)."""
     students = {}
 
-    # Path to students.xlsx in parent directory
-    students_file = Path(__file__).parent.parent / 'students.xlsx'
-
+    conn = roster_store.connect()
     try:
-        df = pd.read_excel(students_file)
-        for _, row in df.iterrows():
-            code = str(row['code']).strip().upper()
-            students[code] = {
-                'name': str(row['name']).strip(),
-                'code': code
-            }
+        roster_store.sync_from_xlsx(conn)
     except FileNotFoundError:
         print("ERROR: students.xlsx not found!")
         print("This file should exist from initial setup.")
         sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for student in roster_store.load_students(conn):
+        students[student['code']] = {
+            'name': student['name'],
+            'code': student['code']
+        }
 
     return students
 
 
-def generate_progress_message(word_count):
+def generate_progress_message(word_count, feedback=None):
     """
     Generate a simple progress message for Session 2.
 
     Args:
         word_count: Number of words written in Session 1
+        feedback: Optional list of extra feedback lines from writing analytics
 
     Returns:
         Progress message string
@@ -67,57 +87,89 @@ def generate_progress_message(word_count):
     else:
         messages.append("Good length - you can edit or submit")
 
+    if feedback:
+        messages.extend(feedback[:config.WRITING_FEEDBACK_MAX_MESSAGES])
+
     return "\n".join(messages)
 
 
-def regenerate_links(excel_file):
+def regenerate_links(excel_files, form=None, progress=None, session=None):
     """
     Regenerate prefilled URLs with Session 1 responses.
 
     Args:
-        excel_file: Path to Excel file exported from Microsoft Forms
+        excel_files: Path (or list of paths and glob patterns) to Excel files
+            exported from Microsoft Forms
+        form: Form from form_registry.get_form() (default: the default form)
+        progress: Optional callable, called with a dict of 'stage',
+            'processed', 'total', 'matched' and 'unmatched' as the run goes
+        session: Class session to record the responses as in history.db
+            (default: worked out by history_store.guess_session())
+
+    Returns:
+        dict with the final 'processed', 'total', 'matched' and 'unmatched' counts
     """
+    if isinstance(excel_files, (str, Path)):
+        excel_files = [excel_files]
+
+    counts = {'processed': 0, 'total': 0, 'matched': 0, 'unmatched': 0}
+
+    def report(stage):
+        if progress:
+            progress(dict(counts, stage=stage))
 
     # Load current student mappings
     print("Loading student data from students.xlsx...")
-    students = load_current_students()
+    with profiling.stage('roster load'):
+        students = load_current_students()
     print(f"  Found {len(students)} students")
     print()
+    report('reading responses')
 
-    # Convert excel_file to absolute path if needed
-    excel_path = Path(excel_file)
-    if not excel_path.is_absolute():
-        excel_path = Path(__file__).parent.parent / excel_file
-
-    # Read Excel file
-    print(f"Reading responses from {excel_path.name}...")
-    try:
-        df = pd.read_excel(excel_path)
-    except FileNotFoundError:
-        print(f"ERROR: File not found: {excel_path}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"ERROR reading Excel file: {e}")
+    excel_paths = resolve_input_files(excel_files)
+    if not excel_paths:
+        print("ERROR: No response files to process")
         sys.exit(1)
 
+    # Read Excel files
+    names = ", ".join(path.name for path in excel_paths)
+    print(f"Reading responses from {names}...")
+    with profiling.stage('response read'):
+        results = read_responses(excel_paths)
+
+        for result in results:
+            if result['error']:
+                print(f"ERROR ({result['path'].name}): {result['error']}")
+                sys.exit(1)
+            print(f"  {result['path'].name}: {len(result['df'])} responses ({result['seconds']:.2f}s)")
+
+        df, conflicts = merge_responses(results)
+
     print(f"  Found {len(df)} responses")
     print()
+    counts['total'] = len(df)
+    report('matching')
 
-    # Verify required columns exist
-    required_cols = [config.EXCEL_COL_CODE, config.EXCEL_COL_NAME, config.EXCEL_COL_WRITING]
-    missing_cols = [col for col in required_cols if col not in df.columns]
-
-    if missing_cols:
-        print("ERROR: Excel file is missing required columns!")
-        print(f"\nExpected columns (check config.py):")
-        for col in required_cols:
-            status = "✓" if col in df.columns else "✗"
-            print(f"  {status} {col}")
-        print(f"\nActual columns in Excel file:")
-        for col in df.columns:
-            print(f"  - {col}")
-        print("\nPlease update config.py EXCEL_COL_* constants to match your Forms export.")
-        sys.exit(1)
+    # Analyse all writing at once (cached by text between runs)
+    with profiling.stage('analytics'):
+        analytics = analyze_writing(df[config.EXCEL_COL_WRITING])
+
+    with profiling.stage('matching'):
+        # Match by student code (much more reliable than name matching)
+        matched_codes = {}
+        unmatched = []
+        for idx, row in df.iterrows():
+            response_code = str(row[config.EXCEL_COL_CODE]).strip().upper()
+            if response_code in students:
+                matched_codes[idx] = response_code
+            else:
+                unmatched.append((idx, response_code, str(row[config.EXCEL_COL_NAME]).strip()))
+
+        # Look up unmatched codes by typo and by name
+        reconciled, suggestions = {}, {}
+        if unmatched and config.RECONCILE_ENABLED:
+            reconciled, suggestions = reconcile_unmatched(students, unmatched, set(matched_codes.values()))
+            matched_codes.update({idx: match[0] for idx, match in reconciled.items()})
 
     # Process each response
     print("Processing responses and generating new URLs...")
@@ -125,56 +177,82 @@ def regenerate_links(excel_file):
 
     updated_count = 0
     unmatched_responses = []
-
-    for idx, row in df.iterrows():
-        response_code = str(row[config.EXCEL_COL_CODE]).strip().upper()
-        response_name = str(row[config.EXCEL_COL_NAME]).strip()
-        writing_text = str(row[config.EXCEL_COL_WRITING]).strip()
-
-        # Match by student code (much more reliable than name matching)
-        if response_code not in students:
-            unmatched_responses.append(f"{response_code} ({response_name})")
-            print(f"  ⚠ WARNING: Code '{response_code}' not found in students.xlsx")
-            continue
-
-        student_code = response_code
-
-        # Calculate word count
-        word_count = len(writing_text.split())
-
-        # Generate progress message
-        progress_message = generate_progress_message(word_count)
-
-        # Generate new prefilled URL for Session 2
-        new_url = generate_prefilled_url(
-            student_code=student_code,
-            student_name=response_name,
-            include_writing=True,
-            writing_text=writing_text,
-            writing_info=progress_message
-        )
-
-        # Update student record
-        students[student_code]['url'] = new_url
-        students[student_code]['has_response'] = True
-        students[student_code]['word_count'] = word_count
-
-        # Display status
-        print(f"  {student_code}: {response_name}")
-        print(f"    Words: {word_count}")
-
-        # Show word count feedback
-        if word_count < config.WORD_COUNT_MIN:
-            print(f"    Status: Needs more words")
-        elif word_count > config.WORD_COUNT_MAX:
-            print(f"    Status: Consider shortening")
-        else:
-            print(f"    Status: Good length")
-
-        print(f"    URL: {len(new_url)} characters")
-        print()
-
-        updated_count += 1
+    history_rows = []
+
+    with profiling.stage('URL generation'):
+        for processed, (idx, row) in enumerate(df.iterrows()):
+            if processed % PROGRESS_EVERY == 0:
+                counts.update(processed=processed, matched=updated_count, unmatched=len(unmatched_responses))
+                report('generating URLs')
+
+            response_code = str(row[config.EXCEL_COL_CODE]).strip().upper()
+            response_name = str(row[config.EXCEL_COL_NAME]).strip()
+            writing_text = str(row[config.EXCEL_COL_WRITING]).strip()
+
+            if idx not in matched_codes:
+                entry = f"{response_code} ({response_name})"
+                if idx in suggestions:
+                    code, confidence, reason, kind = suggestions[idx]
+                    entry += f" - maybe {code} ({students[code]['name']}, {kind}), {confidence:.0%}: {reason}"
+                unmatched_responses.append(entry)
+                print(f"  ⚠ WARNING: Code '{response_code}' not found in students.xlsx")
+                continue
+
+            student_code = matched_codes[idx]
+
+            if idx in reconciled:
+                _, confidence, reason, kind = reconciled[idx]
+                print(f"  ↻ Matched '{response_code}' ({response_name}) to {student_code} by {kind} - {confidence:.0%}: {reason}")
+
+            word_count = int(analytics.at[idx, 'words'])
+
+            # Generate progress message
+            progress_message = generate_progress_message(word_count, analytics.at[idx, 'feedback'])
+
+            # Generate new prefilled URL for Session 2
+            new_url = generate_prefilled_url(
+                student_code=student_code,
+                student_name=response_name,
+                include_writing=True,
+                writing_text=writing_text,
+                writing_info=progress_message,
+                form=form
+            )
+
+            # Update student record
+            students[student_code]['url'] = new_url
+            students[student_code]['has_response'] = True
+            students[student_code]['word_count'] = word_count
+
+            if config.HISTORY_ENABLED:
+                submitted = row.get(config.EXCEL_COL_TIMESTAMP)
+                history_rows.append({
+                    'code': student_code,
+                    'name': response_name,
+                    'submitted_at': None if pd.isna(submitted) else str(submitted),
+                    'words': word_count,
+                    'metrics': analytics.loc[idx].drop('feedback').to_dict(),
+                    'writing': writing_text,
+                })
+
+            # Display status
+            print(f"  {student_code}: {response_name}")
+            print(f"    Words: {word_count}")
+
+            # Show word count feedback
+            if word_count < config.WORD_COUNT_MIN:
+                print(f"    Status: Needs more words")
+            elif word_count > config.WORD_COUNT_MAX:
+                print(f"    Status: Consider shortening")
+            else:
+                print(f"    Status: Good length")
+
+            print(f"    URL: {len(new_url)} characters")
+            print()
+
+            updated_count += 1
+
+    counts.update(processed=len(df), matched=updated_count, unmatched=len(unmatched_responses))
 
     # Check for students without responses
     students_without_response = []
@@ -182,22 +260,54 @@ def regenerate_links(excel_file):
         if not student.get('has_response', False):
             students_without_response.append(f"{code} ({student['name']})")
 
+    # Check for copied or shared writing, including earlier sessions
+    similar_clusters = []
+    if config.SIMILARITY_ENABLED:
+        report('checking similarity')
+        print("Checking for copied or shared writing...")
+        submissions = list(zip(
+            df[config.EXCEL_COL_CODE].astype(str).str.strip().str.upper(),
+            df[config.EXCEL_COL_WRITING].fillna('').astype(str),
+        ))
+        with profiling.stage('similarity'):
+            similar_clusters = detect_similar_submissions(submissions, names)
+        print()
+
     # Write updated students.xlsx
     print(f"Writing updated URLs to students.xlsx...")
-
-    students_file = Path(__file__).parent.parent / 'students.xlsx'
-
-    # Read original file to preserve column order and # column
-    df_original = pd.read_excel(students_file)
-
-    # Update URLs in the original dataframe
-    for idx, row in df_original.iterrows():
-        code = str(row['code']).strip().upper()
-        if code in students and 'url' in students[code]:
-            df_original.at[idx, 'url'] = students[code]['url']
-
-    # Save with all original columns preserved
-    df_original.to_excel(students_file, index=False)
+    report('writing')
+
+    # Store the new URLs, then update only the changed url cells of students.xlsx
+    with profiling.stage('write-back'):
+        conn = roster_store.connect()
+        started = time.time()
+        base_version = roster_store.get_version(conn)
+        changed = roster_store.set_urls(conn, {code: student['url'] for code, student in students.items() if 'url' in student})
+        # The running server gets just the changed URLs now; students.xlsx follows
+        if config.PUSH_ENABLED:
+            print(f"  {roster_push.push_changes(conn, base_version, started, changed)}")
+        changed_cells = roster_store.export_xlsx(conn)
+        print(f"  Updated {changed_cells} URL cells")
+        if config.ROSTER_INDEX_ENABLED:
+            roster_index.build_from_store(conn)
+        if config.SNAPSHOT_DIR:
+            manifest = roster_snapshot.publish_snapshot(conn)
+            print(f"  Published roster snapshot version {manifest['version']}")
+
+    if config.HISTORY_ENABLED and history_rows:
+        try:
+            with profiling.stage('history'):
+                recorded = history_store.record_session(history_store.connect(), history_rows, names, session)
+        except ValueError as e:
+            print(f"  WARNING: responses not recorded in history.db: {e}")
+            print("  Run again with --session N to record them")
+        else:
+            if recorded is None:
+                print("  These responses are already in the history (history.db)")
+            else:
+                session, replaced = recorded
+                print(f"  Recorded {len(history_rows)} responses as session {session} in history.db"
+                      + (" (replacing its earlier recording)" if replaced else ""))
 
     print()
     print("="*60)
@@ -205,34 +315,79 @@ def regenerate_links(excel_file):
     print("="*60)
     print(f"✓ Successfully regenerated URLs for {updated_count} students")
 
+    if len(results) > 1:
+        print(f"\nMerged {len(results)} response files:")
+        for result in results:
+            print(f"  - {result['path'].name}: {len(result['df'])} responses in {result['seconds']:.2f}s")
+
+    if conflicts:
+        print(f"\n⚠ {len(conflicts)} students submitted more than once (latest kept):")
+        for entry in conflicts:
+            print(f"  - {entry}")
+
     if students_without_response:
         print(f"\n⚠ {len(students_without_response)} students have NOT submitted yet:")
         for student in students_without_response:
             print(f"  - {student}")
 
+    if reconciled:
+        print(f"\n↻ {len(reconciled)} responses were matched automatically:")
+        for idx, (code, confidence, reason, kind) in reconciled.items():
+            response_code = str(df.at[idx, config.EXCEL_COL_CODE]).strip().upper()
+            print(f"  - {response_code} → {code} ({students[code]['name']}) by {kind}, {confidence:.0%}: {reason}")
+
     if unmatched_responses:
         print(f"\n⚠ {len(unmatched_responses)} responses could not be matched:")
         for entry in unmatched_responses:
             print(f"  - {entry}")
 
+    if config.SIMILARITY_ENABLED:
+        print()
+        print_clusters(similar_clusters)
+
     print()
     print("Next steps:")
-    print("  1. Restart Flask server (Ctrl+C then: python src/app.py)")
-    print("     OR visit: http://YOUR_IP:5001/reload")
+    print("  1. A running Flask server picks up the new URLs within a second")
+    print("     (otherwise start it: python src/app.py)")
     print("  2. Students enter their codes for Session 2")
     print("  3. They will see:")
     print("     - Their writing from Session 1")
     print("     - Word count and feedback")
     print()
 
+    return counts
+
+
+def select_session(args):
+    """
+    Take a --session argument out of args.
+
+    Returns:
+        The session number, or None to let history_store work it out
+    """
+    if '--session' not in args:
+        return None
+    i = args.index('--session')
+    try:
+        session = int(args[i + 1])
+    except (IndexError, ValueError):
+        print("ERROR: --session requires a session number")
+        sys.exit(1)
+    del args[i:i + 2]
+    return session
+
 
 def main():
     """Main entry point."""
 
+    profiling.configure()
+
     if len(sys.argv) < 2:
-        print("Usage: python regenerate_links.py <results.xlsx>")
-        print("\nExample:")
+        print("Usage: python regenerate_links.py <results.xlsx> [more.xlsx ...] [--form FORM] [--session N]")
+        print("\nExamples:")
         print("  python src/regenerate_links.py results.xlsx")
+        print("  python src/regenerate_links.py class-a.xlsx class-b.xlsx")
+        print("  python src/regenerate_links.py \"results/*.xlsx\"")
         print("\nDownload results.xlsx from Microsoft Forms:")
         print("  1. Open your Form")
         print("  2. Go to 'Responses' tab")
@@ -240,8 +395,10 @@ def main():
         print("  4. Save as results.xlsx in the project root")
         sys.exit(1)
 
-    excel_file = sys.argv[1]
-    regenerate_links(excel_file)
+    args = sys.argv[1:]
+    form = select_form(args)
+    session = select_session(args)
+    regenerate_links(args, form, session=session)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Read Microsoft Forms exports for the scripts that take them.
+
+regenerate_links.py and export_booklet.py accept the same arguments: one or
+more exports or glob patterns, relative to the project root. Each file is
+parsed (several in a process pool), checked for the EXCEL_COL_* columns and
+merged into one row per student code.
+"""
+
+import sys
+import glob
+import time
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+from parse_cache import read_excel_cached
+
+
+def resolve_input_files(patterns):
+    """
+    Expand file arguments and glob patterns into a list of Excel files.
+
+    Relative paths and patterns are resolved against the project root.
+    Duplicate matches are dropped while keeping the order given, and
+    students.xlsx is never picked up by a pattern.
+
+    Args:
+        patterns: List of file paths or glob patterns
+
+    Returns:
+        list of Path objects
+    """
+    project_root = Path(__file__).parent.parent
+    students_file = project_root / 'students.xlsx'
+    files = []
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if not path.is_absolute():
+            path = project_root / pattern
+
+        if glob.has_magic(str(path)):
+            # Never treat the roster itself as a Forms export
+            matches = sorted(Path(p) for p in glob.glob(str(path)) if Path(p) != students_file)
+            if not matches:
+                print(f"  ⚠ WARNING: No files match '{pattern}'")
+            files.extend(matches)
+        else:
+            files.append(path)
+
+    unique_files = []
+    for path in files:
+        if path not in unique_files:
+            unique_files.append(path)
+
+    return unique_files
+
+
+def read_responses_file(excel_path):
+    """
+    Read and validate one Forms export.
+
+    Runs inside a worker process, so errors are returned rather than
+    printed or raised.
+
+    Args:
+        excel_path: Path to Excel file exported from Microsoft Forms
+
+    Returns:
+        dict with 'path', 'df', 'seconds' and 'error'
+    """
+    start = time.perf_counter()
+    result = {'path': excel_path, 'df': None, 'seconds': 0.0, 'error': None}
+
+    try:
+        df = read_excel_cached(excel_path)
+    except FileNotFoundError:
+        result['error'] = f"File not found: {excel_path}"
+        return result
+    except Exception as e:
+        result['error'] = f"Error reading Excel file: {e}"
+        return result
+
+    # Verify required columns exist
+    required_cols = [config.EXCEL_COL_CODE, config.EXCEL_COL_NAME, config.EXCEL_COL_WRITING]
+    missing_cols = [col for col in required_cols if col not in df.columns]
+
+    if missing_cols:
+        lines = ["Excel file is missing required columns!", "", "Expected columns (check config.py):"]
+        for col in required_cols:
+            status = "✓" if col in df.columns else "✗"
+            lines.append(f"  {status} {col}")
+        lines.append("")
+        lines.append("Actual columns in Excel file:")
+        for col in df.columns:
+            lines.append(f"  - {col}")
+        lines.append("")
+        lines.append("Please update config.py EXCEL_COL_* constants to match your Forms export.")
+        result['error'] = "\n".join(lines)
+        return result
+
+    result['df'] = df
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def read_responses(excel_paths):
+    """
+    Parse several Forms exports, in a process pool when there is more than one.
+
+    Args:
+        excel_paths: List of Path objects
+
+    Returns:
+        list of result dicts from read_responses_file(), in input order
+    """
+    if len(excel_paths) == 1:
+        return [read_responses_file(excel_paths[0])]
+
+    workers = min(len(excel_paths), config.REGENERATE_MAX_WORKERS)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_responses_file, excel_paths))
+
+
+def merge_responses(results):
+    """
+    Merge responses from several exports into one row per student code.
+
+    When the same code appears more than once (a student submitted twice, or
+    appears in two class forms), the submission with the latest
+    EXCEL_COL_TIMESTAMP wins. Without timestamps, the later file and row wins.
+
+    Args:
+        results: List of result dicts from read_responses()
+
+    Returns:
+        tuple of (merged DataFrame, list of conflict descriptions)
+    """
+    frames = []
+    for order, result in enumerate(results):
+        df = result['df'].copy()
+        df['_source_file'] = result['path'].name
+        df['_source_order'] = order
+        df['_row_order'] = range(len(df))
+        frames.append(df)
+
+    df = pd.concat(frames, ignore_index=True)
+    df['_code'] = df[config.EXCEL_COL_CODE].astype(str).str.strip().str.upper()
+
+    sort_cols = ['_source_order', '_row_order']
+    if config.EXCEL_COL_TIMESTAMP in df.columns:
+        df['_timestamp'] = pd.to_datetime(df[config.EXCEL_COL_TIMESTAMP], errors='coerce')
+        sort_cols = ['_timestamp'] + sort_cols
+    df = df.sort_values(sort_cols, na_position='first', kind='stable')
+
+    # Blank codes can't be merged - keep every one so it's reported as unmatched
+    blank = df['_code'].isin(['', 'NAN'])
+
+    conflicts = []
+    duplicated = df[~blank & df.duplicated('_code', keep=False)]
+    for code, group in duplicated.groupby('_code', sort=True):
+        sources = ", ".join(group['_source_file'])
+        conflicts.append(f"{code}: {len(group)} submissions ({sources}) - kept latest from {group['_source_file'].iloc[-1]}")
+
+    keep = blank | ~df.duplicated('_code', keep='last')
+    merged = df[keep].sort_values(['_source_order', '_row_order'])
+    helper_cols = ['_source_file', '_source_order', '_row_order', '_code', '_timestamp']
+    merged = merged.drop(columns=[c for c in helper_cols if c in merged.columns])
+
+    return merged.reset_index(drop=True), conflicts
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped roster index for very large rosters.
+
+A dict of dicts costs a few hundred bytes per student in every server
+process. This index stores the roster in one file instead:
+
+    header   magic, record count, key width, roster version
+    keys     sorted student codes, NUL-padded to a fixed width
+    offsets  (count + 1) uint64 offsets into the blob
+    blob     "name\\0url" for each record, in key order
+
+RosterIndex maps the file read-only and finds codes by binary search, so no
+Python objects are kept per student and all worker processes share the same
+pages through the OS page cache. It behaves like a read-only dict of
+code -> {'name': ..., 'url': ...}, so it can stand in for STUDENT_MAPPINGS.
+
+Usage:
+    python roster_index.py build
+    python roster_index.py lookup STU001
+"""
+
+import sys
+import os
+import mmap
+import struct
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import roster_store
+
+INDEX_FILE = Path(__file__).parent.parent / 'roster.idx'
+
+MAGIC = b'RIDX0001'
+HEADER = struct.Struct('<8sIIQ')  # magic, count, key_width, version
+OFFSET = struct.Struct('<Q')
+
+
+def build_index(students, version, index_file=None):
+    """
+    Write an index file atomically.
+
+    Args:
+        students: Iterable of dicts with 'code', 'name' and 'url' (students
+            without a URL are skipped)
+        version: Roster version the index was built from
+        index_file: Output path (default roster.idx in the project root)
+
+    Returns:
+        Number of records written
+    """
+    index_file = Path(index_file or INDEX_FILE)
+
+    records = sorted(
+        (s['code'].encode('utf-8'), f"{s['name']}\0{s['url']}".encode('utf-8'))
+        for s in students if s['url']
+    )
+    key_width = max((len(key) for key, _ in records), default=1)
+
+    offsets = [0]
+    for _, value in records:
+        offsets.append(offsets[-1] + len(value))
+
+    fd, tmp_path = tempfile.mkstemp(dir=index_file.parent, suffix='.idx.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(records), key_width, version))
+            f.write(b''.join(key.ljust(key_width, b'\0') for key, _ in records))
+            f.write(b''.join(OFFSET.pack(offset) for offset in offsets))
+            f.write(b''.join(value for _, value in records))
+        os.replace(tmp_path, index_file)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return len(records)
+
+
+def build_from_store(conn, index_file=None):
+    """Rebuild the index from the roster database."""
+    return build_index(roster_store.load_students(conn), roster_store.get_version(conn), index_file)
+
+
+def read_version(index_file=None):
+    """Roster version of an index file, or None if it's missing or invalid."""
+    try:
+        with open(index_file or INDEX_FILE, 'rb') as f:
+            magic, _, _, version = HEADER.unpack(f.read(HEADER.size))
+    except (FileNotFoundError, struct.error):
+        return None
+    return version if magic == MAGIC else None
+
+
+class RosterIndex(Mapping):
+    """Read-only, memory-mapped mapping of code -> {'name', 'url'}."""
+
+    def __init__(self, index_file=None):
+        with open(index_file or INDEX_FILE, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count, self._key_width, self.version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a roster index: {index_file or INDEX_FILE}")
+
+        self._keys_start = HEADER.size
+        self._offsets_start = self._keys_start + self._count * self._key_width
+        self._blob_start = self._offsets_start + (self._count + 1) * OFFSET.size
+
+    def _key(self, i):
+        start = self._keys_start + i * self._key_width
+        return self._map[start:start + self._key_width]
+
+    def _find(self, code):
+        """Position of code in the sorted keys, or -1."""
+        key = str(code).strip().upper().encode('utf-8')
+        if len(key) > self._key_width:
+            return -1
+        key = key.ljust(self._key_width, b'\0')
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self._key(lo) == key else -1
+
+    def _value(self, i):
+        start, end = struct.unpack_from('<QQ', self._map, self._offsets_start + i * OFFSET.size)
+        name, url = self._map[self._blob_start + start:self._blob_start + end].decode('utf-8').split('\0', 1)
+        return {'name': name, 'url': url}
+
+    def __getitem__(self, code):
+        i = self._find(code)
+        if i < 0:
+            raise KeyError(code)
+        return self._value(i)
+
+    def __contains__(self, code):
+        return self._find(code) >= 0
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key(i).rstrip(b'\0').decode('utf-8')
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        """(code, record) pairs in code order, decoded one at a time."""
+        for i in range(self._count):
+            yield self._key(i).rstrip(b'\0').decode('utf-8'), self._value(i)
+
+
+def main():
+    """Build the index or look up a code."""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+
+    if command == 'build':
+        conn = roster_store.connect()
+        count = build_from_store(conn)
+        print(f"✓ Wrote {count} students to {INDEX_FILE.name} (roster version {roster_store.get_version(conn)})")
+    elif command == 'lookup' and len(sys.argv) > 2:
+        index = RosterIndex()
+        code = sys.argv[2]
+        print(index[code] if code in index else f"Code '{code}' not found")
+    else:
+        print("Usage: python src/roster_index.py [build | lookup CODE]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
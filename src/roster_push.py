@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Push changed URLs from the link scripts straight to a running server.
+
+Without this, the server notices a new roster version within
+ROSTER_POLL_SECONDS and reloads every student from roster.db. After
+set_urls(), the scripts instead send just the students whose URL changed
+to POST /admin/push:
+
+    {"base_version": 11, "version": 12,
+     "entries": {"STU014": {"name": "...", "url": "https://..."}, ...}}
+
+The server applies them in one swap if it is still serving base_version,
+so the cost depends on how many links changed, not the roster size. In
+every other case (a different version, another write to the roster during
+the run, the memory-mapped index, snapshot nodes, no server running)
+nothing is applied and the server reloads on its own as before.
+
+The request carries a token. Unless config.PUSH_TOKEN is set, the server
+creates a random one in .cache/push_token, which only processes on the
+same machine can read.
+"""
+
+import os
+import sys
+import json
+import time
+import secrets
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TOKEN_FILE = PROJECT_ROOT / '.cache' / 'push_token'
+
+PUSH_TIMEOUT_SECONDS = 5
+
+
+def push_token(create=False):
+    """
+    The shared push token.
+
+    Args:
+        create: Create .cache/push_token if there is none (the server does this)
+
+    Returns:
+        The token, or None if there is none yet
+    """
+    if config.PUSH_TOKEN:
+        return config.PUSH_TOKEN
+    try:
+        return TOKEN_FILE.read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        if not create:
+            return None
+
+    TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+def changed_entries(conn, since):
+    """Students whose URL was stored at or after the given time.time()."""
+    rows = conn.execute(
+        "SELECT code, name, url FROM students WHERE updated_at >= ? AND url IS NOT NULL", (since,))
+    return {row['code']: {'name': row['name'], 'url': row['url']} for row in rows}
+
+
+def push_changes(conn, base_version, since, changed):
+    """
+    Send the URLs changed by a set_urls() call to the running server.
+
+    Args:
+        conn: Roster connection
+        base_version: Roster version read before set_urls()
+        since: time.time() taken before base_version was read
+        changed: What set_urls() returned
+
+    Returns:
+        Message for the script's output
+    """
+    import roster_store
+
+    if not changed:
+        return "No URLs changed"
+
+    # The rows stored since `since` are the whole change only if set_urls()
+    # was the one write after base_version; otherwise a write that stamped
+    # its rows earlier could be missed
+    version = roster_store.get_version(conn)
+    if version != base_version + 1:
+        return "Server will reload on its own (the roster also changed elsewhere)"
+
+    token = push_token()
+    if not token:
+        return "No running server to update"
+
+    entries = changed_entries(conn, since)
+    target = (config.PUSH_URL or f"http://127.0.0.1:{config.FLASK_PORT}").rstrip('/')
+    body = json.dumps({'base_version': base_version, 'version': version, 'entries': entries}).encode('utf-8')
+    request = urllib.request.Request(
+        f"{target}/admin/push", data=body, method='POST',
+        headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'})
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=PUSH_TIMEOUT_SECONDS) as response:
+            result = json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 409:
+            try:
+                reason = json.loads(e.read())['error']
+            except (ValueError, KeyError):
+                reason = 'conflict'
+            return f"Server will reload on its own ({reason})"
+        return f"⚠ Server refused the update ({e.code}) - it will reload on its own"
+    except (urllib.error.URLError, OSError):
+        return "No running server to update"
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return f"Server updated: {result['applied']} URLs applied in {elapsed_ms:.0f} ms (version {result['version']})"
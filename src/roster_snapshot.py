@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Versioned roster snapshots for running the server on several machines.
+
+The machine that runs the link scripts publishes each roster version as a
+checksummed snapshot into config.SNAPSHOT_DIR:
+
+    snapshots/
+        manifest.json                 {"version", "file", "sha256", ...}
+        roster-v12-3f9a1c0e5b2d.json.gz
+
+Each server node sets config.SNAPSHOT_SOURCE to that directory (e.g. a
+shared drive) or to an HTTP URL serving it (python -m http.server works).
+A background thread polls the manifest with conditional requests, verifies
+the checksum of any newer snapshot and swaps it into the node's roster.db
+in one transaction. The usual roster version check in app.py then serves
+the new URLs, and /admin and /metrics report the version so you can confirm
+all nodes agree.
+
+Usage:
+    python roster_snapshot.py publish
+    python roster_snapshot.py fetch     # apply the latest snapshot once
+"""
+
+import sys
+import os
+import gzip
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+import roster_store
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MANIFEST_NAME = 'manifest.json'
+
+
+def _project_path(path):
+    """A configured path, relative paths taken from the project root."""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _snapshot_dir():
+    return _project_path(config.SNAPSHOT_DIR)
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600 files; other nodes (or http.server run as
+        # another user) must be able to read the snapshots
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def publish_snapshot(conn, snapshot_dir=None):
+    """
+    Write the current roster as a snapshot and point the manifest at it.
+
+    The snapshot file is written before the manifest, so a node never sees
+    a manifest for a file that isn't there yet.
+
+    Returns:
+        The manifest dict
+    """
+    snapshot_dir = Path(snapshot_dir or _snapshot_dir())
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    version = roster_store.get_version(conn)
+    students = roster_store.load_students(conn)
+    payload = json.dumps({'version': version, 'students': students}, ensure_ascii=False).encode('utf-8')
+    data = gzip.compress(payload, mtime=0)
+    checksum = hashlib.sha256(data).hexdigest()
+
+    file_name = f'roster-v{version}-{checksum[:12]}.json.gz'
+    _write_atomic(snapshot_dir / file_name, data)
+
+    manifest = {
+        'version': version,
+        'file': file_name,
+        'sha256': checksum,
+        'size': len(data),
+        'students': len(students),
+        'created': time.time(),
+    }
+    _write_atomic(snapshot_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'))
+
+    # Keep a few older versions for nodes that are mid-download
+    snapshots = sorted(snapshot_dir.glob('roster-v*.json.gz'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in snapshots[config.SNAPSHOT_KEEP:]:
+        if old.name != file_name:
+            old.unlink(missing_ok=True)
+
+    return manifest
+
+
+class SnapshotPoller:
+    """Polls a snapshot source and applies newer versions to the local roster."""
+
+    def __init__(self, source, on_applied=None):
+        """
+        Args:
+            source: Directory path (relative to the project root) or http(s)
+                URL of the snapshot directory
+            on_applied: Optional callback(version) after a snapshot is applied
+        """
+        self.source = str(source)
+        self.on_applied = on_applied
+        self.is_http = self.source.startswith(('http://', 'https://'))
+        if not self.is_http:
+            self.source = str(_project_path(self.source))
+        self.validators = {}  # ETag / Last-Modified from the last manifest response
+        self.manifest_stamp = None
+        self.last_poll = None
+        self.last_error = None
+        self.errors = 0
+        self.applied_version = None
+        self._stop = threading.Event()
+
+    def _url(self, name):
+        return self.source.rstrip('/') + '/' + name
+
+    def _read_manifest(self):
+        """Manifest dict, or None if unchanged since the last poll."""
+        if self.is_http:
+            request = urllib.request.Request(self._url(MANIFEST_NAME))
+            if 'etag' in self.validators:
+                request.add_header('If-None-Match', self.validators['etag'])
+            if 'last-modified' in self.validators:
+                request.add_header('If-Modified-Since', self.validators['last-modified'])
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    body = response.read()
+                    self.validators = {k.lower(): v for k, v in response.headers.items()
+                                       if k.lower() in ('etag', 'last-modified')}
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return None
+                raise
+            return json.loads(body)
+
+        path = Path(self.source) / MANIFEST_NAME
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.manifest_stamp:
+            return None
+        manifest = json.loads(path.read_bytes())
+        self.manifest_stamp = stamp
+        return manifest
+
+    def _read_snapshot(self, file_name):
+        if self.is_http:
+            with urllib.request.urlopen(self._url(file_name), timeout=60) as response:
+                return response.read()
+        return (Path(self.source) / file_name).read_bytes()
+
+    def poll_once(self, conn):
+        """
+        Check the source once and apply a newer snapshot if there is one.
+
+        A snapshot counts as applied by its checksum, stored in roster.db,
+        rather than by version number: the node's own version also moves on
+        local writes and could equal a publisher version it never received.
+
+        Returns:
+            The applied version, or None if nothing changed
+        """
+        self.last_poll = time.time()
+        try:
+            manifest = self._read_manifest()
+            if manifest is None or manifest['sha256'] == roster_store.get_applied_snapshot(conn):
+                return None
+
+            data = self._read_snapshot(manifest['file'])
+            if hashlib.sha256(data).hexdigest() != manifest['sha256']:
+                raise ValueError(f"Checksum mismatch for {manifest['file']}")
+
+            snapshot = json.loads(gzip.decompress(data))
+            roster_store.replace_students(conn, snapshot['students'], snapshot['version'], manifest['sha256'])
+        except BaseException:
+            # Forget validators so the next poll fetches the manifest again
+            self.validators, self.manifest_stamp = {}, None
+            raise
+        self.applied_version = snapshot['version']
+
+        if self.on_applied:
+            self.on_applied(snapshot['version'])
+        return snapshot['version']
+
+    def run(self):
+        """Poll until stop() is called (runs in its own thread)."""
+        conn = roster_store.connect()
+        while not self._stop.is_set():
+            try:
+                version = self.poll_once(conn)
+                self.last_error = None
+                if version is not None:
+                    print(f"Applied roster snapshot version {version}")
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                print(f"WARNING: roster snapshot poll failed: {e}")
+            self._stop.wait(config.SNAPSHOT_POLL_SECONDS)
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='snapshot-poller', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    """Publish a snapshot or apply the latest one."""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'publish'
+    conn = roster_store.connect()
+
+    if command == 'publish':
+        manifest = publish_snapshot(conn)
+        print(f"✓ Published roster version {manifest['version']} ({manifest['students']} students)")
+        print(f"  {_snapshot_dir() / manifest['file']}")
+    elif command == 'fetch':
+        if not config.SNAPSHOT_SOURCE:
+            print("ERROR: Set SNAPSHOT_SOURCE in config.py first")
+            sys.exit(1)
+        version = SnapshotPoller(config.SNAPSHOT_SOURCE).poll_once(conn)
+        if version is None:
+            print(f"Already at the latest version ({roster_store.get_version(conn)})")
+        else:
+            print(f"✓ Applied roster version {version}")
+    else:
+        print("Usage: python src/roster_snapshot.py [publish|fetch]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+SQLite roster store shared by the link scripts and the server.
+
+students.xlsx stays the file teachers edit, but the live roster is kept in
+roster.db (WAL mode, keyed by student code):
+
+- scripts and the server call sync_from_xlsx() first, which imports
+  students.xlsx only if it changed since the last import or export
+- the link scripts write URLs with set_urls() and then export_xlsx(), which
+  updates the url cells of students.xlsx in place
+- every write bumps a version number, so the server can pick up new URLs
+  with one cheap query instead of re-reading the workbook
+
+Usage:
+    python roster_store.py import    # force import of students.xlsx
+    python roster_store.py export    # write URLs back to students.xlsx
+    python roster_store.py status
+"""
+
+import sys
+import time
+import sqlite3
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_FILE = PROJECT_ROOT / 'roster.db'
+STUDENTS_FILE = PROJECT_ROOT / 'students.xlsx'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT,
+    position INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+"""
+
+
+def connect(db_file=None):
+    """Open the roster database, creating it if needed."""
+    conn = sqlite3.connect(db_file or DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_version(conn):
+    """Current roster version (incremented by every write)."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    return int(row['value'])
+
+
+def _bump_version(conn):
+    conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else None
+
+
+def _file_stamp(path):
+    stat = Path(path).stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _clean(value):
+    """Excel cell value as a stripped string, or None for blanks."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return None if text in ('', 'nan', 'None') else text
+
+
+def import_xlsx(conn, students_file=None):
+    """
+    Replace the roster with the contents of students.xlsx.
+
+    Raises:
+        FileNotFoundError: if students.xlsx doesn't exist
+        ValueError: if the code or name column is missing
+    """
+    from parse_cache import read_excel_cached
+
+    students_file = Path(students_file or STUDENTS_FILE)
+    df = read_excel_cached(students_file)
+
+    missing = [col for col in ('code', 'name') if col not in df.columns]
+    if missing:
+        raise ValueError(f"{students_file.name} must have columns: code, name (missing: {', '.join(missing)})")
+
+    now = time.time()
+    rows = []
+    seen = set()
+    for position, record in enumerate(df.to_dict('records')):
+        code = _clean(record.get('code'))
+        if not code:
+            continue
+        code = code.upper()
+        if code in seen:
+            continue
+        seen.add(code)
+        rows.append((code, _clean(record.get('name')) or '', _clean(record.get('url')), position, now))
+
+    with conn:
+        conn.execute("DELETE FROM students")
+        conn.executemany(
+            "INSERT INTO students (code, name, url, position, updated_at) VALUES (?, ?, ?, ?, ?)", rows)
+        _set_meta(conn, 'xlsx_stamp', _file_stamp(students_file))
+        _bump_version(conn)
+
+    return len(rows)
+
+
+def sync_from_xlsx(conn, students_file=None):
+    """
+    Import students.xlsx if it changed since it was last imported or exported.
+
+    Returns:
+        True if the roster was re-imported
+
+    Raises:
+        FileNotFoundError: if neither students.xlsx nor a stored roster exists
+    """
+    students_file = Path(students_file or STUDENTS_FILE)
+
+    if not students_file.exists():
+        if count_students(conn) == 0:
+            raise FileNotFoundError(students_file)
+        return False
+
+    if _get_meta(conn, 'xlsx_stamp') == _file_stamp(students_file):
+        return False
+
+    import_xlsx(conn, students_file)
+    return True
+
+
+def count_students(conn):
+    """Number of students in the roster."""
+    return conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+
+def load_students(conn):
+    """All students in roster order, as a list of dicts (code, name, url)."""
+    rows = conn.execute("SELECT code, name, url FROM students ORDER BY position")
+    return [dict(row) for row in rows]
+
+
+def get_student(conn, code):
+    """Point lookup by code. Returns a dict or None."""
+    row = conn.execute("SELECT code, name, url FROM students WHERE code = ?",
+                       (str(code).strip().upper(),)).fetchone()
+    return dict(row) if row else None
+
+
+def set_urls(conn, urls):
+    """
+    Store new URLs for existing students.
+
+    Args:
+        urls: dict of code -> URL
+
+    Returns:
+        Number of students whose URL changed
+    """
+    now = time.time()
+    with conn:
+        changed = 0
+        for code, url in urls.items():
+            cursor = conn.execute(
+                "UPDATE students SET url = ?, updated_at = ? WHERE code = ? AND url IS NOT ?",
+                (url, now, code, url))
+            changed += cursor.rowcount
+        if changed:
+            _bump_version(conn)
+    return changed
+
+
+def replace_students(conn, students, version, snapshot_sha256=None):
+    """
+    Replace the whole roster and set its version, in one transaction.
+
+    Used by nodes applying a roster snapshot, so every node reports the
+    version of the snapshot it serves.
+
+    Args:
+        students: List of dicts with 'code', 'name' and 'url'
+        version: Roster version to record
+        snapshot_sha256: Checksum of the applied snapshot, kept so the
+            node knows which snapshot it has even after a restart
+    """
+    now = time.time()
+    rows = [(s['code'], s['name'], s['url'], position, now) for position, s in enumerate(students)]
+
+    with conn:
+        conn.execute("DELETE FROM students")
+        conn.executemany(
+            "INSERT INTO students (code, name, url, position, updated_at) VALUES (?, ?, ?, ?, ?)", rows)
+        _set_meta(conn, 'version', int(version))
+        if snapshot_sha256:
+            _set_meta(conn, 'snapshot_sha256', snapshot_sha256)
+
+
+def get_applied_snapshot(conn):
+    """Checksum of the last snapshot applied with replace_students(), or None."""
+    return _get_meta(conn, 'snapshot_sha256')
+
+
+def export_xlsx(conn, students_file=None):
+    """
+    Write stored URLs back to students.xlsx for teachers.
+
+    Existing workbooks are updated in place (only changed url cells); if the
+    workbook is missing a new one is written. If students.xlsx was edited
+    since it was last imported or exported, it is re-imported first (keeping
+    the stored URLs) so the teacher's edit is neither lost nor overwritten.
+
+    Returns:
+        Number of cells (or rows) written
+    """
+    students_file = Path(students_file or STUDENTS_FILE)
+
+    if students_file.exists() and _get_meta(conn, 'xlsx_stamp') != _file_stamp(students_file):
+        urls = {s['code']: s['url'] for s in load_students(conn) if s['url']}
+        import_xlsx(conn, students_file)
+        set_urls(conn, urls)
+
+    students = load_students(conn)
+
+    if students_file.exists():
+        from roster_writer import update_url_cells
+        written = update_url_cells(students_file, {s['code']: s['url'] for s in students if s['url']})
+        if not written:
+            # Nothing saved, so the stored stamp (from the last import or export) still holds
+            return written
+    else:
+        import pandas as pd
+        pd.DataFrame(students, columns=['code', 'name', 'url']).to_excel(students_file, index=False)
+        written = len(students)
+
+    # Our own export shouldn't trigger a re-import
+    with conn:
+        _set_meta(conn, 'xlsx_stamp', _file_stamp(students_file))
+
+    return written
+
+
+def main():
+    """Import, export or show the roster database."""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+
+    conn = connect()
+
+    if command == 'import':
+        try:
+            count = import_xlsx(conn)
+        except FileNotFoundError:
+            print("ERROR: students.xlsx not found!")
+            sys.exit(1)
+        print(f"✓ Imported {count} students from students.xlsx into {DB_FILE.name}")
+    elif command == 'export':
+        written = export_xlsx(conn)
+        print(f"✓ Exported URLs to students.xlsx ({written} cells updated)")
+    elif command == 'status':
+        print(f"Database: {DB_FILE}")
+        print(f"Students: {count_students(conn)}")
+        print(f"Version:  {get_version(conn)}")
+    else:
+        print("Usage: python src/roster_store.py [import|export|status]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Update the url column of students.xlsx in place.
+
+Rewriting the roster with pandas drops any formatting teachers added
+(column widths, colours, extra sheets). This writer opens the workbook once,
+finds the code and url columns, changes only the cells whose URL differs and
+saves atomically: the new workbook is written to a temporary file next to
+students.xlsx and renamed over it, so the server never reads half a file.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from openpyxl import load_workbook
+
+
+def _find_column(header_cells, name):
+    """Index (1-based) of the header cell called name, or None."""
+    for cell in header_cells:
+        if cell.value is not None and str(cell.value).strip().lower() == name:
+            return cell.column
+    return None
+
+
+def atomic_save(workbook, path):
+    """Save a workbook via a temporary file and rename."""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}-', suffix=path.suffix)
+    os.close(fd)
+
+    try:
+        workbook.save(tmp_path)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def update_url_cells(students_file, urls):
+    """
+    Write new URLs into students.xlsx, touching only changed cells.
+
+    Args:
+        students_file: Path to students.xlsx
+        urls: dict of student code (upper case) -> URL
+
+    Returns:
+        Number of cells changed
+    """
+    workbook = load_workbook(students_file)
+    sheet = workbook.active
+
+    header = next(sheet.iter_rows(min_row=1, max_row=1))
+    code_col = _find_column(header, 'code')
+    if code_col is None:
+        raise ValueError(f"{Path(students_file).name} has no 'code' column")
+
+    url_col = _find_column(header, 'url')
+    if url_col is None:
+        url_col = sheet.max_column + 1
+        sheet.cell(row=1, column=url_col, value='url')
+
+    changed = 0
+    for row in sheet.iter_rows(min_row=2):
+        code_cell = row[code_col - 1]
+        if code_cell.value is None:
+            continue
+
+        code = str(code_cell.value).strip().upper()
+        if code not in urls:
+            continue
+
+        url_cell = sheet.cell(row=code_cell.row, column=url_col)
+        if url_cell.value != urls[code]:
+            url_cell.value = urls[code]
+            changed += 1
+
+    if changed:
+        atomic_save(workbook, students_file)
+
+    return changed
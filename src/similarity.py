@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Detect copied or shared newsletter text across submissions.
+
+Each response is split into word shingles, summarised as a MinHash signature
+and bucketed with LSH banding, so only submissions that share a bucket are
+compared instead of every pair. Signatures are kept on disk together with
+each band's keys in sorted order, so a run looks up only its own
+submissions' band keys against every earlier session instead of
+re-bucketing the whole history.
+
+Usage:
+    python similarity.py results.xlsx
+"""
+
+import sys
+import re
+import json
+import hashlib
+import os
+import tempfile
+import unicodedata
+import numpy as np
+from collections import defaultdict
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+
+HISTORY_FILE = Path(__file__).parent.parent / '.cache' / 'similarity_signatures.npz'
+
+# Fixed seed so signatures from different runs are comparable
+MINHASH_SEED = 20240901
+MERSENNE_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+MAX_HASH = np.uint64(2**32 - 1)
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+WORD_RE = re.compile(r'\w+')
+
+
+def shingles(text, size=None):
+    """
+    Split text into a set of overlapping word n-grams.
+
+    Case, accents and punctuation are ignored, so light edits of the same
+    text still share most shingles.
+    """
+    size = size or config.SIMILARITY_SHINGLE_SIZE
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    words = WORD_RE.findall(text)
+
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _permutations(num_perm):
+    """Random (a, b) coefficients of the universal hash family."""
+    rng = np.random.default_rng(MINHASH_SEED)
+    # a < 2**32 keeps a * x within uint64 for 32-bit shingle hashes
+    a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts):
+    """
+    Compute MinHash signatures.
+
+    Args:
+        texts: List of strings
+
+    Returns:
+        uint32 array of shape (len(texts), config.MINHASH_PERMUTATIONS)
+    """
+    num_perm = config.MINHASH_PERMUTATIONS
+    a, b = _permutations(num_perm)
+    signatures = np.full((len(texts), num_perm), MAX_HASH, dtype=np.uint64)
+
+    for i, text in enumerate(texts):
+        values = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+                  for s in shingles(text)]
+        if not values:
+            continue
+        x = np.array(values, dtype=np.uint64)
+        hashed = (a[:, None] * x[None, :] % MERSENNE_PRIME + b[:, None]) % MERSENNE_PRIME
+        signatures[i] = np.minimum(hashed.min(axis=1), MAX_HASH)
+
+    return signatures.astype(np.uint32)
+
+
+def band_keys(signatures):
+    """
+    Hash each LSH band of each signature to one key.
+
+    Returns:
+        uint64 array of shape (len(signatures), config.LSH_BANDS)
+    """
+    bands = config.LSH_BANDS
+    rows = signatures.shape[1] // bands
+    chunks = signatures[:, :bands * rows].astype(np.uint64).reshape(len(signatures), bands, rows)
+    # Polynomial hash, wrapping at 2**64; colliding keys only add candidates,
+    # which are checked against the full signatures anyway
+    weights = np.cumprod(np.full(rows, BAND_MULTIPLIER, dtype=np.uint64))
+    return (chunks * weights).sum(axis=2, dtype=np.uint64)
+
+
+def build_band_index(keys, first_row=0):
+    """
+    Sort band keys for lookups.
+
+    Returns:
+        tuple of (sorted keys, row numbers), both of shape (bands, rows)
+    """
+    order = np.argsort(keys, axis=0, kind='stable').T
+    return np.take_along_axis(keys.T, order, axis=1), order + first_row
+
+
+def add_to_band_index(index, keys, first_row):
+    """Insert rows first_row, first_row + 1, ... with the given band keys."""
+    new_keys, new_rows = build_band_index(keys, first_row)
+    index_keys, index_rows = index
+    merged_keys, merged_rows = [], []
+    for band in range(index_keys.shape[0]):
+        positions = np.searchsorted(index_keys[band], new_keys[band], side='right')
+        merged_keys.append(np.insert(index_keys[band], positions, new_keys[band]))
+        merged_rows.append(np.insert(index_rows[band], positions, new_rows[band]))
+    return np.stack(merged_keys), np.stack(merged_rows)
+
+
+def lsh_candidates(index, keys):
+    """
+    Indexed rows sharing at least one band with each of the given rows.
+
+    Args:
+        index: Tuple from build_band_index()
+        keys: Band keys of the rows to look up, from band_keys()
+
+    Returns:
+        list of sets of row numbers, one per looked-up row
+    """
+    index_keys, index_rows = index
+    found = [set() for _ in range(len(keys))]
+    for band in range(index_keys.shape[0]):
+        starts = np.searchsorted(index_keys[band], keys[:, band], side='left')
+        ends = np.searchsorted(index_keys[band], keys[:, band], side='right')
+        for i in np.flatnonzero(ends - starts > 1):
+            found[i].update(index_rows[band, starts[i]:ends[i]].tolist())
+    return found
+
+
+def load_history():
+    """
+    Load stored signatures from earlier runs.
+
+    Returns:
+        dict with 'signatures' array, 'codes', 'labels', 'hashes' lists and
+        'index' (the band index from build_band_index())
+    """
+    signatures = np.zeros((0, config.MINHASH_PERMUTATIONS), dtype=np.uint32)
+    empty = {
+        'signatures': signatures,
+        'codes': [], 'labels': [], 'hashes': [],
+        'index': build_band_index(band_keys(signatures)),
+    }
+
+    try:
+        data = np.load(HISTORY_FILE, allow_pickle=False)
+    except FileNotFoundError:
+        return empty
+
+    meta = json.loads(str(data['meta']))
+    if meta.get('seed') != MINHASH_SEED or meta.get('num_perm') != config.MINHASH_PERMUTATIONS:
+        # Signatures from different parameters can't be compared
+        return empty
+
+    if meta.get('bands') == config.LSH_BANDS and 'band_keys' in data.files:
+        index = (data['band_keys'], data['band_rows'])
+    else:
+        # Stored before the index, or with other bands: rebuild it once
+        index = build_band_index(band_keys(data['signatures']))
+
+    return {
+        'signatures': data['signatures'],
+        'codes': meta['codes'],
+        'labels': meta['labels'],
+        'hashes': meta['hashes'],
+        'index': index,
+    }
+
+
+def save_history(history):
+    """Write signatures atomically."""
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        'seed': MINHASH_SEED,
+        'num_perm': config.MINHASH_PERMUTATIONS,
+        'bands': config.LSH_BANDS,
+        'codes': history['codes'],
+        'labels': history['labels'],
+        'hashes': history['hashes'],
+    }
+
+    fd, tmp_path = tempfile.mkstemp(dir=HISTORY_FILE.parent, suffix='.npz')
+    with os.fdopen(fd, 'wb') as f:
+        band_keys_sorted, band_rows = history['index']
+        np.savez_compressed(f, signatures=history['signatures'], band_keys=band_keys_sorted,
+                            band_rows=band_rows, meta=np.array(json.dumps(meta)))
+    os.replace(tmp_path, HISTORY_FILE)
+
+
+def _clusters(pairs):
+    """Group connected pairs into clusters (union-find)."""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for x in parent:
+        groups[find(x)].append(x)
+    return [sorted(members) for members in groups.values()]
+
+
+def detect_similar_submissions(submissions, label, update_history=True):
+    """
+    Flag near-duplicate writing in a batch of submissions.
+
+    Submissions are compared with each other and with every submission stored
+    from earlier runs. Pairs from the same student code are ignored (Session 2
+    is expected to resemble Session 1).
+
+    Args:
+        submissions: List of (code, text) tuples
+        label: Name of this batch (e.g. the export file names) for the report
+        update_history: Whether to store the new signatures
+
+    Returns:
+        list of clusters, each a dict with 'members' (list of
+        (code, label) tuples) and 'similarity' (highest estimated Jaccard
+        similarity within the cluster), most similar first
+    """
+    history = load_history()
+    known = {key: i for i, key in enumerate(zip(history['codes'], history['hashes']))}
+
+    # Rows of this batch; texts already stored (e.g. re-running the same
+    # export) reuse their stored signature instead of being added twice
+    batch = set()
+    new_codes, new_hashes, new_texts = [], [], []
+    for code, text in submissions:
+        text = str(text).strip()
+        if len(WORD_RE.findall(text)) < config.SIMILARITY_MIN_WORDS:
+            continue
+        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        if (code, text_hash) in known:
+            batch.add(known[(code, text_hash)])
+            continue
+        batch.add(len(history['codes']) + len(new_codes))
+        new_codes.append(code)
+        new_hashes.append(text_hash)
+        new_texts.append(text)
+
+    if not batch:
+        return []
+
+    new_signatures = minhash_signatures(new_texts)
+    signatures = np.vstack([history['signatures'], new_signatures])
+    codes = history['codes'] + new_codes
+    labels = history['labels'] + [label] * len(new_codes)
+    index = add_to_band_index(history['index'], band_keys(new_signatures), len(history['codes']))
+
+    # Look up only this batch's band keys; every pair has a batch member
+    rows = sorted(batch)
+    seen = set()
+    pairs = []
+    for i, candidates in zip(rows, lsh_candidates(index, band_keys(signatures[rows]))):
+        for j in candidates:
+            pair = (min(i, j), max(i, j))
+            if i == j or codes[i] == codes[j] or pair in seen:
+                continue
+            seen.add(pair)
+            similarity = float(np.mean(signatures[i] == signatures[j]))
+            if similarity >= config.SIMILARITY_THRESHOLD:
+                pairs.append(pair + (similarity,))
+
+    best = defaultdict(float)
+    for i, j, similarity in pairs:
+        best[i] = max(best[i], similarity)
+        best[j] = max(best[j], similarity)
+
+    clusters = []
+    for members in _clusters((i, j) for i, j, _ in pairs):
+        clusters.append({
+            'members': [(codes[m], labels[m]) for m in members],
+            'similarity': max(best[m] for m in members),
+        })
+    clusters.sort(key=lambda c: c['similarity'], reverse=True)
+
+    if update_history and new_codes:
+        save_history({
+            'signatures': signatures,
+            'codes': codes,
+            'labels': labels,
+            'hashes': history['hashes'] + new_hashes,
+            'index': index,
+        })
+
+    return clusters
+
+
+def print_clusters(clusters):
+    """Print a similarity report."""
+    if not clusters:
+        print("✓ No copied or shared writing detected")
+        return
+
+    print(f"⚠ {len(clusters)} groups of very similar writing found:")
+    for cluster in clusters:
+        members = ", ".join(f"{code} ({label})" for code, label in cluster['members'])
+        print(f"  - ~{cluster['similarity']:.0%} similar: {members}")
+
+
+def main():
+    """Check a Forms export against itself and earlier sessions."""
+    from parse_cache import read_excel_cached
+
+    if len(sys.argv) < 2:
+        print("Usage: python src/similarity.py <results.xlsx>")
+        sys.exit(1)
+
+    excel_path = Path(sys.argv[1])
+    if not excel_path.is_absolute():
+        excel_path = Path(__file__).parent.parent / excel_path
+
+    try:
+        df = read_excel_cached(excel_path)
+    except FileNotFoundError:
+        print(f"ERROR: File not found: {excel_path}")
+        sys.exit(1)
+
+    submissions = list(zip(
+        df[config.EXCEL_COL_CODE].astype(str).str.strip().str.upper(),
+        df[config.EXCEL_COL_WRITING].fillna('').astype(str),
+    ))
+    print_clusters(detect_similar_submissions(submissions, excel_path.name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted static assets and precompressed response bodies.
+
+Files in src/assets/ are served as /assets/<name>.<hash>.<ext>: the name
+changes whenever the contents do, so browsers may cache them for a year
+without asking again. Each asset, and each rendered entry page, is stored
+once as-is, gzip and (with the optional brotli package) brotli, and every
+request just picks the smallest variant its Accept-Encoding allows. Nothing
+is compressed while a request waits.
+"""
+
+import gzip
+import hashlib
+from pathlib import Path
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+ASSETS_DIR = Path(__file__).parent / 'assets'
+URL_PREFIX = '/assets/'
+
+CONTENT_TYPES = {
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.ico': 'image/x-icon',
+}
+
+# Already compressed formats gain nothing from gzip or brotli
+INCOMPRESSIBLE = {'.png', '.ico'}
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class Precompressed:
+    """A response body stored in every encoding a client might accept."""
+
+    def __init__(self, data, content_type, compress=True):
+        self.content_type = content_type
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.variants = {'identity': data}
+        if compress:
+            self.variants['gzip'] = gzip.compress(data, compresslevel=9, mtime=0)
+            if HAS_BROTLI:
+                self.variants['br'] = brotli.compress(data, quality=11)
+            # Keep only variants that are actually smaller
+            self.variants = {encoding: body for encoding, body in self.variants.items()
+                             if encoding == 'identity' or len(body) < len(data)}
+
+    def choose(self, accept_encoding):
+        """
+        The smallest variant the client accepts.
+
+        Args:
+            accept_encoding: The request's Accept-Encoding header
+
+        Returns:
+            tuple of (encoding, body); encoding is 'identity' for uncompressed
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        options = [(len(body), encoding) for encoding, body in self.variants.items()
+                   if encoding == 'identity' or accepted.get(encoding, accepted.get('*', 0)) > 0]
+        _, encoding = min(options)
+        return encoding, self.variants[encoding]
+
+
+def parse_accept_encoding(header):
+    """Accept-Encoding as a dict of coding -> q value."""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def fingerprinted_name(path, data):
+    """portal.css -> portal.3f2a9c1b07d4.css"""
+    return f"{path.stem}.{hashlib.sha256(data).hexdigest()[:12]}{path.suffix}"
+
+
+def load_assets(assets_dir=None):
+    """
+    Read and precompress every asset.
+
+    Returns:
+        tuple of (dict of original name -> fingerprinted URL,
+                  dict of fingerprinted name -> Precompressed)
+    """
+    urls, bodies = {}, {}
+    for path in sorted(Path(assets_dir or ASSETS_DIR).iterdir()):
+        if not path.is_file() or path.suffix not in CONTENT_TYPES:
+            continue
+        data = path.read_bytes()
+        name = fingerprinted_name(path, data)
+        urls[path.name] = URL_PREFIX + name
+        bodies[name] = Precompressed(data, CONTENT_TYPES[path.suffix], compress=path.suffix not in INCOMPRESSIBLE)
+    return urls, bodies
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Small summary statistics shared by the reporting tools.
+"""
+
+import math
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
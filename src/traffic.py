@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Record real classroom traffic and replay it against a server.
+
+With config.TRAFFIC_RECORD_FILE set, app.py appends one line per request:
+
+    # traffic v1 started=1767254400.000
+    0\tGET\t/\t\t200
+    412\tPOST\t/\tSTU014\t302
+    415\tPOST\t/\tSTU0l4\t200
+
+(milliseconds since the recording started, method, path with query
+string, submitted code, status). Only requests that can be sent again as
+recorded are kept: event streams, /admin/ actions and POSTs other than a
+code on the entry page are left out. The replayer sends the same requests
+to any server at the original pace or faster, and reports latency
+percentiles and errors, so a change can be checked against a real class
+start.
+
+Usage:
+    python traffic.py stats traffic.tsv
+    python traffic.py replay traffic.tsv --target http://localhost:5001 --speed 2
+"""
+
+import sys
+import time
+import atexit
+import argparse
+import threading
+import urllib.parse
+import urllib.request
+import urllib.error
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from summary_stats import percentile
+
+HEADER_PREFIX = '# traffic v1'
+
+
+class TrafficRecorder:
+    """Appends request records to a file in small batches, at least once a second."""
+
+    def __init__(self, path, flush_every=50, flush_seconds=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.started = time.time()
+        self._buffer = []
+        self._lock = threading.Lock()
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(f"{HEADER_PREFIX} started={self.started:.3f}\n")
+        atexit.register(self.flush)
+
+        # Quiet periods still get written out, even if the server is killed
+        flusher = threading.Thread(target=self._flush_periodically, args=(flush_seconds,),
+                                   name='traffic-recorder', daemon=True)
+        flusher.start()
+
+    def _flush_periodically(self, interval):
+        while True:
+            time.sleep(interval)
+            self.flush()
+
+    def record(self, arrived, method, path, code, status):
+        """
+        Record one request.
+
+        Args:
+            arrived: time.time() when the request arrived
+            method: HTTP method
+            path: Request path, with the query string if there is one
+            code: Student code submitted with the request ('' if none)
+            status: Response status code
+        """
+        offset_ms = int((arrived - self.started) * 1000)
+        code = code.replace('\t', ' ').replace('\n', ' ')
+        line = f"{offset_ms}\t{method}\t{path}\t{code}\t{status}\n"
+
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(self._buffer)
+            self._buffer = []
+
+
+def read_traffic(path):
+    """
+    Read a recording.
+
+    Several recordings appended to one file are laid end to end, keeping
+    the timing within each one.
+
+    Returns:
+        list of dicts with 'offset' (seconds), 'method', 'path', 'code' and 'status'
+    """
+    requests = []
+    base = 0.0
+    last = 0.0
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if line.startswith('#'):
+                if line.startswith(HEADER_PREFIX):
+                    base = last
+                continue
+
+            offset_ms, method, path_, code, status = line.split('\t')
+            offset = base + int(offset_ms) / 1000
+            last = max(last, offset)
+            requests.append({
+                'offset': offset,
+                'method': method,
+                'path': path_,
+                'code': code,
+                'status': int(status),
+            })
+
+    requests.sort(key=lambda r: r['offset'])
+    return requests
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects (a found code) instead of following them to Forms."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def send(opener, target, request):
+    """
+    Send one recorded request.
+
+    Returns:
+        tuple of (status or None, seconds, error message or None)
+    """
+    url = target.rstrip('/') + request['path']
+    data = None
+    if request['method'] == 'POST':
+        data = urllib.parse.urlencode({'code': request['code']}).encode('ascii')
+
+    start = time.perf_counter()
+    try:
+        with opener.open(urllib.request.Request(url, data=data, method=request['method']), timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception as e:
+        return None, time.perf_counter() - start, str(e)
+    return status, time.perf_counter() - start, None
+
+
+def replay(requests, target, speed=1.0, workers=64):
+    """
+    Send recorded requests at their recorded times (divided by speed).
+
+    Args:
+        requests: List from read_traffic()
+        target: Base URL of the server, e.g. http://localhost:5001
+        speed: 2 plays the recording twice as fast; 0 sends everything at once
+        workers: Maximum requests in flight
+
+    Returns:
+        dict with 'latencies', 'statuses', 'errors', 'lag' and 'seconds'
+    """
+    opener = urllib.request.build_opener(_NoRedirect)
+    latencies, statuses, errors, lag = [], Counter(), Counter(), []
+    lock = threading.Lock()
+
+    def run(request, due):
+        status, seconds, error = send(opener, target, request)
+        with lock:
+            latencies.append(seconds)
+            lag.append(max(0.0, time.perf_counter() - seconds - due))
+            if error:
+                errors[error] += 1
+            else:
+                statuses[status] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for request in requests:
+            due = start + (request['offset'] / speed if speed > 0 else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, request, due)
+
+    return {
+        'latencies': sorted(latencies),
+        'statuses': statuses,
+        'errors': errors,
+        'lag': sorted(lag),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def print_stats(requests):
+    """Size and burstiness of a recording."""
+    if not requests:
+        print("No requests recorded")
+        return
+
+    duration = requests[-1]['offset'] - requests[0]['offset']
+    per_second = Counter(int(r['offset']) for r in requests)
+    busiest_second, busiest = per_second.most_common(1)[0]
+    methods = Counter(f"{r['method']} {r['path'].partition('?')[0]}" for r in requests)
+    posts = [r for r in requests if r['method'] == 'POST']
+    misses = sum(1 for r in posts if r['status'] == 200)
+
+    print(f"Requests:        {len(requests)} over {duration:.1f}s")
+    print(f"Busiest second:  {busiest} requests at {busiest_second}s")
+    print(f"Code entries:    {len(posts)} ({misses} not found)")
+    for name, count in methods.most_common():
+        print(f"  {name}: {count}")
+
+
+def print_report(result, requested):
+    """Latency percentiles and error rates of a replay."""
+    latencies = result['latencies']
+    failed = sum(result['errors'].values()) + sum(n for s, n in result['statuses'].items() if s >= 500)
+
+    print(f"Sent {requested} requests in {result['seconds']:.1f}s")
+    print()
+    print("Latency:")
+    for label, fraction in [('p50', 0.50), ('p90', 0.90), ('p95', 0.95), ('p99', 0.99), ('max', 1.0)]:
+        print(f"  {label:<4} {percentile(latencies, fraction) * 1000:8.1f} ms")
+    print(f"  late start p99: {percentile(result['lag'], 0.99) * 1000:.1f} ms (replayer could not keep up if large)")
+    print()
+    print("Responses:")
+    for status, count in sorted(result['statuses'].items()):
+        print(f"  {status}: {count}")
+    for error, count in result['errors'].most_common():
+        print(f"  ✗ {error}: {count}")
+    print()
+    print(f"Error rate: {failed / requested:.2%}" if requested else "Error rate: -")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats_parser = subparsers.add_parser('stats', help='summarise a recording')
+    stats_parser.add_argument('file')
+
+    replay_parser = subparsers.add_parser('replay', help='play a recording against a server')
+    replay_parser.add_argument('file')
+    replay_parser.add_argument('--target', default='http://localhost:5001')
+    replay_parser.add_argument('--speed', type=float, default=1.0,
+                               help='2 = twice as fast, 0 = all at once')
+    replay_parser.add_argument('--workers', type=int, default=64, help='maximum requests in flight')
+    args = parser.parse_args()
+
+    try:
+        requests = read_traffic(args.file)
+    except FileNotFoundError:
+        print(f"Error: File not found: {args.file}")
+        sys.exit(1)
+
+    if args.command == 'stats':
+        print_stats(requests)
+        return
+
+    print(f"Replaying {len(requests)} requests against {args.target} at {args.speed:g}x...")
+    print()
+    result = replay(requests, args.target, args.speed, args.workers)
+    print_report(result, len(requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,21 +9,44 @@ Usage:
     python src/utils/extract_excel_columns.py results.xlsx
 
 The script will:
-1. Read the Excel file from Microsoft Forms
+1. Read the header row of the Excel file from Microsoft Forms
 2. Show you all column names
 3. Try to identify which columns match which config variables
 4. Ask for confirmation before updating config.py
 """
 
 import sys
-import pandas as pd
+import re
+import json
+import hashlib
 from pathlib import Path
+import pandas as pd
+
+# Mappings already worked out for a given header row (keyed by its fingerprint)
+MAPPING_CACHE_FILE = Path(__file__).parent.parent.parent / '.cache' / 'column_mappings.json'
+
+# Keywords for each config variable, with how strongly they suggest it
+COLUMN_KEYWORDS = {
+    'EXCEL_COL_TIMESTAMP': {'start time': 1.0, 'timestamp': 1.0, 'completion time': 0.8, 'time': 0.3},
+    'EXCEL_COL_CODE': {'student code': 1.0, 'student id': 0.9, 'code': 0.7},
+    'EXCEL_COL_NAME': {'student name': 1.0, 'full name': 0.9, 'name': 0.7},
+    'EXCEL_COL_WRITING': {'newsletter content': 1.0, 'your writing': 1.0, 'writing': 0.8,
+                          'newsletter': 0.8, 'content': 0.6, 'text': 0.5},
+}
+
+# Columns Forms adds about the respondent's account, not the form's questions
+FORMS_METADATA_COLUMNS = {'id', 'email', 'name', 'last modified time'}
 
 
 def extract_columns_from_excel(excel_path):
     """
     Extract column names from Excel export.
 
+    Only the header row is read, however many responses the export
+    contains. The names come from pandas, as in the other scripts, so
+    duplicate and blank headers are renamed the same way ("Name.1",
+    "Unnamed: 3") and match what config.EXCEL_COL_* must contain.
+
     Args:
         excel_path: Path to the Excel file
 
@@ -31,55 +54,133 @@ def extract_columns_from_excel(excel_path):
         list of column names
     """
     try:
-        df = pd.read_excel(excel_path)
-        return list(df.columns)
+        header = pd.read_excel(excel_path, nrows=0).columns
     except Exception as e:
         print(f"Error reading Excel file: {e}")
         sys.exit(1)
 
+    return [str(name) for name in header]
+
+
+def header_fingerprint(columns):
+    """Stable fingerprint of a header row (and of the scoring rules)."""
+    rules = json.dumps(COLUMN_KEYWORDS, sort_keys=True)
+    return hashlib.sha256('\x1f'.join([rules] + list(columns)).encode('utf-8')).hexdigest()
+
+
+def score_column(column, config_name):
+    """
+    How well a column name fits a config variable (0 = not at all).
+
+    Whole-word keyword matches beat substrings, and the longest matching
+    keyword wins. For the name field, Forms' own respondent "Name" column
+    loses to the question column it renames to "Name1" (or that pandas
+    renames to "Name.1").
+    """
+    col_lower = column.lower().strip()
+    base = re.sub(r'\.?\d+$', '', col_lower).strip()
+
+    best = 0.0
+    for keyword, weight in COLUMN_KEYWORDS[config_name].items():
+        if keyword == base:
+            score = weight
+        elif re.search(rf'\b{re.escape(keyword)}\b', col_lower):
+            score = weight * 0.8
+        elif keyword in col_lower:
+            score = weight * 0.5
+        else:
+            continue
+        best = max(best, score)
+
+    if best and config_name == 'EXCEL_COL_NAME':
+        if col_lower in FORMS_METADATA_COLUMNS:
+            best *= 0.6
+        elif base != col_lower:
+            best += 0.1
 
-def identify_column_mappings(columns):
+    return best
+
+
+def best_assignment(scores):
+    """
+    Pick one distinct column per config variable, maximising the total score.
+
+    Args:
+        scores: dict of config name -> {column: score}, scores > 0 only
+
+    Returns:
+        dict mapping config variable names to column names
+    """
+    targets = list(scores)
+    best = {'total': -1.0, 'mapping': {}}
+
+    def search(i, used, total, mapping):
+        if i == len(targets):
+            if total > best['total']:
+                best['total'], best['mapping'] = total, dict(mapping)
+            return
+
+        target = targets[i]
+        for column, score in scores[target].items():
+            if column not in used:
+                mapping[target] = column
+                search(i + 1, used | {column}, total + score, mapping)
+                del mapping[target]
+
+        # Leaving a variable unassigned is allowed
+        search(i + 1, used, total, mapping)
+
+    search(0, frozenset(), 0.0, {})
+    return best['mapping']
+
+
+def _load_mapping_cache():
+    try:
+        with open(MAPPING_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_mapping_cache(cache):
+    MAPPING_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(MAPPING_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+
+
+def identify_column_mappings(columns, use_cache=True):
     """
     Try to identify which columns match which config variables.
 
+    Every column is scored against every config variable, then the best
+    overall assignment is chosen, so one column can't be claimed by two
+    variables. Results are cached by header fingerprint.
+
     Args:
         columns: List of column names from Excel
+        use_cache: Whether to reuse and store the mapping for this header
 
     Returns:
         dict mapping config variable names to column names
     """
-    identified = {}
-
-    # Common patterns for different fields (order matters - more specific first)
-    patterns = {
-        'EXCEL_COL_TIMESTAMP': ['start time', 'timestamp', 'completion time'],
-        'EXCEL_COL_CODE': ['student code', 'student id'],
-        'EXCEL_COL_NAME': ['name', 'student name', 'full name'],
-        'EXCEL_COL_WRITING': ['writing', 'newsletter', 'content', 'text', 'your writing'],
-    }
+    fingerprint = header_fingerprint(columns)
+    cache = _load_mapping_cache() if use_cache else {}
+    if fingerprint in cache:
+        return cache[fingerprint]
+
+    scores = {}
+    for config_name in COLUMN_KEYWORDS:
+        scores[config_name] = {}
+        for col in columns:
+            score = score_column(col, config_name)
+            if score > 0:
+                scores[config_name][col] = score
+
+    identified = best_assignment(scores)
 
-    for col in columns:
-        col_lower = col.lower()
-
-        for config_name, keywords in patterns.items():
-            # Check for exact or partial matches
-            for keyword in keywords:
-                if keyword == col_lower or keyword in col_lower:
-                    # If not already identified, or if this is a better match
-                    if config_name not in identified:
-                        identified[config_name] = col
-                        break
-                    # Handle edge case: if we found "Name1" and already have "Name", prefer the one with number
-                    elif config_name == 'EXCEL_COL_NAME':
-                        # Prefer columns with numbers (e.g., "Name1" over "Name")
-                        if any(c.isdigit() for c in col) and not any(c.isdigit() for c in identified[config_name]):
-                            identified[config_name] = col
-                            break
-                    # For code field, prefer "Student Code" over just "Id"
-                    elif config_name == 'EXCEL_COL_CODE':
-                        if 'student' in col_lower and 'student' not in identified[config_name].lower():
-                            identified[config_name] = col
-                            break
+    if use_cache:
+        cache[fingerprint] = identified
+        _save_mapping_cache(cache)
 
     return identified
 
@@ -7,18 +7,28 @@ field parameter names from a prefilled Forms URL.
 
 Usage:
     python src/utils/extract_form_fields.py
+    python src/utils/extract_form_fields.py --batch urls.txt
 
 The script will:
 1. Prompt you to paste your prefilled Forms URL
 2. Parse the URL to extract the base URL and field IDs
 3. Show you what it found
 4. Ask for confirmation before updating config.py
+
+In batch mode, every prefilled URL in the file (one per line, optionally
+preceded by a label and a tab, e.g. "Class 7A<TAB>https://...") is added to
+the form registry (forms.json) instead, without touching config.py.
 """
 
 import sys
+import re
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import form_registry
+
 
 def extract_fields_from_url(url):
     """
@@ -72,19 +82,21 @@ def identify_field_types(fields):
 
     for field_id, sample_value in fields.items():
         value_lower = sample_value.lower()
+        word_count = len(sample_value.split())
 
-        # Try to identify based on sample content
-        if 'stu' in value_lower and len(sample_value) < 20:
+        # Try to identify based on sample content (most specific first)
+        if 'end' in value_lower and 'class' in value_lower:
+            identified['FIELD_WRITING_INFO'] = field_id
+        elif 'session' in value_lower or (' word' in value_lower and word_count < 15):
+            identified['FIELD_WRITING_INFO'] = field_id
+        elif re.fullmatch(r'[A-Za-z]*\d+[A-Za-z\d]*', sample_value.strip()) and len(sample_value) < 20:
+            # Codes look like STU001: letters then digits, no spaces
             identified['FIELD_STUDENT_CODE'] = field_id
-        elif any(name_part in value_lower for name_part in ['test', 'john', 'jane', 'nguyen', 'tran']):
+        elif len(sample_value) > 100 or word_count >= 6:
+            identified['FIELD_WRITING'] = field_id
+        elif any(name_part in value_lower for name_part in ['test', 'john', 'jane', 'nguyen', 'tran', 'student']):
             if len(sample_value) < 50:
                 identified['FIELD_STUDENT_NAME'] = field_id
-        elif len(sample_value) > 100:
-            identified['FIELD_WRITING'] = field_id
-        elif 'end' in value_lower and 'class' in value_lower:
-            identified['FIELD_WRITING_INFO'] = field_id
-        elif 'session' in value_lower or 'word' in value_lower:
-            identified['FIELD_WRITING_INFO'] = field_id
 
     return identified
 
@@ -124,9 +136,77 @@ def update_config(base_url, field_mapping):
         f.writelines(updated_lines)
 
 
+def read_batch_file(batch_path):
+    """
+    Read (label, url) pairs from a batch file.
+
+    Blank lines and lines starting with # are skipped.
+    """
+    entries = []
+    with open(batch_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '\t' in line:
+                label, url = line.split('\t', 1)
+                entries.append((label.strip(), url.strip()))
+            else:
+                entries.append((None, line))
+    return entries
+
+
+def register_batch(batch_path):
+    """Register every prefilled URL in a batch file in forms.json."""
+    try:
+        entries = read_batch_file(batch_path)
+    except FileNotFoundError:
+        print(f"Error: File not found: {batch_path}")
+        sys.exit(1)
+
+    registry = form_registry.load_registry()
+    expected_fields = set(form_registry.FIELD_NAMES)
+
+    print(f"Registering {len(entries)} forms from {Path(batch_path).name}...")
+    print()
+
+    registered = 0
+    for label, url in entries:
+        if 'forms.office.com' not in url:
+            print(f"  ⚠ Skipped (not a Microsoft Forms URL): {url[:60]}")
+            continue
+
+        result = extract_fields_from_url(url)
+        identified = identify_field_types(result['fields'])
+        form_id = form_registry.register_form(registry, result['base_url'], identified, label)
+        registered += 1
+
+        missing = expected_fields - set(identified)
+        status = "✓" if not missing else f"⚠ missing {', '.join(sorted(missing))}"
+        print(f"  {registry['forms'][form_id]['label']}: {form_id[:24]}... {status}")
+
+    form_registry.save_registry(registry)
+
+    print()
+    print(f"✓ Registered {registered} forms in {form_registry.REGISTRY_FILE.name}")
+    print()
+    print("Next steps:")
+    print("  1. Review forms: python src/form_registry.py")
+    print("  2. Generate links for a form: python src/generate_initial_links.py --form \"<label>\"")
+    print()
+
+
 def main():
     """Main script flow."""
 
+    if '--batch' in sys.argv:
+        i = sys.argv.index('--batch')
+        if i + 1 >= len(sys.argv):
+            print("Error: --batch requires a file of prefilled URLs")
+            sys.exit(1)
+        register_batch(sys.argv[i + 1])
+        return
+
     print("=" * 70)
     print("Microsoft Forms Field Extractor")
     print("=" * 70)
@@ -8,23 +8,55 @@ for easier reading by non-technical users.
 Usage:
     python src/utils/md_to_docx.py INSTRUCTIONS.md
     python src/utils/md_to_docx.py README.md -o output.docx
+    python src/utils/md_to_docx.py --batch docs [-o docx-out]
+
+Batch mode converts every .md file under a directory in parallel. Files
+whose contents haven't changed since the last batch run (and whose .docx
+still exists) are skipped.
 """
 
 import sys
+import os
 import re
+import json
+import hashlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 
-def parse_markdown_to_docx(md_file, docx_file):
+# Heading colours shared by every generated document
+HEADING_COLORS = {
+    1: RGBColor(31, 78, 121),
+    2: RGBColor(68, 114, 196),
+}
+
+# Source hashes from the last batch run (bump CONVERTER_VERSION when the
+# output changes, so every file is converted again)
+BATCH_MANIFEST_FILE = Path(__file__).parent.parent.parent / '.cache' / 'md_to_docx.json'
+CONVERTER_VERSION = 2
+
+# Inline formatting, matched in one left-to-right pass:
+# **bold**, *italic*, `code` and [link text](url)
+INLINE_PATTERN = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|\*(?P<italic>[^*\s](?:[^*]*?[^*\s])?)\*'
+    r'|`(?P<code>[^`]+)`'
+    r'|\[(?P<link>[^\]]+)\]\([^)]*\)'
+)
+HEADING_PATTERN = re.compile(r'^(#{1,4}) (.*)')
+NUMBERED_PATTERN = re.compile(r'^\d+\. ')
+TABLE_SEPARATOR_PATTERN = re.compile(r'^\|?[\s:|-]+\|?$')
+
+
+def create_document():
     """
-    Convert a Markdown file to a Word document.
+    Create an empty Word document with the project's default styling.
 
-    Args:
-        md_file: Path to input Markdown file
-        docx_file: Path to output Word document
+    Returns:
+        docx Document
     """
     doc = Document()
 
@@ -34,6 +66,105 @@ def parse_markdown_to_docx(md_file, docx_file):
     font.name = 'Calibri'
     font.size = Pt(11)
 
+    return doc
+
+
+def add_heading(doc, text, level):
+    """Add a heading, coloured like the rest of the project's documents."""
+    heading = doc.add_heading(text, level=level)
+    if level in HEADING_COLORS and heading.runs:
+        heading.runs[0].font.color.rgb = HEADING_COLORS[level]
+    return heading
+
+
+def inline_tokens(text):
+    """
+    Split a line into (text, style) pieces in a single pass.
+
+    Args:
+        text: One line of Markdown
+
+    Returns:
+        list of (text, style) tuples; style is None, 'bold', 'italic',
+        'code' or 'link'
+    """
+    tokens = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            tokens.append((text[position:match.start()], None))
+        style = match.lastgroup
+        tokens.append((match.group(style), style))
+        position = match.end()
+    if position < len(text):
+        tokens.append((text[position:], None))
+    return tokens
+
+
+def plain_text(text):
+    """A line of Markdown with the inline formatting markers removed."""
+    return ''.join(piece for piece, _ in inline_tokens(text))
+
+
+def add_inline_runs(paragraph, text):
+    """Add a line of Markdown to a paragraph as formatted runs."""
+    for piece, style in inline_tokens(text):
+        run = paragraph.add_run(piece)
+        if style == 'bold':
+            run.bold = True
+        elif style == 'italic':
+            run.italic = True
+        elif style == 'code':
+            run.font.name = 'Consolas'
+            run.font.size = Pt(10)
+        elif style == 'link':
+            run.underline = True
+            run.font.color.rgb = RGBColor(5, 99, 193)
+    return paragraph
+
+
+def split_table_row(line):
+    """Cells of a Markdown table row."""
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+def add_table(doc, rows):
+    """
+    Add a Markdown table as a Word table.
+
+    Args:
+        doc: docx Document
+        rows: Table lines; the first is the header, separator rows are skipped
+    """
+    cells = [split_table_row(row) for row in rows if not TABLE_SEPARATOR_PATTERN.match(row.strip())]
+    if not cells:
+        return
+
+    columns = max(len(row) for row in cells)
+    table = doc.add_table(rows=len(cells), cols=columns)
+    table.style = 'Table Grid'
+
+    for r, row in enumerate(cells):
+        for c, text in enumerate(row):
+            paragraph = table.rows[r].cells[c].paragraphs[0]
+            add_inline_runs(paragraph, text)
+            if r == 0:
+                for run in paragraph.runs:
+                    run.bold = True
+
+    doc.add_paragraph()
+
+
+def parse_markdown_to_docx(md_file, docx_file):
+    """
+    Convert a Markdown file to a Word document.
+
+    Args:
+        md_file: Path to input Markdown file
+        docx_file: Path to output Word document
+    """
+    doc = create_document()
+
     # Read markdown file
     with open(md_file, 'r', encoding='utf-8') as f:
         lines = f.readlines()
@@ -47,45 +178,19 @@ def parse_markdown_to_docx(md_file, docx_file):
             i += 1
             continue
 
-        # Heading 1
-        if line.startswith('# '):
-            text = line[2:]
-            heading = doc.add_heading(text, level=1)
-            heading.runs[0].font.color.rgb = RGBColor(31, 78, 121)
-
-        # Heading 2
-        elif line.startswith('## '):
-            text = line[3:]
-            heading = doc.add_heading(text, level=2)
-            heading.runs[0].font.color.rgb = RGBColor(68, 114, 196)
-
-        # Heading 3
-        elif line.startswith('### '):
-            text = line[4:]
-            heading = doc.add_heading(text, level=3)
+        heading = HEADING_PATTERN.match(line)
 
-        # Heading 4
-        elif line.startswith('#### '):
-            text = line[5:]
-            heading = doc.add_heading(text, level=4)
+        # Headings 1-4
+        if heading:
+            add_heading(doc, plain_text(heading.group(2)), len(heading.group(1)))
 
         # Bullet list
         elif line.startswith('- ') or line.startswith('* '):
-            text = line[2:]
-            # Remove bold/italic markers for simplicity
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # **bold**
-            text = re.sub(r'\*(.*?)\*', r'\1', text)      # *italic*
-            text = re.sub(r'`(.*?)`', r'\1', text)        # `code`
-            doc.add_paragraph(text, style='List Bullet')
+            add_inline_runs(doc.add_paragraph(style='List Bullet'), line[2:])
 
         # Numbered list
-        elif re.match(r'^\d+\. ', line):
-            text = re.sub(r'^\d+\. ', '', line)
-            # Remove bold/italic markers
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-            text = re.sub(r'\*(.*?)\*', r'\1', text)
-            text = re.sub(r'`(.*?)`', r'\1', text)
-            doc.add_paragraph(text, style='List Number')
+        elif NUMBERED_PATTERN.match(line):
+            add_inline_runs(doc.add_paragraph(style='List Number'), NUMBERED_PATTERN.sub('', line, count=1))
 
         # Code block
         elif line.startswith('```'):
@@ -111,30 +216,119 @@ def parse_markdown_to_docx(md_file, docx_file):
                     run.font.size = Pt(9)
                     run.font.color.rgb = RGBColor(51, 51, 51)
 
+        # Table: collect consecutive | rows
+        elif line.lstrip().startswith('|'):
+            rows = []
+            while i < len(lines) and lines[i].lstrip().startswith('|'):
+                rows.append(lines[i].rstrip())
+                i += 1
+            add_table(doc, rows)
+            continue
+
         # Horizontal rule
         elif line.startswith('---'):
             doc.add_paragraph('_' * 50)
 
         # Regular paragraph
         else:
-            # Remove markdown formatting
-            text = line
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # **bold**
-            text = re.sub(r'\*(.*?)\*', r'\1', text)      # *italic*
-            text = re.sub(r'`(.*?)`', r'\1', text)        # `code`
-
-            # Handle links [text](url) - just show text
-            text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
-
-            # Skip lines that look like table separators
-            if not re.match(r'^[\|\-\s]+$', text):
-                doc.add_paragraph(text)
+            add_inline_runs(doc.add_paragraph(), line)
 
         i += 1
 
     # Save document
     doc.save(docx_file)
-    print(f"✓ Converted {md_file} → {docx_file}")
+
+
+def file_hash(path):
+    """sha256 of a file's contents."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_manifest():
+    try:
+        with open(BATCH_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return manifest if manifest.get('version') == CONVERTER_VERSION else {}
+
+
+def _save_manifest(files):
+    BATCH_MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(BATCH_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'version': CONVERTER_VERSION, 'files': files}, f, indent=2)
+
+
+def _convert_job(job):
+    """Worker process: convert one file, return (md path, error or None)."""
+    md_file, docx_file = job
+    try:
+        Path(docx_file).parent.mkdir(parents=True, exist_ok=True)
+        parse_markdown_to_docx(md_file, docx_file)
+    except Exception as e:
+        return md_file, str(e)
+    return md_file, None
+
+
+def convert_tree(source_dir, output_dir=None):
+    """
+    Convert every .md file under a directory, skipping unchanged ones.
+
+    Args:
+        source_dir: Directory to search (recursively)
+        output_dir: Where to write the .docx files, mirroring the source
+            tree (default: next to each .md file)
+
+    Returns:
+        dict with 'converted', 'skipped' and 'failed' lists of paths
+    """
+    source_dir = Path(source_dir).resolve()
+    output_dir = Path(output_dir).resolve() if output_dir else source_dir
+    manifest = _load_manifest().get('files', {})
+
+    jobs, hashes, skipped = [], {}, []
+    for md_file in sorted(source_dir.rglob('*.md')):
+        docx_file = output_dir / md_file.relative_to(source_dir).with_suffix('.docx')
+        key = str(md_file)
+        hashes[key] = file_hash(md_file)
+
+        previous = manifest.get(key, {})
+        if previous.get('sha256') == hashes[key] and previous.get('output') == str(docx_file) and docx_file.exists():
+            skipped.append(key)
+        else:
+            jobs.append((key, str(docx_file)))
+
+    converted, failed = [], []
+    if jobs:
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for md_file, error in pool.map(_convert_job, jobs):
+                if error:
+                    failed.append(f"{md_file}: {error}")
+                else:
+                    converted.append(md_file)
+
+    # Remember every file that is now up to date
+    outputs = dict(jobs)
+    for key in skipped:
+        outputs[key] = manifest[key]['output']
+    done = set(converted) | set(skipped)
+    manifest.update({key: {'sha256': hashes[key], 'output': outputs[key]} for key in done})
+    _save_manifest(manifest)
+
+    return {'converted': converted, 'skipped': skipped, 'failed': failed}
+
+
+def get_option(flag):
+    """Value following a command-line flag, or None if the flag isn't given."""
+    if flag not in sys.argv:
+        return None
+    index = sys.argv.index(flag)
+    if index + 1 >= len(sys.argv):
+        print(f"Error: {flag} flag requires a value")
+        sys.exit(1)
+    return sys.argv[index + 1]
 
 
 def main():
@@ -142,14 +336,33 @@ def main():
 
     if len(sys.argv) < 2:
         print("Usage: python src/utils/md_to_docx.py <input.md> [-o output.docx]")
+        print("       python src/utils/md_to_docx.py --batch <docs_dir> [-o output_dir]")
         print()
         print("Examples:")
         print("  python src/utils/md_to_docx.py INSTRUCTIONS.md")
         print("  python src/utils/md_to_docx.py README.md -o readme.docx")
+        print("  python src/utils/md_to_docx.py --batch docs")
         print()
         print("If output file not specified, uses same name with .docx extension")
         sys.exit(1)
 
+    batch_dir = get_option('--batch')
+    if batch_dir:
+        if not Path(batch_dir).is_dir():
+            print(f"Error: Directory not found: {batch_dir}")
+            sys.exit(1)
+
+        result = convert_tree(batch_dir, get_option('-o'))
+        for md_file in result['converted']:
+            print(f"✓ Converted {md_file}")
+        for failure in result['failed']:
+            print(f"✗ Failed {failure}")
+        print()
+        print(f"{len(result['converted'])} converted, {len(result['skipped'])} unchanged, {len(result['failed'])} failed")
+        if result['failed']:
+            sys.exit(1)
+        return
+
     input_file = sys.argv[1]
 
     # Check if input file exists
@@ -158,20 +371,12 @@ def main():
         print(f"Error: File not found: {input_file}")
         sys.exit(1)
 
-    # Determine output file
-    if '-o' in sys.argv:
-        o_index = sys.argv.index('-o')
-        if o_index + 1 < len(sys.argv):
-            output_file = sys.argv[o_index + 1]
-        else:
-            print("Error: -o flag requires output filename")
-            sys.exit(1)
-    else:
-        # Default: replace .md with .docx
-        output_file = str(input_path.with_suffix('.docx'))
+    # Determine output file (default: replace .md with .docx)
+    output_file = get_option('-o') or str(input_path.with_suffix('.docx'))
 
     # Convert
     parse_markdown_to_docx(input_file, output_file)
+    print(f"✓ Converted {input_file} → {output_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Writing analytics for Session 1 responses.
+
+Computes word, sentence and paragraph counts plus a readability score for a
+whole column of responses at once, and turns them into short feedback lines
+using the rules in config.WRITING_FEEDBACK_RULES.
+
+Metrics are cached on disk by a hash of each text, so re-running
+regenerate_links.py only analyses writing that changed since the last run.
+The cache keeps config.WRITING_ANALYTICS_CACHE_MAX_ENTRIES texts, evicting
+the least recently used.
+
+Usage:
+    python writing_analytics.py results.xlsx
+"""
+
+import sys
+import json
+import hashlib
+import os
+import tempfile
+import pandas as pd
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import config
+from parse_cache import read_excel_cached
+
+# Bump when a metric definition changes so cached values are recomputed
+ANALYTICS_VERSION = 1
+
+CACHE_FILE = Path(__file__).parent.parent / '.cache' / 'writing_analytics.json'
+
+# Letters (any script) joined by apostrophes or hyphens, or runs of digits.
+# Ideographic scripts don't separate words with spaces, so each Han, Hiragana
+# or Katakana character counts as one word.
+CJK_CHARS = r'\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+WORD_PATTERN = rf"[{CJK_CHARS}]|(?:(?![{CJK_CHARS}])[^\W\d_])+(?:['’-](?:(?![{CJK_CHARS}])[^\W\d_])+)*|\d+"
+SENTENCE_END_PATTERN = r'[.!?。！？…]+(?=\s|$|["”’)])'
+PARAGRAPH_PATTERN = r'(?:^|\n)[ \t]*\S'
+VOWEL_GROUP_PATTERN = r'[aeiouy\u00e0-\u00ff\u0103\u0129\u0169\u01a1\u01b0\u1ea1-\u1ef9]+'
+
+# Registry of analyzers: name -> function(texts Series) -> DataFrame of metrics
+ANALYZERS = {}
+
+
+def analyzer(name):
+    """Register a function as a named analyzer (see config.WRITING_ANALYZERS)."""
+    def register(func):
+        ANALYZERS[name] = func
+        return func
+    return register
+
+
+@analyzer('counts')
+def count_metrics(texts):
+    """Word, sentence and paragraph counts."""
+    words = texts.str.count(WORD_PATTERN)
+    sentences = texts.str.count(SENTENCE_END_PATTERN)
+
+    # Text without closing punctuation is still one sentence
+    sentences = sentences.where(sentences > 0, (words > 0).astype(int))
+
+    return pd.DataFrame({
+        'words': words,
+        'sentences': sentences,
+        'paragraphs': texts.str.count(PARAGRAPH_PATTERN),
+    })
+
+
+@analyzer('readability')
+def readability_metrics(texts):
+    """Average sentence length and Flesch reading ease (estimated syllables)."""
+    counts = count_metrics(texts)
+    words = counts['words'].clip(lower=1)
+    sentences = counts['sentences'].clip(lower=1)
+
+    # Every word has at least one syllable, even if no vowel group was found
+    syllables = texts.str.lower().str.count(VOWEL_GROUP_PATTERN)
+    syllables = syllables.where(syllables > counts['words'], counts['words'])
+
+    avg_sentence_length = words / sentences
+    reading_ease = 206.835 - 1.015 * avg_sentence_length - 84.6 * (syllables / words)
+
+    return pd.DataFrame({
+        'avg_sentence_length': avg_sentence_length.round(1),
+        'reading_ease': reading_ease.where(counts['words'] > 0, 0.0).round(1),
+    })
+
+
+def text_hash(text):
+    """Cache key for one response."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _cache_namespace():
+    """Cache entries are only valid for the same analyzers and version."""
+    return f"v{ANALYTICS_VERSION}:" + ",".join(dict.fromkeys(['counts'] + list(config.WRITING_ANALYZERS)))
+
+
+def load_cache():
+    """Load cached metrics for the current analyzer set."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    if data.get('namespace') != _cache_namespace():
+        return {}
+    return data.get('entries', {})
+
+
+def save_cache(entries):
+    """Write the metrics cache atomically (entries in least recently used order)."""
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    data = {'namespace': _cache_namespace(), 'entries': entries}
+
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def compute_metrics(texts):
+    """
+    Run every enabled analyzer over a Series of texts.
+
+    'counts' always runs: the scripts read the word count of every response.
+    """
+    frames = []
+    for name in dict.fromkeys(['counts'] + list(config.WRITING_ANALYZERS)):
+        if name not in ANALYZERS:
+            raise ValueError(f"Unknown writing analyzer '{name}' in config.WRITING_ANALYZERS")
+        frames.append(ANALYZERS[name](texts))
+
+    metrics = pd.concat(frames, axis=1)
+    return metrics.loc[:, ~metrics.columns.duplicated()]
+
+
+def apply_feedback_rules(metrics):
+    """
+    Evaluate config.WRITING_FEEDBACK_RULES against every row.
+
+    Returns:
+        Series of lists of feedback messages, aligned with metrics
+    """
+    feedback = pd.Series([[] for _ in range(len(metrics))], index=metrics.index, dtype=object)
+
+    for rule in config.WRITING_FEEDBACK_RULES:
+        metric = rule['metric']
+        if metric not in metrics.columns:
+            continue
+
+        matched = pd.Series(True, index=metrics.index)
+        if 'below' in rule:
+            matched &= metrics[metric] < rule['below']
+        if 'above' in rule:
+            matched &= metrics[metric] > rule['above']
+        # Rules don't apply to blank submissions
+        if 'words' in metrics.columns:
+            matched &= metrics['words'] > 0
+
+        for idx in matched[matched].index:
+            feedback.at[idx] = feedback.at[idx] + [rule['message']]
+
+    return feedback
+
+
+def analyze_writing(texts, use_cache=True):
+    """
+    Analyse a whole column of responses.
+
+    Args:
+        texts: pandas Series of writing (NaN is treated as empty)
+        use_cache: Whether to read and update the on-disk cache
+
+    Returns:
+        DataFrame indexed like texts, with one column per metric and a
+        'feedback' column holding a list of messages
+    """
+    texts = texts.fillna('').astype(str).str.normalize('NFC').str.strip()
+    hashes = texts.map(text_hash)
+
+    cache = load_cache() if use_cache else {}
+    missing = ~hashes.isin(cache.keys())
+    used = list(dict.fromkeys(hashes))
+    # Rewrite the cache only if it gains texts or this batch isn't the most recently used
+    stale = bool(used) and (missing.any() or list(cache)[-len(used):] != used)
+
+    # Only unseen texts (deduplicated) go through the analyzers
+    if missing.any():
+        unique = texts[missing].groupby(hashes[missing]).first()
+        computed = compute_metrics(unique)
+        for key, row in zip(computed.index, computed.to_dict('records')):
+            cache[key] = row
+
+    metrics = pd.DataFrame([cache[key] for key in hashes], index=texts.index)
+
+    if use_cache and stale:
+        # Move this batch to the most recently used end, then drop the oldest
+        for key in used:
+            cache[key] = cache.pop(key)
+        excess = len(cache) - config.WRITING_ANALYTICS_CACHE_MAX_ENTRIES
+        for key in list(cache)[:max(excess, 0)]:
+            del cache[key]
+        save_cache(cache)
+    if metrics.empty:
+        metrics = compute_metrics(texts)
+
+    metrics['feedback'] = apply_feedback_rules(metrics)
+    return metrics
+
+
+def main():
+    """Print analytics for a Forms export."""
+
+    if len(sys.argv) < 2:
+        print("Usage: python src/writing_analytics.py <results.xlsx>")
+        sys.exit(1)
+
+    excel_path = Path(sys.argv[1])
+    if not excel_path.is_absolute():
+        excel_path = Path(__file__).parent.parent / excel_path
+
+    try:
+        df = read_excel_cached(excel_path)
+    except FileNotFoundError:
+        print(f"ERROR: File not found: {excel_path}")
+        sys.exit(1)
+
+    if config.EXCEL_COL_WRITING not in df.columns:
+        print(f"ERROR: Column '{config.EXCEL_COL_WRITING}' not found (check config.py)")
+        sys.exit(1)
+
+    metrics = analyze_writing(df[config.EXCEL_COL_WRITING])
+
+    for idx, row in metrics.iterrows():
+        code = df.at[idx, config.EXCEL_COL_CODE] if config.EXCEL_COL_CODE in df.columns else idx
+        summary = ", ".join(f"{name}: {value}" for name, value in row.items() if name != 'feedback')
+        print(f"  {code}: {summary}")
+        for message in row['feedback']:
+            print(f"    → {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Tests for guessing the session of a Forms export in history_store."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+import history_store
+
+
+def response(code, writing, submitted_at):
+    return {'code': code, 'name': code.title(), 'submitted_at': submitted_at,
+            'words': len(writing.split()), 'metrics': {}, 'writing': writing}
+
+
+SESSION_1 = [
+    response('STU001', 'first draft one', '2026-09-07 09:10:00'),
+    response('STU002', 'first draft two', '2026-09-07 09:12:00'),
+    response('STU003', 'first draft three', '2026-09-07 09:15:00'),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = history_store.connect(tmp_path / 'history.db')
+    history_store.record_session(conn, SESSION_1, 'results.xlsx')
+    return conn
+
+
+def test_cumulative_export_with_few_new_responses_is_the_next_session(conn):
+    # The Session 2 download still holds the two Session 1 rows nobody replaced
+    export = SESSION_1[1:] + [response('STU001', 'second draft one', '2026-09-14 09:05:00')]
+
+    assert history_store.guess_session(conn, export) == 2
+    assert history_store.record_session(conn, export, 'results2.xlsx') == (2, False)
+    assert [row['session'] for row in history_store.list_sessions(conn)] == [1, 2]
+    assert history_store.distribution(conn, 1)['responses'] == 3
+
+
+def test_later_download_with_late_submitters_is_the_same_session(conn):
+    export = SESSION_1 + [response('STU004', 'late draft four', '2026-09-07 18:00:00')]
+
+    assert history_store.guess_session(conn, export) == 1
+
+
+def test_changes_from_before_the_recording_are_ambiguous(conn):
+    export = SESSION_1[1:] + [response('STU001', 'edited draft one', '2026-09-07 09:11:00')]
+
+    with pytest.raises(ValueError):
+        history_store.guess_session(conn, export)
+    assert history_store.record_session(conn, export, 'results.xlsx', session=1) == (1, True)